@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Isochronic Pulse Generator audio engine.
+
+Usage:
+    uv run python benchmarks/run_benchmarks.py            # run everything
+    uv run python benchmarks/run_benchmarks.py tap scope  # run selected benchmarks
+
+Each benchmark reports the per-call cost and, for audio-thread work, the share of
+the real-time budget of one 512-frame block at 44.1 kHz.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.iso_pulse_gen.audio.generator import AudioGenerator  # noqa: E402
+from src.iso_pulse_gen.audio.modulation import MODULATORS  # noqa: E402
+from src.iso_pulse_gen.audio.oversampling import OVERSAMPLING_FACTORS, PolyphaseDecimator  # noqa: E402
+from src.iso_pulse_gen.audio.signal_tap import SignalTap  # noqa: E402
+from src.iso_pulse_gen.audio.analysis import analyze_array  # noqa: E402
+from src.iso_pulse_gen.audio.session import compile_session, render_plan  # noqa: E402
+from src.iso_pulse_gen.audio.stream_manager import RENDER_LEVEL_NAMES, AudioStreamManager  # noqa: E402
+from src.iso_pulse_gen.audio.engine_process import EngineProcess  # noqa: E402
+from src.iso_pulse_gen.audio.mock_backend import VirtualOutputStream  # noqa: E402
+from src.iso_pulse_gen.daemon import DaemonClient, EngineDaemon  # noqa: E402
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 512
+BLOCK_BUDGET_US = BLOCK_SIZE / SAMPLE_RATE * 1e6
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def time_call(func, repeat: int = 2000, warmup: int = 50) -> np.ndarray:
+    """Per-call wall time in microseconds"""
+    for _ in range(warmup):
+        func()
+    samples = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples[i] = time.perf_counter() - start
+    return samples * 1e6
+
+
+def report(label: str, samples_us: np.ndarray, audio_thread: bool = True):
+    median = np.median(samples_us)
+    p99 = np.percentile(samples_us, 99)
+    line = f"  {label:<40} median {median:8.1f} us   p99 {p99:8.1f} us"
+    if audio_thread:
+        line += f"   ({median / BLOCK_BUDGET_US * 100:5.1f}% of block budget)"
+    print(line)
+
+
+@benchmark("generator")
+def bench_generator():
+    """Live render cost with linked channels (rendered once), independent channels and silence"""
+    logging.getLogger("src.iso_pulse_gen").setLevel(logging.ERROR)
+    cases = {
+        "linked": (440.0, 10.0, 440.0, 10.0),
+        "unlinked": (440.0, 10.0, 523.25, 7.83),
+        "silent": (0.0, 10.0, 0.0, 10.0),
+    }
+    for label, params in cases.items():
+        generator = AudioGenerator(SAMPLE_RATE)
+        report(
+            f"{label} channels (512 frames)",
+            time_call(lambda: generator.generate_stereo_frames(BLOCK_SIZE, *params)),
+        )
+
+
+@benchmark("modulation")
+def bench_modulation():
+    """Live render cost of each modulation mode (both channels in the mode)"""
+    logging.getLogger("src.iso_pulse_gen").setLevel(logging.ERROR)
+    for name in MODULATORS:
+        generator = AudioGenerator(SAMPLE_RATE)
+        generator.set_modulation(name, name)
+        samples = time_call(lambda: generator.generate_stereo_frames(BLOCK_SIZE, 440.0, 10.0, 523.25, 7.83))
+        report(f"{name} (512 frames)", samples)
+        print(f"  {'':<40} throughput {BLOCK_SIZE * 2 / np.median(samples):6.1f} Msamples/s")
+
+
+@benchmark("oversampling")
+def bench_oversampling():
+    """Live render cost at each oversampling factor, against the base path"""
+    logging.getLogger("src.iso_pulse_gen").setLevel(logging.ERROR)
+    base = None
+    for factor in OVERSAMPLING_FACTORS:
+        generator = AudioGenerator(SAMPLE_RATE)
+        generator.set_oversampling(factor)
+        samples = time_call(lambda: generator.generate_stereo_frames(BLOCK_SIZE, 15000.0, 10.0, 15000.0, 10.0))
+        report(f"{factor}x oversampling (512 frames)", samples)
+        base = np.median(samples) if base is None else base
+        print(f"  {'':<40} {np.median(samples) / base:4.1f}x the base path")
+    decimator = PolyphaseDecimator(4)
+    ticks = np.zeros((decimator.input_length(BLOCK_SIZE), 2), dtype=np.float32)
+    report("PolyphaseDecimator.decimate (4x)", time_call(lambda: decimator.decimate(ticks)))
+
+
+@benchmark("degradation")
+def bench_degradation():
+    """Whole audio callback cost at each level of the deadline degradation ladder"""
+    logging.getLogger("src.iso_pulse_gen").setLevel(logging.ERROR)
+    for level, name in enumerate(RENDER_LEVEL_NAMES):
+        manager = AudioStreamManager(SAMPLE_RATE, BLOCK_SIZE, stream_factory=VirtualOutputStream)
+        manager.start()
+        manager.stream.advance()  # One full block, so there is something to replay
+        manager._choose_render_level = lambda started, frames, time_info=None, level=level: level
+        report(f"callback at level '{name}'", time_call(manager.stream.advance))
+        manager.stop()
+
+
+@benchmark("tap")
+def bench_tap():
+    block = np.random.default_rng(0).standard_normal((BLOCK_SIZE, 2)).astype(np.float32)
+    for decimation in (1, 2, 4):
+        tap = SignalTap(capacity=8192, decimation=decimation)
+        report(f"SignalTap.write (decimation {decimation})", time_call(lambda: tap.write(block)))
+
+
+@benchmark("scope")
+def bench_scope():
+    """GUI-thread cost of one signal monitor frame (needs PySide6; runs offscreen)"""
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication
+        from src.iso_pulse_gen.gui.visualization import VisualizationPanel
+    except ImportError:
+        print("  PySide6 not available - skipped")
+        return
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    tap = SignalTap(capacity=8192, decimation=2)
+    panel = VisualizationPanel(tap, SAMPLE_RATE)
+    panel.resize(780, 200)
+    panel.show()
+    generator = AudioGenerator(SAMPLE_RATE)
+
+    def frame():
+        tap.write(generator.generate_stereo_frames(BLOCK_SIZE, 440.0, 10.0, 440.0, 10.0))
+        panel.refresh()
+
+    time_call(frame, repeat=200)
+    stats = panel.get_stats()
+    print(
+        f"  {'VisualizationPanel.refresh':<40} mean {stats['mean_frame_ms']:8.2f} ms   "
+        f"max {stats['max_frame_ms']:8.2f} ms   "
+        f"({stats['cpu_share'] * 100:.1f}% of one core at {stats['max_fps']} fps)"
+    )
+    app.processEvents()
+
+
+@benchmark("analysis")
+def bench_analysis():
+    """Streaming validation throughput (a 10 hour render is 600x this input)"""
+    plan = compile_session(
+        {"segments": [{"duration": 60, "left": {"carrier": 440, "pulse": 10}, "right": {"carrier": 523.25, "pulse": 10}}]},
+        SAMPLE_RATE,
+    )
+    data = render_plan(plan)
+    samples = time_call(lambda: analyze_array(data, SAMPLE_RATE), repeat=5, warmup=1)
+    seconds = np.median(samples) / 1e6
+    print(
+        f"  {'analyze_array (60 s stereo render)':<40} median {seconds * 1000:8.1f} ms   "
+        f"({plan.duration / seconds:.0f}x realtime, 10 h in ~{seconds * 600:.0f} s)"
+    )
+
+
+class _BusyLogHandler(logging.Handler):
+    """Stand-in for the GUI log view: formats every record and does pure-Python work with the GIL held"""
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        line = self.format(record)
+        self.lines.append("".join(reversed(line)) * 20)
+        if len(self.lines) > 1000:
+            self.lines.clear()
+
+
+def _gui_load(seconds: float):
+    """Flood the log from the main thread, as a busy GUI process would"""
+    logger = logging.getLogger("benchmark.gui")
+    handler = _BusyLogHandler()
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    deadline = time.perf_counter() + seconds
+    count = 0
+    while time.perf_counter() < deadline:
+        logger.info(f"log line {count}: " + ", ".join(str(i * i) for i in range(50)))
+        count += 1
+    logger.removeHandler(handler)
+
+
+def _callback_jitter(manager, seconds: float, load: bool) -> dict:
+    manager.start()
+    try:
+        time.sleep(0.2)  # settle before measuring
+        if load:
+            _gui_load(seconds)
+        else:
+            time.sleep(seconds)
+        return manager.get_stats()
+    finally:
+        manager.stop()
+
+
+def _available_cpus() -> int:
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+
+
+@benchmark("isolation")
+def bench_isolation():
+    """Callback start jitter with and without a flood of GUI-thread work, in-process vs isolated engine"""
+    logging.getLogger("src.iso_pulse_gen").setLevel(logging.ERROR)
+    seconds, runs = 8.0, 3
+    cpus = _available_cpus()
+    expected = int((seconds + 0.2) * SAMPLE_RATE / BLOCK_SIZE)
+    print(f"  {cpus} CPU(s) available; {runs} runs of {seconds:.0f} s each (~{expected} callbacks per run)")
+    in_process = AudioStreamManager(SAMPLE_RATE, BLOCK_SIZE)
+    engine = EngineProcess(SAMPLE_RATE, BLOCK_SIZE, log_level=logging.ERROR)
+    try:
+        for label, manager in (("in-process", in_process), ("isolated engine", engine)):
+            for load in (False, True):
+                results = [_callback_jitter(manager, seconds, load) for _ in range(runs)]
+                p99 = np.array([stats["callback_jitter_p99_ms"] for stats in results])
+                callbacks = min(stats["callback_count"] for stats in results)
+                name = f"{label}, {'GUI log flood' if load else 'idle GUI'}"
+                print(
+                    f"  {name:<40} jitter p99 {np.median(p99):6.2f} ms (runs {p99.min():.2f}-{p99.max():.2f})   "
+                    f"max {max(stats['callback_jitter_max_ms'] for stats in results):6.2f} ms   "
+                    f"callbacks >= {callbacks}/{expected}"
+                )
+    finally:
+        engine.close()
+    if cpus < 2:
+        print("  One CPU: the engine process still shares it with the GUI process, so load raises jitter in both")
+        print("  modes; run on a machine with a spare core to measure what isolation buys")
+
+
+@benchmark("daemon")
+def bench_daemon():
+    """Control socket round trip, pipelined throughput and command-to-audible latency under a 300 Hz update stream"""
+    logging.getLogger("src.iso_pulse_gen").setLevel(logging.ERROR)
+    path = os.path.join(tempfile.mkdtemp(prefix="ipg-"), "bench.sock")
+
+    async def run():
+        daemon = EngineDaemon(AudioStreamManager(SAMPLE_RATE, BLOCK_SIZE), path)
+        await daemon.start()
+        client = await DaemonClient(path).connect()
+        try:
+            round_trips = []
+            for _ in range(500):
+                started = time.perf_counter()
+                await client.call("ping")
+                round_trips.append((time.perf_counter() - started) * 1e6)
+            report("ping round trip", np.array(round_trips), audio_thread=False)
+
+            await client.call("start")
+            for i in range(600):
+                client.notify("set_left_parameters", 400.0 + i % 100, 10.0)
+                await asyncio.sleep(1 / 300)
+            stats = await client.call("stats")
+            await client.call("stop")
+            print(
+                f"  {'command-to-audible @ 300 updates/s':<40} mean {stats['mean_param_latency_ms']:6.2f} ms   "
+                f"max {stats['max_param_latency_ms']:6.2f} ms   "
+                f"(transit mean {stats['mean_transit_ms'] * 1000:.0f} us, "
+                f"{stats['param_updates_coalesced']} of {stats['param_updates_submitted']} coalesced)"
+            )
+
+            count = 10000
+            started = time.perf_counter()
+            futures = [client.send("set_left_parameters", 400.0 + i % 100, 10.0) for i in range(count)]
+            await asyncio.gather(*futures)
+            elapsed = time.perf_counter() - started
+            print(f"  {'pipelined set_left_parameters':<40} {count / elapsed:8.0f} commands/s")
+        finally:
+            await client.close()
+            await daemon.close()
+
+    asyncio.run(run())
+    os.rmdir(os.path.dirname(path))
+
+
+@benchmark("fanout")
+def bench_fanout():
+    """Audio-thread cost per block period of N devices: one fan-out render vs one manager per device"""
+    logging.getLogger("src.iso_pulse_gen").setLevel(logging.ERROR)
+    for count in (1, 2, 4, 8):
+        devices = list(range(count))
+        fanout = AudioStreamManager(SAMPLE_RATE, BLOCK_SIZE, stream_factory=VirtualOutputStream)
+        fanout.set_output_devices(devices)
+        fanout.start()
+        streams = [output.stream for output in fanout.stream.outputs] if count > 1 else [fanout.stream]
+        report(f"fan-out, {count} devices", time_call(lambda: [stream.advance() for stream in streams]))
+        fanout.stop()
+
+        managers = [AudioStreamManager(SAMPLE_RATE, BLOCK_SIZE, stream_factory=VirtualOutputStream) for _ in devices]
+        for manager in managers:
+            manager.start()
+        report(f"{count} independent managers", time_call(lambda: [m.stream.advance() for m in managers]))
+        for manager in managers:
+            manager.stop()
+
+
+def main(argv):
+    selected = argv or list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)} (available: {', '.join(BENCHMARKS)})")
+        return 1
+
+    print(f"Block: {BLOCK_SIZE} frames @ {SAMPLE_RATE} Hz = {BLOCK_BUDGET_US:.0f} us budget")
+    for name in selected:
+        print(f"\n[{name}]")
+        BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,13 +1,15 @@
+import multiprocessing
 import sys
 from src.iso_pulse_gen.gui.main_window import MainWindow
 from PySide6.QtWidgets import QApplication
 
 
 def main():
+    multiprocessing.freeze_support()  # The isolated engine process re-enters a frozen executable
     app = QApplication(sys.argv)
     app.setApplicationName("Isochronic Pulse Generator")
 
-    window = MainWindow()
+    window = MainWindow(isolated_engine="--isolated-engine" in sys.argv[1:])
     window.show()
 
     sys.exit(app.exec())
@@ -0,0 +1,349 @@
+import hashlib
+import logging
+from collections import deque
+from typing import Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_FRAMES = 1 << 20
+
+
+class _ChannelState:
+    """Running measurements for one channel; everything is O(1) in memory"""
+
+    def __init__(self, min_gap: int):
+        self.nan_count = 0
+        self.inf_count = 0
+        self.clip_count = 0
+        self.peak = 0.0
+        self.open_samples = 0
+        # Gate onsets
+        self.onset_count = 0
+        self.first_onset: Optional[int] = None
+        self.last_onset: Optional[int] = None
+        self.open_before_first = 0
+        self.open_before_last = 0
+        self.tail_mask = np.zeros(min_gap, dtype=bool)  # gate state of the previous samples
+        # Carrier zero crossings (positive-going, interpolated to a fraction of a sample)
+        self.last_sample = 0.0
+        self.crossing_pending = False  # the previous chunk ended on a crossing exactly at zero
+        self.last_crossing: Optional[float] = None
+        self.gates_at_last_crossing = 0
+        self.period_sum = 0.0
+        self.period_count = 0
+
+
+class SignalAnalyzer:
+    """Streaming validation of stereo generator output.
+
+    Feed blocks of any size with feed(); memory use is bounded by the largest
+    block. Per channel it tracks NaN/inf and clipping counts, peak level, gate
+    onsets (pulse frequency and duty cycle) and the carrier frequency from
+    interpolated zero crossings inside open gates. Across channels it measures
+    onset skew (L onset minus R onset, each onset paired with the nearest onset
+    of the other channel within ``skew_window`` samples) and the largest L/R
+    difference. Onsets without a partner in the window are counted, not dropped.
+    Block hashes of the 16-bit-quantized signal are independent of how the input
+    is chunked and serve as golden-output fingerprints; the stream fingerprint
+    is always kept, the per-block list only with ``keep_block_hashes``.
+
+    A closed gate is an exact run of zeros (the generator multiplies by an exact
+    0.0); ``min_gap`` consecutive zeros are needed to count as one, so isolated
+    zero-valued carrier samples are not mistaken for gate edges. Output without
+    exact-zero gaps has no onsets, so pulse frequency, duty cycle and onset skew
+    are unavailable for it: the non-gated modulation modes (binaural, monaural,
+    sine AM) and oversampled renders, whose decimation filter rings through the
+    gaps. The carrier estimate there covers the whole signal.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 44100,
+        channels: int = 2,
+        hash_block_size: int = 16384,
+        keep_block_hashes: bool = False,
+        clip_level: float = 1.0,
+        min_gap: int = 2,
+        skew_window: Optional[int] = None,
+    ):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.clip_level = clip_level
+        self.min_gap = min_gap
+        self.frames = 0
+        self._channels = [_ChannelState(min_gap) for _ in range(channels)]
+
+        # Onset skew: onsets waiting for their partner in the other channel. Onsets are
+        # settled once no closer partner can arrive, so at most skew_window samples' worth wait
+        self.skew_window = sample_rate // 100 if skew_window is None else skew_window
+        self._pending_onsets = [deque() for _ in range(2)]
+        self.unmatched_onsets = 0
+        self.skew_count = 0
+        self._skew_sum = 0
+        self.max_abs_skew = 0
+        self.max_lr_difference = 0.0
+
+        # Fingerprints
+        self.hash_block_size = hash_block_size
+        self.keep_block_hashes = keep_block_hashes
+        self.block_hashes: list = []
+        self._hash_buffer = np.zeros((hash_block_size, channels), dtype="<i2")
+        self._hash_fill = 0
+        # The stream fingerprint hashes the per-block digests, so data is hashed only once
+        self._stream_hash = hashlib.sha1()
+
+    def feed(self, block: np.ndarray):
+        block = np.asarray(block, dtype=np.float32)
+        if block.ndim != 2 or block.shape[1] != self.channels:
+            raise ValueError(f"Expected blocks of shape (frames, {self.channels}), got {block.shape}")
+        if len(block) == 0:
+            return
+
+        if not np.isfinite(block).all():
+            nan_mask = np.isnan(block)
+            inf_mask = np.isinf(block)
+            for c, state in enumerate(self._channels):
+                state.nan_count += int(np.count_nonzero(nan_mask[:, c]))
+                state.inf_count += int(np.count_nonzero(inf_mask[:, c]))
+            block = np.where(nan_mask | inf_mask, np.float32(0.0), block)
+
+        channels = np.ascontiguousarray(block.T)
+        onsets = []
+        for c, state in enumerate(self._channels):
+            onsets.append(self._feed_channel(state, channels[c]))
+
+        if self.channels == 2:
+            self._match_onsets(onsets, self.frames + len(block))
+            difference = channels[0] - channels[1]
+            self.max_lr_difference = max(self.max_lr_difference, float(difference.max()), float(-difference.min()))
+
+        self._hash(block)
+        self.frames += len(block)
+
+    def _feed_channel(self, state: _ChannelState, x: np.ndarray) -> np.ndarray:
+        offset = self.frames
+        peak = float(max(x.max(), -x.min()))
+        state.peak = max(state.peak, peak)
+        if peak > self.clip_level:
+            state.clip_count += int(np.count_nonzero(np.abs(x) > self.clip_level))
+
+        mask = x != 0
+        open_before_chunk = state.open_samples
+        state.open_samples += int(np.count_nonzero(mask))
+
+        # Onsets: an open sample preceded by at least min_gap closed samples
+        extended = np.concatenate((state.tail_mask, mask))
+        onset = extended[self.min_gap:].copy()
+        for lag in range(1, self.min_gap + 1):
+            onset &= ~extended[self.min_gap - lag:len(extended) - lag]
+        onset_idx = np.flatnonzero(onset)
+        state.tail_mask = extended[-self.min_gap:].copy()
+        onsets_before_chunk = state.onset_count
+        if len(onset_idx):
+            if state.first_onset is None:
+                state.first_onset = offset + int(onset_idx[0])
+                state.open_before_first = open_before_chunk + int(np.count_nonzero(mask[:onset_idx[0]]))
+            state.last_onset = offset + int(onset_idx[-1])
+            state.open_before_last = open_before_chunk + int(np.count_nonzero(mask[:onset_idx[-1]]))
+            state.onset_count += len(onset_idx)
+
+        # Positive-going zero crossings x[i-1] < 0 <= x[i] inside the signal. A crossing that lands
+        # on an exact zero only counts when the next sample is positive: a closing gate is followed
+        # by more zeros. The next sample of a zero at the end of the chunk is in the next chunk
+        previous = np.concatenate(([state.last_sample], x[:-1]))
+        crossing_idx = np.flatnonzero((previous < 0) & (x >= 0))
+        on_zero = x[crossing_idx] == 0
+        if on_zero.any():
+            following = x[np.minimum(crossing_idx + 1, len(x) - 1)]
+            keep = ~on_zero | ((following > 0) & (crossing_idx + 1 < len(x)))
+            pending = bool(on_zero[-1]) and crossing_idx[-1] == len(x) - 1
+            crossing_idx = crossing_idx[keep]
+        else:
+            pending = False
+        if state.crossing_pending and x[0] > 0:
+            crossing_idx = np.concatenate(([-1], crossing_idx))
+        state.crossing_pending = pending
+        if len(crossing_idx):
+            before = previous[np.maximum(crossing_idx, 0)]
+            after = x[np.maximum(crossing_idx, 0)]
+            if crossing_idx[0] == -1:
+                before[0], after[0] = -1.0, 0.0  # the previous chunk's last sample, exactly on zero
+            positions = offset + crossing_idx - 1 + (before / (before - after)).astype(np.float64)
+            # A gate opening between two crossings shows up as an onset between them
+            gates = onsets_before_chunk + np.searchsorted(onset_idx, crossing_idx, side="right")
+            if state.last_crossing is not None:
+                positions = np.concatenate(([state.last_crossing], positions))
+                gates = np.concatenate(([state.gates_at_last_crossing], gates))
+            periods = np.diff(positions)[np.diff(gates) == 0]
+            state.period_sum += float(periods.sum())
+            state.period_count += len(periods)
+            state.last_crossing = float(positions[-1])
+            state.gates_at_last_crossing = int(gates[-1])
+        state.last_sample = float(x[-1])
+
+        return offset + onset_idx
+
+    def _match_onsets(self, onsets: list, end: int):
+        """Pair onsets with their nearest partner in the other channel (``end``: frames fed so far)"""
+        left, right = self._pending_onsets
+        left.extend(onsets[0].tolist())
+        right.extend(onsets[1].tolist())
+        while left and right:
+            # The earlier head's nearest partner is the other channel's head
+            first, other = (left, right) if left[0] <= right[0] else (right, left)
+            distance = other[0] - first[0]
+            if distance > self.skew_window:
+                first.popleft()
+                self.unmatched_onsets += 1
+                continue
+            # ...unless the next onset of the same channel is closer to that partner
+            following = first[1] if len(first) > 1 else end
+            if abs(following - other[0]) < distance:
+                if len(first) == 1:
+                    break  # a closer onset may still arrive in the next block
+                first.popleft()
+                self.unmatched_onsets += 1
+                continue
+            skew = left.popleft() - right.popleft()
+            self.skew_count += 1
+            self._skew_sum += skew
+            self.max_abs_skew = max(self.max_abs_skew, abs(skew))
+        for pending, other in ((left, right), (right, left)):
+            while pending and not other and end - pending[0] > self.skew_window:
+                pending.popleft()
+                self.unmatched_onsets += 1
+
+    def _hash(self, block: np.ndarray):
+        quantized = np.rint(block * np.float32(32767.0))
+        if quantized.min() < -32768 or quantized.max() > 32767:
+            np.clip(quantized, -32768, 32767, out=quantized)
+        quantized = quantized.astype("<i2")
+        position = 0
+        if self._hash_fill:
+            take = min(self.hash_block_size - self._hash_fill, len(quantized))
+            self._hash_buffer[self._hash_fill:self._hash_fill + take] = quantized[:take]
+            self._hash_fill += take
+            position = take
+            if self._hash_fill < self.hash_block_size:
+                return
+            self._hash_block(self._hash_buffer)
+            self._hash_fill = 0
+        # Whole hash blocks straight from the quantized chunk, the remainder is buffered
+        while len(quantized) - position >= self.hash_block_size:
+            self._hash_block(quantized[position:position + self.hash_block_size])
+            position += self.hash_block_size
+        remainder = len(quantized) - position
+        self._hash_buffer[:remainder] = quantized[position:]
+        self._hash_fill = remainder
+
+    def _hash_block(self, data: np.ndarray):
+        digest = hashlib.sha1(np.ascontiguousarray(data)).digest()
+        self._stream_hash.update(digest)
+        if self.keep_block_hashes:
+            self.block_hashes.append(digest[:8].hex())
+
+    def fingerprint(self) -> str:
+        """Hash of everything fed so far (includes a trailing partial hash block)"""
+        digest = self._stream_hash.copy()
+        if self._hash_fill:
+            digest.update(hashlib.sha1(self._hash_buffer[:self._hash_fill].tobytes()).digest())
+        return digest.hexdigest()
+
+    def report(self) -> dict:
+        channels = []
+        for state in self._channels:
+            pulse_freq = duty_cycle = carrier_freq = None
+            if state.onset_count > 1 and state.last_onset > state.first_onset:
+                span = state.last_onset - state.first_onset
+                pulse_freq = (state.onset_count - 1) * self.sample_rate / span
+                duty_cycle = (state.open_before_last - state.open_before_first) / span
+            if state.period_count:
+                carrier_freq = self.sample_rate * state.period_count / state.period_sum
+            channels.append({
+                "nan_count": state.nan_count,
+                "inf_count": state.inf_count,
+                "clip_count": state.clip_count,
+                "peak": state.peak,
+                "onsets": state.onset_count,
+                "pulse_freq": pulse_freq,
+                "duty_cycle": duty_cycle,
+                "carrier_freq": carrier_freq,
+            })
+        return {
+            "frames": self.frames,
+            "duration": self.frames / self.sample_rate,
+            "channels": channels,
+            "onset_skew_mean": self._skew_sum / self.skew_count if self.skew_count else None,
+            "onset_skew_max": self.max_abs_skew if self.skew_count else None,
+            "unmatched_onsets": self.unmatched_onsets,
+            "max_lr_difference": self.max_lr_difference,
+            "fingerprint": self.fingerprint(),
+            "block_hashes": len(self.block_hashes),
+        }
+
+    def problems(
+        self,
+        expected_carrier: Optional[tuple] = None,
+        expected_pulse: Optional[tuple] = None,
+        tolerance: float = 0.01,
+        max_skew: int = 1,
+    ) -> list:
+        """Human-readable list of failed checks (empty when the output is valid).
+
+        ``expected_carrier`` / ``expected_pulse`` are (left, right) in Hz; frequency
+        checks use a relative ``tolerance``; ``max_skew`` is in samples. Onset skew
+        is only checked when both channels pulse at the same rate (expected, or else
+        measured within ``tolerance``); otherwise the onsets drift apart by design.
+        """
+        report = self.report()
+        issues = []
+        for name, channel, expected_c, expected_p in zip(
+            ("Left", "Right"), report["channels"], expected_carrier or (None, None), expected_pulse or (None, None)
+        ):
+            if channel["nan_count"] or channel["inf_count"]:
+                issues.append(f"{name}: {channel['nan_count']} NaN and {channel['inf_count']} inf samples")
+            if channel["clip_count"]:
+                issues.append(f"{name}: {channel['clip_count']} samples beyond ±{self.clip_level}")
+            for label, measured, expected in (("carrier", channel["carrier_freq"], expected_c), ("pulse", channel["pulse_freq"], expected_p)):
+                if expected is None:
+                    continue
+                if measured is None:
+                    issues.append(f"{name}: {label} frequency could not be measured")
+                elif abs(measured - expected) > tolerance * expected:
+                    issues.append(f"{name}: {label} frequency {measured:.3f}Hz, expected {expected:.3f}Hz")
+        left_pulse, right_pulse = expected_pulse or (channel["pulse_freq"] for channel in report["channels"])
+        if left_pulse and right_pulse and abs(left_pulse - right_pulse) <= tolerance * max(left_pulse, right_pulse):
+            if report["onset_skew_max"] is not None and report["onset_skew_max"] > max_skew:
+                issues.append(f"L/R pulse onsets skewed by up to {report['onset_skew_max']} samples")
+            if report["unmatched_onsets"]:
+                issues.append(f"{report['unmatched_onsets']} pulse onsets without a partner within {self.skew_window} samples")
+        return issues
+
+
+def analyze_array(data: np.ndarray, sample_rate: int, chunk_frames: int = DEFAULT_CHUNK_FRAMES, **kwargs) -> SignalAnalyzer:
+    """Stream an array (or memmap) through a SignalAnalyzer chunk by chunk"""
+    analyzer = SignalAnalyzer(sample_rate, channels=data.shape[1], **kwargs)
+    for start in range(0, len(data), chunk_frames):
+        analyzer.feed(data[start:start + chunk_frames])
+    return analyzer
+
+
+def analyze_file(path: str, sample_rate: int, chunk_frames: int = DEFAULT_CHUNK_FRAMES, **kwargs) -> SignalAnalyzer:
+    """Validate a rendered ``.npy`` file through a memmap in constant memory"""
+    data = np.load(path, mmap_mode="r")
+    analyzer = analyze_array(data, sample_rate, chunk_frames, **kwargs)
+    logger.info(f"Analyzed {path}: {analyzer.frames} frames, fingerprint {analyzer.fingerprint()}")
+    return analyzer
+
+
+def analyze_plan(plan, volume: float = 1.0, chunk_frames: int = DEFAULT_CHUNK_FRAMES, **kwargs) -> SignalAnalyzer:
+    """Render a SegmentPlan chunk by chunk and validate it without keeping the render"""
+    from .generator import AudioGenerator
+
+    generator = AudioGenerator(plan.sample_rate, volume)
+    analyzer = SignalAnalyzer(plan.sample_rate, **kwargs)
+    for start in range(0, plan.total_samples, chunk_frames):
+        frames = min(chunk_frames, plan.total_samples - start)
+        analyzer.feed(generator.render_plan_frames(plan, start, frames))
+    return analyzer
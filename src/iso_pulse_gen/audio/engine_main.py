@@ -0,0 +1,7 @@
+"""Stand-in ``__main__`` for the spawned audio engine process.
+
+A spawned child re-imports its parent's main module before running the target.
+For the GUI entry points that module loads PySide6 and the whole window, so
+``EngineProcess`` presents this module as ``__main__`` while it starts the child:
+the engine then imports only the audio modules it needs.
+"""
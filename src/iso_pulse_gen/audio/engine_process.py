@@ -0,0 +1,274 @@
+import contextlib
+import importlib
+import logging
+import logging.handlers
+import multiprocessing
+import sys
+import threading
+from multiprocessing import shared_memory
+import numpy as np
+from .signal_tap import SignalTap
+
+# Manager methods the GUI may call through the control channel
+ENGINE_CALLS = {
+    "start",
+    "stop",
+    "toggle_playback",
+    "get_stats",
+    "get_available_devices",
+    "get_current_device_info",
+    "set_output_device",
+    "set_output_devices",
+    "set_left_modulation",
+    "set_right_modulation",
+    "load_session",
+    "play_fixed",
+    "clear_session",
+    "seek",
+    "get_position",
+}
+# Parameter updates are sent without waiting for a reply so typing never blocks on the engine
+ENGINE_CASTS = {
+    "set_left_parameters",
+    "set_right_parameters",
+    "set_channels_linked",
+    "set_volume",
+    "set_oversampling",
+}
+
+_COUNTER_BYTES = 8
+
+
+def _tap_views(shm: shared_memory.SharedMemory, capacity: int, channels: int):
+    """Counter and ring buffer laid out back to back in one shared memory block"""
+    counter = np.ndarray((1,), dtype=np.int64, buffer=shm.buf)
+    buffer = np.ndarray((capacity, channels), dtype=np.float32, buffer=shm.buf, offset=_COUNTER_BYTES)
+    return counter, buffer
+
+
+@contextlib.contextmanager
+def _minimal_main():
+    """Have spawned children initialise ``__main__`` from engine_main, not the GUI entry script"""
+    main_module = sys.modules["__main__"]
+    sys.modules["__main__"] = importlib.import_module(f"{__package__}.engine_main")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main_module
+
+
+def _engine_main(conn, log_queue, shm_name: str, config: dict):
+    """Child process entry point: own the AudioStreamManager and serve the control channel"""
+    root_logger = logging.getLogger()
+    root_logger.setLevel(config["log_level"])
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger = logging.getLogger(__name__)
+
+    # Imported here so the backend probe and its stderr note happen in the engine process
+    from .render_cache import RenderCache
+    from .stream_manager import AudioStreamManager
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    counter, buffer = _tap_views(shm, config["tap_capacity"], 2)
+    manager = AudioStreamManager(config["sample_rate"], config["block_size"], config["volume"])
+    manager.signal_tap = SignalTap(config["tap_capacity"], config["tap_decimation"], buffer=buffer, counter=counter)
+    conn.send(("ok", {"backend": manager.backend}))
+
+    try:
+        while True:
+            try:
+                method, args = conn.recv()
+            except EOFError:
+                break  # GUI process went away
+            if method == "close":
+                break
+            try:
+                if method == "set_render_cache":
+                    result = manager.set_render_cache(RenderCache(*args) if args else None)
+                else:
+                    result = getattr(manager, method)(*args)
+                reply = ("ok", result)
+            except Exception as e:
+                logger.error(f"Engine call {method} failed: {type(e).__name__}: {e}")
+                reply = ("error", str(e))
+            if method not in ENGINE_CASTS:
+                conn.send(reply)
+    finally:
+        manager.stop()
+        manager.signal_tap = None
+        del counter, buffer
+        shm.close()
+        conn.close()
+
+
+class EngineProcess:
+    """AudioStreamManager running in a separate process, driven through a thin proxy.
+
+    The audio callback gets an interpreter (and GIL) of its own, so the Qt event
+    loop, log traffic and repaints in the GUI process cannot delay it. Commands
+    travel over a pipe: setters are fire-and-forget, everything else waits for the
+    engine's reply. The engine writes its output tap into shared memory, so
+    ``enable_signal_tap()`` returns a reader over the same frames. Engine log
+    records are forwarded to the GUI process's logging.
+
+    Exposes the subset of the AudioStreamManager interface the GUI uses.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 44100,
+        block_size: int = 512,
+        volume: float = 0.4,
+        tap_capacity: int = 8192,
+        tap_decimation: int = 2,
+        log_level: int = logging.INFO,
+        start_timeout: float = 30.0,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.is_playing = False
+        self.session_plan = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._shm = shared_memory.SharedMemory(create=True, size=_COUNTER_BYTES + tap_capacity * 2 * 4)
+        counter, buffer = _tap_views(self._shm, tap_capacity, 2)
+        counter[0] = 0
+        self.signal_tap = SignalTap(tap_capacity, tap_decimation, buffer=buffer, counter=counter)
+
+        # Spawn rather than fork: forking a process that runs Qt and audio threads is unsafe
+        context = multiprocessing.get_context("spawn")
+        self._log_queue = context.Queue()
+        self._log_listener = threading.Thread(target=self._forward_logs, daemon=True)
+        self._log_listener.start()
+
+        self._conn, child_conn = context.Pipe()
+        config = {
+            "sample_rate": sample_rate,
+            "block_size": block_size,
+            "volume": volume,
+            "tap_capacity": tap_capacity,
+            "tap_decimation": tap_decimation,
+            "log_level": log_level,
+        }
+        self._process = context.Process(
+            target=_engine_main,
+            args=(child_conn, self._log_queue, self._shm.name, config),
+            name="iso-pulse-gen-engine",
+            daemon=True,
+        )
+        with _minimal_main():
+            self._process.start()
+        child_conn.close()
+
+        try:
+            if not self._conn.poll(start_timeout):
+                raise EOFError("timed out")
+            _, info = self._conn.recv()
+        except (EOFError, OSError) as e:
+            self.close()
+            raise RuntimeError(f"Audio engine process did not start: {e or 'exited early'}") from e
+        self.backend = info["backend"]
+        self.logger.info(f"Audio engine process started - PID: {self._process.pid}, Backend: {self.backend}")
+
+    def _forward_logs(self):
+        """Re-emit engine log records through this process's handlers (GUI log, console)"""
+        while True:
+            record = self._log_queue.get()
+            if record is None:
+                break
+            logging.getLogger(record.name).handle(record)
+
+    def _call(self, method: str, *args):
+        with self._lock:
+            if self._closed or not self._process.is_alive():
+                raise RuntimeError("Audio engine process is not running")
+            try:
+                self._conn.send((method, args))
+                if method in ENGINE_CASTS:
+                    return None
+                status, result = self._conn.recv()
+            except (EOFError, OSError) as e:
+                raise RuntimeError(f"Lost connection to audio engine process: {e}") from e
+        if status == "error":
+            raise RuntimeError(result)
+        return result
+
+    def __getattr__(self, name):
+        if name in ENGINE_CALLS or name in ENGINE_CASTS:
+            return lambda *args: self._call(name, *args)
+        raise AttributeError(name)
+
+    def start(self):
+        self._call("start")
+        self.is_playing = True
+
+    def stop(self):
+        if self._closed:
+            return
+        self._call("stop")
+        self.is_playing = False
+
+    def toggle_playback(self) -> bool:
+        self.is_playing = self._call("toggle_playback")
+        return self.is_playing
+
+    def load_session(self, plan):
+        self._call("load_session", plan)
+        self.session_plan = plan
+
+    def play_fixed(self, duration: float):
+        self.session_plan = self._call("play_fixed", duration)
+        return self.session_plan
+
+    def clear_session(self):
+        self._call("clear_session")
+        self.session_plan = None
+
+    def set_render_cache(self, cache):
+        """Configure the engine's own RenderCache over the same directory and size cap"""
+        self._call("set_render_cache", *((cache.directory, cache.max_bytes) if cache is not None else ()))
+
+    def enable_signal_tap(self, capacity: int = 8192, decimation: int = 2) -> SignalTap:
+        """Reader over the engine's output tap in shared memory (size fixed at construction)"""
+        return self.signal_tap
+
+    def disable_signal_tap(self):
+        pass  # The engine always publishes its tap; an unread ring costs one copy per block
+
+    def close(self, timeout: float = 5.0):
+        """Stop playback, shut the engine process down and release the shared memory"""
+        if self._closed:
+            return
+        with self._lock:
+            self._closed = True
+            try:
+                if self._process.is_alive():
+                    self._conn.send(("close", ()))
+            except OSError:
+                pass
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self.logger.warning("Audio engine process did not exit - terminating")
+            self._process.terminate()
+            self._process.join(timeout)
+        self._conn.close()
+        self.is_playing = False
+
+        self._log_queue.put(None)
+        self._log_listener.join(timeout)
+        self._log_queue.close()
+
+        # Drop our views before unmapping; the reader tap must not be used after close
+        self.signal_tap.buffer = np.zeros_like(self.signal_tap.buffer)
+        self.signal_tap.counter = np.zeros(1, dtype=np.int64)
+        self._shm.close()
+        self._shm.unlink()
+        self.logger.info("Audio engine process stopped")
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,209 @@
+"""Render-once output to several devices at the same time.
+
+A ``FanoutStream`` looks like a single OutputStream to the AudioStreamManager but
+opens one stream per device. Each block is rendered once, by whichever device
+needs it first, into a shared ring buffer; every device copies its own frames
+out of the ring at its own read position. The render cost is the same for one
+device or ten.
+
+Device clocks are never exactly equal, so a slower device falls further behind
+the render head over time. Each device's backlog (frames between its read
+position and the head) is smoothed, and a device whose backlog exceeds the
+least-behind device's by more than ``drift_tolerance`` frames reads one extra
+frame in its next callback. That frame is spread over the block by linear
+interpolation, a pitch change of about 0.2% for one block, which is inaudible.
+A device stalled past the ring capacity is hard-resynced to the head.
+"""
+
+import logging
+import threading
+from typing import Callable, Optional
+import numpy as np
+
+# Ring buffer length in blocks; bounds how far a stalled device may fall behind before a hard resync
+DEFAULT_RING_BLOCKS = 16
+# Backlog beyond the least-behind device (frames) that triggers one-frame drift correction
+DEFAULT_DRIFT_TOLERANCE = 64
+# EWMA weight of the newest backlog sample (about 50 callbacks of smoothing)
+DEFAULT_LEVEL_SMOOTHING = 0.02
+
+
+def dac_latency(time_info) -> float:
+    """Seconds between a callback and its block reaching the DAC (0 if the backend does not say)"""
+    try:
+        return max(0.0, time_info.outputBufferDacTime - time_info.currentTime)
+    except AttributeError:
+        return 0.0
+
+
+class DeviceOutput:
+    """Read position, smoothed backlog and counters for one device of a FanoutStream"""
+
+    def __init__(self, device, index: int):
+        self.device = device
+        self.index = index
+        self.stream = None
+        self.read_pos = 0
+        self.level = 0.0  # Smoothed backlog behind the render head, in frames
+        self.dac_latency = 0.0
+        self.callbacks = 0
+        self.frames_played = 0
+        self.dropped_frames = 0  # Frames skipped to keep up with faster devices
+        self.overruns = 0  # Hard resyncs after falling out of the ring
+
+    def get_stats(self, sample_rate: int) -> dict:
+        return {
+            "device": self.device,
+            "callbacks": self.callbacks,
+            "backlog_frames": self.level,
+            "latency_ms": (self.level / sample_rate + self.dac_latency) * 1000.0,
+            "dropped_frames": self.dropped_frames,
+            "drift_ppm": self.dropped_frames / self.frames_played * 1e6 if self.frames_played else 0.0,
+            "overruns": self.overruns,
+        }
+
+
+class FanoutStream:
+    """OutputStream stand-in that plays one rendered signal on several devices.
+
+    ``callback`` is called once per ``blocksize`` frames of new signal, from the
+    callback thread of whichever device is furthest ahead, and renders straight
+    into the ring buffer.
+    """
+
+    def __init__(
+        self,
+        samplerate: int,
+        blocksize: int,
+        channels: int,
+        callback: Callable,
+        dtype: str,
+        devices: list,
+        stream_factory: Optional[Callable] = None,
+        ring_blocks: int = DEFAULT_RING_BLOCKS,
+        drift_tolerance: int = DEFAULT_DRIFT_TOLERANCE,
+        level_smoothing: float = DEFAULT_LEVEL_SMOOTHING,
+        **kwargs,
+    ):
+        if not devices:
+            raise ValueError("FanoutStream needs at least one device")
+        if stream_factory is None:
+            raise ValueError("FanoutStream needs a stream factory for the device streams")
+        self.logger = logging.getLogger(__name__)
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.channels = channels
+        self.callback = callback
+        self.drift_tolerance = drift_tolerance
+        self.level_smoothing = level_smoothing
+        self._lock = threading.Lock()
+
+        self.capacity = max(2, ring_blocks) * blocksize
+        self._ring = np.zeros((self.capacity, channels), dtype=np.float32)
+        self._scratch = np.zeros((self.capacity, channels), dtype=np.float32)
+        self._head = 0  # Frames rendered so far
+        self.blocks_rendered = 0
+        self._resample_positions = {}
+
+        self.outputs = [DeviceOutput(device, i) for i, device in enumerate(devices)]
+        try:
+            for output in self.outputs:
+                params = {
+                    "samplerate": samplerate,
+                    "blocksize": blocksize,
+                    "channels": channels,
+                    "callback": lambda *args, output=output: self._device_callback(output, *args),
+                    "dtype": dtype,
+                    **kwargs,
+                }
+                if output.device is not None:
+                    params["device"] = output.device
+                output.stream = stream_factory(**params)
+        except Exception:
+            self.close()
+            raise
+        self.logger.info(f"Fan-out stream opened on {len(self.outputs)} devices: {list(devices)}")
+
+    def start(self):
+        """Start every device stream; if one fails, stop the started ones and close them all"""
+        started = []
+        try:
+            for output in self.outputs:
+                output.stream.start()
+                started.append(output.stream)
+        except Exception:
+            for output in self.outputs:
+                try:
+                    if output.stream in started:
+                        output.stream.stop()
+                    output.stream.close()
+                except Exception as e:
+                    self.logger.error(f"Error closing fan-out device {output.device}: {type(e).__name__}: {e}")
+            raise
+
+    def stop(self):
+        for output in self.outputs:
+            if output.stream is not None:
+                output.stream.stop()
+
+    def close(self):
+        for output in self.outputs:
+            if output.stream is not None:
+                output.stream.close()
+
+    def _render_to(self, position: int, time_info, status):
+        """Render whole blocks into the ring until ``position`` frames exist (caller holds the lock)"""
+        while self._head < position:
+            start = self._head % self.capacity
+            block = self._ring[start:start + self.blocksize]
+            block.fill(0)
+            self.callback(block, self.blocksize, time_info, status)
+            self._head += self.blocksize
+            self.blocks_rendered += 1
+
+    def _copy_out(self, start: int, out: np.ndarray):
+        """Copy ``len(out)`` frames starting at absolute frame ``start`` out of the ring"""
+        n = len(out)
+        offset = start % self.capacity
+        first = min(n, self.capacity - offset)
+        out[:first] = self._ring[offset:offset + first]
+        out[first:] = self._ring[:n - first]
+
+    def _device_callback(self, output: DeviceOutput, outdata: np.ndarray, frames: int, time_info, status):
+        with self._lock:
+            if self._head - output.read_pos + frames > self.capacity:
+                # Stalled long enough for the ring to wrap past it: rejoin at the newest block
+                output.read_pos = self._head - frames
+                output.overruns += 1
+                self.logger.warning(f"Fan-out device {output.device} fell out of the ring buffer - resynced")
+
+            # Drift correction against the device that is least behind
+            reference = min(other.level for other in self.outputs)
+            correct = output.level - reference > self.drift_tolerance and frames > 1
+            needed = frames + 1 if correct else frames
+
+            self._render_to(output.read_pos + needed, time_info, status)
+            if correct:
+                source = self._scratch[:needed]
+                self._copy_out(output.read_pos, source)
+                positions = self._resample_positions.get(frames)
+                if positions is None:
+                    positions = np.linspace(0.0, frames, frames)
+                    self._resample_positions[frames] = positions
+                for channel in range(self.channels):
+                    outdata[:, channel] = np.interp(positions, np.arange(needed), source[:, channel])
+                output.dropped_frames += 1
+            else:
+                self._copy_out(output.read_pos, outdata[:frames])
+            output.read_pos += needed
+
+            backlog = self._head - output.read_pos
+            output.level += self.level_smoothing * (backlog - output.level)
+            output.dac_latency = dac_latency(time_info)
+            output.callbacks += 1
+            output.frames_played += frames
+
+    def get_device_stats(self) -> list:
+        """Per-device backlog, latency and drift correction counts"""
+        with self._lock:
+            return [output.get_stats(self.samplerate) for output in self.outputs]
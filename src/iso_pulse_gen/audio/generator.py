@@ -1,22 +1,345 @@
+import copy
+from fractions import Fraction
+from typing import Optional
 import numpy as np
 import logging
+from .modulation import get_modulator
+from .oversampling import OVERSAMPLING_FACTORS, PolyphaseDecimator
+
+# Bump whenever a change alters rendered output, so cached renders are invalidated
+GENERATOR_VERSION = 1
+
+
+# Frequencies become exact ratios p/q of the sample rate with q below 2**31, so the phase
+# of any sample n is ((n mod q) * p mod q) / q in int64 without overflow
+MAX_RATIO_DENOMINATOR = (1 << 31) - 1
+
+# Oscillators in the order of generate_stereo_frames' arguments. What they play is up to each
+# channel's modulator: in isochronic mode they are the carrier and the pulse gate
+LEFT_CARRIER, LEFT_PULSE, RIGHT_CARRIER, RIGHT_PULSE = range(4)
+
+
+def frequency_ratio(freq: float, sample_rate: int) -> tuple:
+    """Cycles per sample as an exact fraction (numerator reduced mod the denominator)"""
+    ratio = (Fraction(max(0.0, freq)) / sample_rate).limit_denominator(MAX_RATIO_DENOMINATOR)
+    return ratio.numerator % ratio.denominator, ratio.denominator
 
 
 class AudioGenerator:
+    """Stereo isochronic tone generator with random access to any sample.
+
+    Live playback is driven by an integer sample counter. Each of the four phases
+    (left/right carrier and pulse) is anchored at the sample where its frequency
+    last changed, and the phase of any sample follows exactly from its distance
+    to the anchor, so output does not depend on how it is split into blocks and
+    seeking is O(1).
+
+    Each channel has a modulation mode (see ``modulation.py``) that tunes its two
+    oscillators from the carrier and pulse settings and renders them.
+
+    With oversampling enabled the oscillators run on a clock ``oversampling`` times
+    the output rate (anchors count ticks of that clock) and live output is band-
+    limited and decimated by a ``PolyphaseDecimator``.
+    """
+
     def __init__(self, sample_rate: int = 44100, volume: float = 0.4):
         self.logger = logging.getLogger(__name__)
         self.sample_rate = sample_rate
         self.volume = max(0.0, min(1.0, volume))  # Clamp volume between 0.0 and 1.0
-        self.phase_left = 0.0
-        self.phase_right = 0.0
-        self.pulse_phase_left = 0.0
-        self.pulse_phase_right = 0.0
+
+        # Absolute index of the next sample generate_stereo_frames() will produce
+        self.sample_position = 0
+        # Carrier and pulse settings per channel, and the oscillator frequencies the modulators derive from them
+        self.channel_params = (0.0, 0.0, 0.0, 0.0)
+        self.modulators = [get_modulator("isochronic")] * 2
+        self.frequencies = np.zeros(4)
+        self._anchor_samples = np.zeros((4, 1), dtype=np.int64)
+        self._anchor_cycles = np.zeros((4, 1))
+        self._ratio_num = np.zeros((4, 1), dtype=np.int64)
+        self._ratio_den = np.ones((4, 1), dtype=np.int64)
+        self._increments = np.zeros(4)  # Cycles per tick, as floats
+        self._step_table = np.zeros((4, 2048), dtype=np.int64)
+        self._scratch = np.empty((2, 2048))  # Working space for the modulator kernels
+        # Single-precision phases and kernel working space for draft renders
+        self._draft_ramp = np.arange(2048, dtype=np.float32)
+        self._draft_phases = np.empty((2, 4 * 2048), dtype=np.float32)
+        self._draft_scratch = np.empty((2, 2048), dtype=np.float32)
+        self._shared_channels = True  # Left and right oscillators and modes are identical
+
+        # Oscillator ticks per output sample, and the decimation filter with its carried history
+        self.oversampling = 1
+        self._decimator = None
+        self._filter_tail = None
+        self._filter_next = None  # Output sample the carried history leads into
+
+        # Session playback: a compiled SegmentPlan and the next sample to render from it
+        self.plan = None
+        self.plan_position = 0
         
         self.logger.info(f"AudioGenerator initialized - SR: {sample_rate}Hz, Volume: {volume}")
         
         # Track generation statistics for debugging
         self._generation_count = 0
 
+    def _cycles(self, positions: np.ndarray) -> np.ndarray:
+        """Phase in cycles [0, 1) of the four oscillators (rows) at the given absolute oscillator ticks"""
+        offsets = positions - self._anchor_samples
+        whole = (offsets % self._ratio_den) * self._ratio_num % self._ratio_den
+        return (self._anchor_cycles + whole / self._ratio_den) % 1.0
+
+    def _phase_at(self, row: int, tick: int) -> float:
+        """_cycles() of one oscillator at one tick, in Python scalars (no array round trip)"""
+        den = int(self._ratio_den[row, 0])
+        whole = (tick - int(self._anchor_samples[row, 0])) % den * int(self._ratio_num[row, 0]) % den
+        return (float(self._anchor_cycles[row, 0]) + whole / den) % 1.0
+
+    def _cycles_range(self, start_sample: int, num_frames: int, rows: Optional[slice] = None) -> np.ndarray:
+        """_cycles() for a contiguous range, bit-identical but without per-sample integer division.
+
+        ``(offset + k) * p mod q`` is ``r0 + step[k]`` wrapped once, where ``r0`` is the
+        block start's residue and ``step[k] = k * p mod q`` is tabulated per frequency.
+        ``rows`` selects the oscillators to compute (default: all four).
+        """
+        if num_frames > self._step_table.shape[1]:
+            self._build_step_table(num_frames, range(4))
+        if rows is None:
+            anchors, anchor_cycles, num, den = self._anchor_samples, self._anchor_cycles, self._ratio_num, self._ratio_den
+            steps = self._step_table[:, :num_frames]
+        else:
+            anchors, anchor_cycles = self._anchor_samples[rows], self._anchor_cycles[rows]
+            num, den = self._ratio_num[rows], self._ratio_den[rows]
+            steps = self._step_table[rows, :num_frames]
+        offsets = (start_sample - anchors) % den
+        whole = offsets * num % den + steps
+        whole -= (whole >= den) * den
+        cycles = whole / den
+        cycles += anchor_cycles
+        # Both terms are in [0, 1), so this equals % 1.0 (exactly) at a fraction of the cost
+        cycles -= np.floor(cycles)
+        return cycles
+
+    def _draft_cycles(self, start_sample: int, num_frames: int, rows: Optional[slice] = None) -> np.ndarray:
+        """Cheaper stand-in for _cycles_range(): single-precision increments from the exact phase at the block start.
+
+        Always at the output rate (skipping oversampling), into preallocated float32 rows
+        that the kernels then run on in single precision too. The phase error grows with
+        the cycles a block covers (about 1e-5 cycles for a 15 kHz carrier over 512 frames),
+        and the result is not bit-stable across block splits.
+        """
+        rows = slice(None) if rows is None else rows
+        tick = start_sample * self.oversampling
+        # Exact start phases in Python integers (cheaper than a small-array _cycles() round trip)
+        starts = [
+            (cycles + (tick - anchor) % den * num % den / den) % 1.0
+            for anchor, cycles, num, den in zip(
+                self._anchor_samples[rows, 0].tolist(),
+                self._anchor_cycles[rows, 0].tolist(),
+                self._ratio_num[rows, 0].tolist(),
+                self._ratio_den[rows, 0].tolist(),
+            )
+        ]
+        count = len(starts)
+        # Contiguous (count, num_frames) views onto flat buffers
+        cycles = self._draft_phases[0, :count * num_frames].reshape(count, num_frames)
+        wraps = self._draft_phases[1, :count * num_frames].reshape(count, num_frames)
+        increments = (self._increments[rows] * self.oversampling).astype(np.float32)
+        np.multiply(increments[:, np.newaxis], self._draft_ramp[:num_frames], out=cycles)
+        np.add(cycles, np.array(starts, dtype=np.float32)[:, np.newaxis], out=cycles)
+        np.floor(cycles, out=wraps)
+        np.subtract(cycles, wraps, out=cycles)
+        return cycles
+
+    def _build_step_table(self, length: int, rows):
+        length = max(length, self._step_table.shape[1])
+        if length > self._step_table.shape[1]:
+            self._step_table = np.empty((4, length), dtype=np.int64)
+            rows = range(4)
+        steps = np.arange(length, dtype=np.int64)
+        for i in rows:
+            self._step_table[i] = steps * self._ratio_num[i] % self._ratio_den[i]
+
+    def set_frequencies(
+        self,
+        left_carrier_freq: float,
+        left_pulse_freq: float,
+        right_carrier_freq: float,
+        right_pulse_freq: float,
+        at_sample: Optional[int] = None,
+    ):
+        """Change frequencies from ``at_sample`` on (default: the current position), keeping phase continuous"""
+        params = (left_carrier_freq, left_pulse_freq, right_carrier_freq, right_pulse_freq)
+        if params == self.channel_params:
+            return
+        self.channel_params = params
+        self._retune(at_sample)
+
+        for side, carrier_freq, pulse_freq in (("left", *params[:2]), ("right", *params[2:])):
+            if carrier_freq <= 0 or pulse_freq <= 0:
+                self.logger.warning(f"Invalid frequencies for {side} channel: carrier={carrier_freq}Hz, pulse={pulse_freq}Hz")
+
+    def set_modulation(self, left_mode: str, right_mode: str, at_sample: Optional[int] = None):
+        """Select each channel's modulation mode by registry name (raises ValueError for unknown modes)"""
+        modulators = [get_modulator(left_mode), get_modulator(right_mode)]
+        if modulators == self.modulators:
+            return
+        self.modulators = modulators
+        self._retune(at_sample)
+        if modulators[0] is modulators[1] and np.array_equal(self.frequencies[:2], self.frequencies[2:]):
+            # Identical settings again (e.g. linked channels back from a per-side mode): the switch is a
+            # discontinuity anyway, so put the right oscillators back on the left ones for good
+            self._anchor_samples[2:] = self._anchor_samples[:2]
+            self._anchor_cycles[2:] = self._anchor_cycles[:2]
+        self._update_shared_channels()
+        self.logger.info(f"Modulation set - Left: {left_mode}, Right: {right_mode}")
+
+    @property
+    def modulation(self) -> tuple:
+        return tuple(modulator.name for modulator in self.modulators)
+
+    def _retune(self, at_sample: Optional[int]):
+        """Re-anchor the oscillators whose frequency changed under the current settings and modes"""
+        at_sample = self.sample_position if at_sample is None else at_sample
+        at_tick = at_sample * self.oversampling
+        lc, lp, rc, rp = self.channel_params
+        frequencies = self.modulators[0].oscillator_frequencies(lc, lp, 0) + self.modulators[1].oscillator_frequencies(rc, rp, 1)
+        changed = [i for i, freq in enumerate(frequencies) if freq != self.frequencies[i]]
+        if not changed:
+            return
+        self._reanchor(changed, at_tick, at_tick)
+        for i in changed:
+            self._ratio_num[i], self._ratio_den[i] = frequency_ratio(frequencies[i], self.sample_rate * self.oversampling)
+            self.frequencies[i] = frequencies[i]
+        self._increments = self._ratio_num[:, 0] / self._ratio_den[:, 0]
+        self._build_step_table(self._step_table.shape[1], changed)
+        self._update_shared_channels()
+
+    def _reanchor(self, rows, old_tick: int, new_tick: int):
+        """Anchor ``rows`` at ``new_tick`` with the phase they have at ``old_tick`` under the current ratios"""
+        anchor_cycles = self._cycles(np.array([old_tick], dtype=np.int64))[:, 0]
+        for i in rows:
+            self._anchor_cycles[i] = anchor_cycles[i]
+            self._anchor_samples[i] = new_tick
+
+    def set_oversampling(self, factor: int):
+        """Run the oscillators at ``factor`` times the output rate (1, 2 or 4), keeping phase continuous.
+
+        Only live parameters are oversampled; session plans and draft renders use the output rate.
+        """
+        if factor not in OVERSAMPLING_FACTORS:
+            raise ValueError(f"Oversampling factor must be one of {OVERSAMPLING_FACTORS}, got {factor}")
+        if factor == self.oversampling:
+            return
+        self._reanchor(range(4), self.sample_position * self.oversampling, self.sample_position * factor)
+        self.oversampling = factor
+        for i in range(4):
+            self._ratio_num[i], self._ratio_den[i] = frequency_ratio(self.frequencies[i], self.sample_rate * factor)
+        self._increments = self._ratio_num[:, 0] / self._ratio_den[:, 0]
+        self._build_step_table(self._step_table.shape[1], range(4))
+        self._update_shared_channels()
+        self._decimator = PolyphaseDecimator(factor) if factor > 1 else None
+        self._filter_tail = self._filter_next = None
+        self.logger.info(f"Oversampling set to {factor}x")
+
+    def render_range(self, start_sample: int, num_frames: int, draft: bool = False) -> np.ndarray:
+        """Render ``num_frames`` starting at an absolute sample position (O(1) seek).
+
+        Uses the loaded session plan if there is one, otherwise the current frequencies.
+        ``draft`` trades bit-exact phase and oversampling for a cheaper render (live parameters only).
+        When oversampling, the decimation filter's history is kept for a render that
+        continues this one and re-rendered for any other start.
+        """
+        if self.plan is not None:
+            return self.render_plan_frames(self.plan, start_sample, num_frames)
+
+        gains = self._channel_gains()
+        if not any(gains):
+            # Silent at any rate: skip the oscillators, and the filter history is silence too
+            if self._decimator is not None and not draft:
+                self._filter_tail = np.zeros((self._decimator.length - self.oversampling, 2), dtype=np.float32)
+                self._filter_next = start_sample + num_frames
+            return np.zeros((num_frames, 2), dtype=np.float32)
+        if draft or self._decimator is None:
+            return self._render_channels(start_sample, num_frames, gains, draft)
+        return self._render_oversampled(start_sample, num_frames, gains)
+
+    def _channel_gains(self) -> tuple:
+        # A channel with a non-positive frequency is silent
+        params = self.channel_params
+        return tuple(self.volume if params[2 * ch] > 0 and params[2 * ch + 1] > 0 else 0.0 for ch in range(2))
+
+    def _render_oversampled(self, start_sample: int, num_frames: int, gains: tuple) -> np.ndarray:
+        decimator = self._decimator
+        # The filter is linear-phase, so rendering ``delay`` ticks ahead keeps output aligned with the base path
+        end_tick = (start_sample + num_frames - 1) * self.oversampling + decimator.delay + 1
+        if self._filter_next == start_sample:
+            history = self._filter_tail
+            new_ticks = num_frames * self.oversampling
+            ticks = np.concatenate((history, self._render_channels(end_tick - new_ticks, new_ticks, gains)))
+        else:
+            length = decimator.input_length(num_frames)
+            ticks = self._render_channels(end_tick - length, length, gains)
+        self._filter_tail = ticks[len(ticks) - (decimator.length - self.oversampling):]
+        self._filter_next = start_sample + num_frames
+        return decimator.decimate(ticks)
+
+    def _render_channels(self, start: int, num_frames: int, gains: tuple, draft: bool = False) -> np.ndarray:
+        """Run each channel's modulator from oscillator tick ``start`` into (n, 2) float32 frames.
+
+        Only what can be heard is computed: silent channels stay zero, a right channel
+        identical to the left is copied from it, and in gated modes the carrier is
+        computed only over the span where a gate is open. ``start`` counts output
+        samples for draft renders.
+        """
+        phases = self._draft_cycles if draft else self._cycles_range
+        if num_frames > self._scratch.shape[1]:
+            self._scratch = np.empty((2, num_frames))
+        if draft and num_frames > len(self._draft_ramp):
+            self._draft_ramp = np.arange(num_frames, dtype=np.float32)
+            self._draft_phases = np.empty((2, 4 * num_frames), dtype=np.float32)
+            self._draft_scratch = np.empty((2, num_frames), dtype=np.float32)
+        scratch_rows = self._draft_scratch if draft else self._scratch
+        stereo_frames = np.zeros((num_frames, 2), dtype=np.float32)
+        shared = self._shared_channels and gains[0] == gains[1]
+        channels = [channel for channel in ((0,) if shared else (0, 1)) if gains[channel]]
+        # Oscillator rows of the active channels: each channel's carrier and pulse are rows 2c and 2c + 1
+        rows = None if len(channels) == 2 else slice(2 * channels[0], 2 * channels[0] + 2)
+        modulators = [self.modulators[channel] for channel in channels]
+
+        if not (modulators[0].gated and modulators[-1].gated):
+            cycles = phases(start, num_frames, rows)
+            scratch = scratch_rows[:, :num_frames]
+            for i, (channel, modulator) in enumerate(zip(channels, modulators)):
+                modulator.render(cycles[2 * i], cycles[2 * i + 1], gains[channel], stereo_frames[:, channel], scratch)
+        else:
+            # Narrow the block to the span where a gate is open, from each pulse's phase and rate
+            tick, scale = (start * self.oversampling, self.oversampling) if draft else (start, 1)
+            spans = [
+                modulator.open_span(
+                    self._phase_at(2 * channel + 1, tick), float(self._increments[2 * channel + 1]) * scale, num_frames
+                )
+                for channel, modulator in zip(channels, modulators)
+            ]
+            lo = min(span[0] for span in spans)
+            hi = max(span[1] for span in spans)
+            if hi <= lo:
+                return stereo_frames  # Every gate is closed for the whole block
+            cycles = phases(start + lo, hi - lo, rows)
+            for i, (channel, modulator) in enumerate(zip(channels, modulators)):
+                a, b = spans[i]
+                if b > a:
+                    modulator.render(cycles[2 * i, a - lo:b - lo], cycles[2 * i + 1, a - lo:b - lo],
+                                     gains[channel], stereo_frames[a:b, channel], scratch_rows[:, :b - a])
+        if shared:
+            stereo_frames[:, 1] = stereo_frames[:, 0]
+        return stereo_frames
+
+    def _update_shared_channels(self):
+        """Note whether both channels run the same mode on identical oscillators (and so render the same)"""
+        self._shared_channels = self.modulators[0] is self.modulators[1] and all(
+            np.array_equal(state[:2], state[2:])
+            for state in (self._anchor_samples, self._anchor_cycles, self._ratio_num, self._ratio_den)
+        )
+
     def generate_stereo_frames(
         self,
         num_frames: int,
@@ -24,62 +347,123 @@ class AudioGenerator:
         left_pulse_freq: float,
         right_carrier_freq: float,
         right_pulse_freq: float,
+        draft: bool = False,
     ) -> np.ndarray:
-        left_channel = self._generate_channel(
-            num_frames, left_carrier_freq, left_pulse_freq, is_left=True
-        )
+        self.set_frequencies(left_carrier_freq, left_pulse_freq, right_carrier_freq, right_pulse_freq)
+        stereo_frames = self.render_range(self.sample_position, num_frames, draft)
+        self.sample_position += num_frames
+        return stereo_frames
 
-        right_channel = self._generate_channel(
-            num_frames, right_carrier_freq, right_pulse_freq, is_left=False
-        )
+    def _phase_radians(self, index: int) -> float:
+        cycles = self._cycles(np.array([self.sample_position * self.oversampling], dtype=np.int64))[index, 0]
+        return 2 * np.pi * float(cycles)
 
-        stereo_frames = np.column_stack((left_channel, right_channel))
-        # Apply volume gain
-        stereo_frames *= self.volume
-        return stereo_frames.astype(np.float32)
+    @property
+    def phase_left(self) -> float:
+        """Carrier phase of the next sample, in radians"""
+        return self._phase_radians(LEFT_CARRIER)
 
-    def _generate_channel(
-        self, num_frames: int, carrier_freq: float, pulse_freq: float, is_left: bool
-    ) -> np.ndarray:
-        if carrier_freq <= 0 or pulse_freq <= 0:
-            self.logger.warning(f"Invalid frequencies for {'left' if is_left else 'right'} channel: carrier={carrier_freq}Hz, pulse={pulse_freq}Hz")
-            return np.zeros(num_frames)
+    @property
+    def pulse_phase_left(self) -> float:
+        return self._phase_radians(LEFT_PULSE)
 
-        t = np.arange(num_frames) / self.sample_rate
+    @property
+    def phase_right(self) -> float:
+        return self._phase_radians(RIGHT_CARRIER)
 
-        if is_left:
-            carrier_phase = self.phase_left
-            pulse_phase = self.pulse_phase_left
-        else:
-            carrier_phase = self.phase_right
-            pulse_phase = self.pulse_phase_right
+    @property
+    def pulse_phase_right(self) -> float:
+        return self._phase_radians(RIGHT_PULSE)
 
-        carrier_phase_array = 2 * np.pi * carrier_freq * t + carrier_phase
-        carrier_wave = np.sin(carrier_phase_array)
+    def render_plan_frames(self, plan, start_sample: int, num_frames: int) -> np.ndarray:
+        """Render ``num_frames`` of a SegmentPlan starting at an absolute sample position.
 
-        pulse_phase_array = 2 * np.pi * pulse_freq * t + pulse_phase
-        square_wave = (np.sin(pulse_phase_array) >= 0).astype(np.float32)
+        Everything is evaluated in closed form from the plan breakpoints, so the output
+        does not depend on how a render is split into blocks. Samples past the end of
+        the plan are silent.
+        """
+        n = np.arange(start_sample, start_sample + num_frames, dtype=np.int64)
+        k = np.searchsorted(plan.positions, n, side="right") - 1
+        np.clip(k, 0, len(plan.positions) - 1, out=k)
+        dt = (n - plan.positions[k]).astype(np.float64)[:, np.newaxis]
 
-        modulated_wave = carrier_wave * square_wave
+        values = plan.values[k]
+        slopes = plan.slopes[k]
+        phases = plan.phases[k] + (values[:, :4] + 0.5 * slopes[:, :4] * dt) * dt / plan.sample_rate
 
-        new_carrier_phase = carrier_phase_array[-1] % (2 * np.pi)
-        new_pulse_phase = pulse_phase_array[-1] % (2 * np.pi)
+        carrier = np.sin(2 * np.pi * phases[:, 0::2])
+        gate = (phases[:, 1::2] % 1.0) <= 0.5
+        gain = (values[:, 4:] + slopes[:, 4:] * dt) * (n < plan.total_samples)[:, np.newaxis]
 
-        if is_left:
-            self.phase_left = new_carrier_phase
-            self.pulse_phase_left = new_pulse_phase
+        stereo_frames = carrier * gate * gain * self.volume
+        return stereo_frames.astype(np.float32)
+
+    def load_plan(self, plan):
+        """Drive generate_plan_frames() from a SegmentPlan (None to go back to fixed parameters)"""
+        self.plan = plan
+        self.plan_position = 0
+        if plan is not None:
+            self.logger.info(f"Session plan loaded: {plan}")
+
+    def generate_plan_frames(self, num_frames: int) -> np.ndarray:
+        frames = self.render_plan_frames(self.plan, self.plan_position, num_frames)
+        self.plan_position += num_frames
+        return frames
+
+    def advance(self, num_frames: int):
+        """Move the playback position forward without rendering"""
+        if self.plan is not None:
+            self.plan_position += num_frames
         else:
-            self.phase_right = new_carrier_phase
-            self.pulse_phase_right = new_pulse_phase
+            self.sample_position += num_frames
+
+    def seek(self, sample: int):
+        """Jump to an absolute sample position (live parameters and session plan alike)"""
+        self.sample_position = max(0, int(sample))
+        self.plan_position = self.sample_position
+
+    def clone(self) -> "AudioGenerator":
+        """Return an independent generator that continues from the current phase state"""
+        clone = copy.copy(self)
+        for name in ("frequencies", "_anchor_samples", "_anchor_cycles", "_ratio_num", "_ratio_den", "_increments", "_step_table", "_scratch",
+                     "_draft_phases", "_draft_scratch"):
+            setattr(clone, name, getattr(self, name).copy())
+        if self._filter_tail is not None:
+            clone._filter_tail = self._filter_tail.copy()
+        return clone
+
+    def sync_from(self, other: "AudioGenerator"):
+        """Continue from ``other``'s phase and parameter state, copying into this generator's buffers.
 
-        return modulated_wave
+        Used on the audio thread with a generator cloned beforehand: it allocates only
+        when ``other``'s buffers have grown since (a larger block size or oversampling change).
+        """
+        state = ("frequencies", "_anchor_samples", "_anchor_cycles", "_ratio_num", "_ratio_den", "_increments", "_step_table",
+                 "_filter_tail")
+        own = {name: getattr(self, name) for name in state + ("_scratch", "_draft_ramp", "_draft_phases", "_draft_scratch")}
+        modulators = self.modulators
+        self.__dict__.update(other.__dict__)
+        modulators[:] = other.modulators
+        self.modulators = modulators
+        for name in state:
+            source, target = getattr(other, name), own[name]
+            if source is None or target is None or target.shape != source.shape:
+                setattr(self, name, None if source is None else source.copy())
+            else:
+                target[...] = source
+                setattr(self, name, target)
+        # Working space only needs to be large enough; rendering grows it on demand
+        for name in ("_scratch", "_draft_ramp", "_draft_phases", "_draft_scratch"):
+            setattr(self, name, own[name])
 
     def reset_phases(self):
         self.logger.debug("Resetting audio generation phases")
-        self.phase_left = 0.0
-        self.phase_right = 0.0
-        self.pulse_phase_left = 0.0
-        self.pulse_phase_right = 0.0
+        self.sample_position = 0
+        self._anchor_samples[:] = 0
+        self._anchor_cycles[:] = 0.0
+        self._filter_tail = self._filter_next = None
+        self._update_shared_channels()
+        self.plan_position = 0
         self._generation_count = 0
     
     def set_volume(self, volume: float):
@@ -4,6 +4,10 @@ from typing import Optional, Callable
 import numpy as np
 
 
+class PortAudioError(Exception):
+    """Mock of sounddevice.PortAudioError so error handling works without PortAudio"""
+
+
 class MockOutputStream:
     """Mock audio stream that simulates sounddevice.OutputStream API"""
 
@@ -56,10 +60,11 @@ class MockOutputStream:
     def _run_callback_loop(self):
         """Simulate audio callbacks at regular intervals"""
         callback_interval = self.blocksize / self.samplerate
+        # Absolute deadlines: sleep overshoot in one block is absorbed by the next instead of
+        # accumulating, so the mock keeps the device's sample clock over long runs
+        next_deadline = time.perf_counter()
 
         while not self._stop_event.is_set():
-            start_time = time.time()
-
             # Create output buffer
             outdata = np.zeros((self.blocksize, self.channels), dtype=np.float32)
 
@@ -70,10 +75,45 @@ class MockOutputStream:
                 print(f"Error in mock audio callback: {e}")
 
             # Sleep to maintain timing
-            elapsed = time.time() - start_time
-            sleep_time = max(0, callback_interval - elapsed)
+            next_deadline += callback_interval
+            sleep_time = next_deadline - time.perf_counter()
             if sleep_time > 0:
                 time.sleep(sleep_time)
+            elif sleep_time < -callback_interval:
+                # More than a block behind (an underrun on real hardware): resync instead of bursting
+                next_deadline = time.perf_counter()
+
+
+class VirtualOutputStream(MockOutputStream):
+    """Mock stream on a virtual clock.
+
+    No thread is started; callbacks run only when ``advance()`` is called, as fast
+    as the host allows, so hours of playback can be simulated in minutes. The
+    output buffer is reused between blocks like a real device buffer.
+    """
+
+    def __init__(self, samplerate: int, blocksize: int, channels: int, callback: Callable, dtype: str, device=None, **kwargs):
+        super().__init__(samplerate, blocksize, channels, callback, dtype, device, **kwargs)
+        self.frames_played = 0
+        self.outdata = np.zeros((blocksize, channels), dtype=np.float32)
+
+    @property
+    def time(self) -> float:
+        """Virtual stream time in seconds"""
+        return self.frames_played / self.samplerate
+
+    def start(self):
+        self.is_active = True
+
+    def stop(self):
+        self.is_active = False
+
+    def advance(self) -> np.ndarray:
+        """Run one callback and return the block it produced"""
+        self.outdata.fill(0)
+        self.callback(self.outdata, self.blocksize, None, None)
+        self.frames_played += self.blocksize
+        return self.outdata
 
 
 def query_devices():
@@ -0,0 +1,159 @@
+"""Modulation modes for the live generator.
+
+Every channel of the generator owns two exact-phase oscillators. A modulator
+decides what their frequencies are for a channel's carrier and pulse settings,
+and how to turn their phases into samples. Its ``render`` kernel writes
+straight into the channel's column of the output block, using ufuncs with
+``out=`` on a per-generator scratch buffer, so a mode costs no allocations and
+no passes beyond its own arithmetic.
+
+Gated modes (isochronic) are silent for part of every pulse cycle. They set
+``gated`` and report through ``open_span`` where a block can be non-zero, and
+the generator computes oscillator phases and runs the kernel only there.
+
+New modes are added with ``@register_modulator`` on a ``Modulator`` subclass.
+"""
+
+import math
+import numpy as np
+
+TWO_PI = 2 * np.pi
+
+MODULATORS = {}
+
+
+def register_modulator(cls):
+    """Class decorator: make a Modulator available by its ``name``"""
+    MODULATORS[cls.name] = cls()
+    return cls
+
+
+def get_modulator(name: str) -> "Modulator":
+    try:
+        return MODULATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown modulation mode: {name} (available: {', '.join(MODULATORS)})") from None
+
+
+class Modulator:
+    """One modulation mode: oscillator tuning plus a render kernel"""
+
+    name = ""
+    label = ""
+    # Set by modes that are silent over stretches of the second oscillator's cycle (see open_span)
+    gated = False
+
+    def oscillator_frequencies(self, carrier: float, pulse: float, side: int) -> tuple:
+        """Frequencies of the channel's two oscillators; ``side`` is 0 for left, 1 for right"""
+        return carrier, pulse
+
+    def render(self, phase_a: np.ndarray, phase_b: np.ndarray, gain: float, out: np.ndarray, scratch: np.ndarray):
+        """Write one channel into ``out`` from oscillator phases in cycles [0, 1).
+
+        ``scratch`` holds two rows of len(out) the kernel may overwrite, in the phases'
+        dtype (float64, or float32 for draft renders).
+        """
+        raise NotImplementedError
+
+    def open_span(self, phase_b: float, increment: float, num_frames: int) -> tuple:
+        """(start, stop) bounding the samples of a block where a gated mode can be non-zero.
+
+        ``phase_b`` is the second oscillator's phase at the first sample and ``increment``
+        its cycles per sample. The generator renders only inside the span (not at all if
+        start == stop) and leaves the rest of the channel at zero, so the span may be
+        generous but must never cut off a sample the kernel would make non-zero.
+        """
+        return 0, num_frames
+
+
+@register_modulator
+class IsochronicModulator(Modulator):
+    """Carrier gated on and off by a square wave at the pulse rate"""
+
+    name = "isochronic"
+    label = "Isochronic"
+    gated = True
+
+    def open_span(self, phase_b, increment, num_frames):
+        # The phase is linear over the block: find the first and last open sample. The kernel's
+        # exact gate decides everything in between, so the estimated edges only need a one-sample margin
+        if phase_b <= 0.5:
+            first = 0
+        elif increment:
+            first = max(0, math.ceil((1.0 - phase_b) / increment) - 1)
+        else:
+            return 0, 0
+        end_phase = phase_b + (num_frames - 1) * increment
+        end_cycle = end_phase % 1.0
+        if end_cycle <= 0.5 or end_cycle > 1.0 - increment:
+            last = num_frames - 1
+        else:
+            last = min(num_frames - 1, int((math.floor(end_phase) + 0.5 - phase_b) / increment) + 1)
+        return (first, last + 1) if last >= first else (0, 0)
+
+    def render(self, phase_a, phase_b, gain, out, scratch):
+        tone, gate = scratch
+        np.multiply(phase_a, TWO_PI, out=tone)
+        np.sin(tone, out=tone)
+        # The gate is open for the first half of each pulse cycle
+        np.less_equal(phase_b, 0.5, out=gate)
+        np.multiply(tone, gate, out=tone)
+        np.multiply(tone, gain, out=out)
+
+
+@register_modulator
+class SineAMModulator(Modulator):
+    """Carrier with a raised-sine envelope at the pulse rate (peaks a quarter into each pulse cycle)"""
+
+    name = "sine_am"
+    label = "Sine AM"
+
+    def render(self, phase_a, phase_b, gain, out, scratch):
+        tone, envelope = scratch
+        np.multiply(phase_b, TWO_PI, out=envelope)
+        np.sin(envelope, out=envelope)
+        np.multiply(envelope, 0.5 * gain, out=envelope)
+        np.add(envelope, 0.5 * gain, out=envelope)
+        np.multiply(phase_a, TWO_PI, out=tone)
+        np.sin(tone, out=tone)
+        np.multiply(tone, envelope, out=out)
+
+
+@register_modulator
+class BinauralModulator(Modulator):
+    """Pure tone half the pulse rate below (left) or above (right) the carrier.
+
+    The beat at the pulse rate arises between the ears when both channels use this mode.
+    """
+
+    name = "binaural"
+    label = "Binaural"
+
+    def oscillator_frequencies(self, carrier, pulse, side):
+        return carrier + (pulse / 2 if side else -pulse / 2), 0.0
+
+    def render(self, phase_a, phase_b, gain, out, scratch):
+        tone = scratch[0]
+        np.multiply(phase_a, TWO_PI, out=tone)
+        np.sin(tone, out=tone)
+        np.multiply(tone, gain, out=out)
+
+
+@register_modulator
+class MonauralModulator(Modulator):
+    """Two tones half the pulse rate either side of the carrier, mixed in the same channel"""
+
+    name = "monaural"
+    label = "Monaural"
+
+    def oscillator_frequencies(self, carrier, pulse, side):
+        return carrier - pulse / 2, carrier + pulse / 2
+
+    def render(self, phase_a, phase_b, gain, out, scratch):
+        low, high = scratch
+        np.multiply(phase_a, TWO_PI, out=low)
+        np.sin(low, out=low)
+        np.multiply(phase_b, TWO_PI, out=high)
+        np.sin(high, out=high)
+        np.add(low, high, out=low)
+        np.multiply(low, 0.5 * gain, out=out)
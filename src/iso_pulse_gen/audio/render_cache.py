@@ -0,0 +1,187 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from typing import Optional
+import numpy as np
+from .generator import GENERATOR_VERSION
+from .session import SegmentPlan, render_plan
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def default_cache_dir() -> str:
+    """Per-user cache directory for rendered audio"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(base, "iso-pulse-gen", "renders")
+
+
+class RenderCache:
+    """Content-addressed on-disk cache of float32 stereo renders with LRU eviction.
+
+    Entries are ``.npy`` files named by a SHA-256 of everything that affects the
+    output, read back as read-only memmaps. Recency is the file mtime, which is
+    bumped on every hit, so the LRU order survives restarts.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._pending = set()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self.evictions = 0
+
+        self.logger.info(f"RenderCache initialized - Dir: {self.directory}, Cap: {max_bytes / 1024**2:.0f} MiB")
+
+    @staticmethod
+    def make_key(
+        sample_rate: int,
+        left_carrier_freq,
+        left_pulse_freq,
+        right_carrier_freq,
+        right_pulse_freq,
+        volume,
+        envelope,
+        duration,
+    ) -> str:
+        """Hash the render parameters. Array-valued arguments (timelines) are hashed by content."""
+        digest = hashlib.sha256()
+        header = {"generator_version": GENERATOR_VERSION, "sample_rate": int(sample_rate), "duration": duration}
+        digest.update(json.dumps(header, sort_keys=True).encode())
+        for value in (left_carrier_freq, left_pulse_freq, right_carrier_freq, right_pulse_freq, volume, envelope):
+            digest.update(np.ascontiguousarray(value, dtype=np.float64).tobytes())
+            digest.update(b"|")
+        return digest.hexdigest()
+
+    @classmethod
+    def plan_key(cls, plan: SegmentPlan) -> str:
+        # Entries are rendered at unity volume; the plan's gain column is the envelope,
+        # hashed together with the breakpoint positions every column shares
+        envelope = np.column_stack([plan.positions.astype(np.float64), plan.values[:, 4]])
+        return cls.make_key(
+            plan.sample_rate,
+            plan.values[:, 0],
+            plan.values[:, 1],
+            plan.values[:, 2],
+            plan.values[:, 3],
+            1.0,
+            envelope,
+            plan.total_samples,
+        )
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the cached render as a read-only memmap, or None on a miss"""
+        path = self._path(key)
+        try:
+            render = np.load(path, mmap_mode="r")
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        self.logger.debug(f"Render cache hit: {key[:12]}")
+        return render
+
+    def record_served(self, num_bytes: int):
+        # Called from the audio callback; a plain int add is atomic enough for stats
+        self.bytes_served += num_bytes
+
+    def store_plan(self, plan: SegmentPlan, key: Optional[str] = None) -> Optional[str]:
+        """Render a plan into the cache (no-op if cached, in progress or larger than the cap)"""
+        key = key or self.plan_key(plan)
+        size = plan.total_samples * 2 * np.dtype(np.float32).itemsize
+        if size > self.max_bytes:
+            self.logger.info(f"Session '{plan.name}' ({size / 1024**2:.0f} MiB) exceeds the render cache cap - not cached")
+            return None
+        path = self._path(key)
+        with self._lock:
+            if key in self._pending or os.path.exists(path):
+                return key
+            self._pending.add(key)
+        try:
+            # Render to a temporary name so a partial file is never served
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+            render = render_plan(plan, tmp_path, volume=1.0)
+            del render
+            os.replace(tmp_path, path)
+            self.logger.info(f"Cached render of session '{plan.name}' ({size / 1024**2:.1f} MiB)")
+        except OSError as e:
+            self.logger.error(f"Could not write render cache entry: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+        self.evict()
+        return key
+
+    def store_plan_async(self, plan: SegmentPlan) -> threading.Thread:
+        thread = threading.Thread(target=self.store_plan, args=(plan,), daemon=True)
+        thread.start()
+        return thread
+
+    def _entries(self) -> list:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".npy") or name.endswith(".tmp.npy"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits under max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError as e:
+                # Still memory-mapped on Windows; try again on the next eviction
+                self.logger.debug(f"Could not evict {name}: {e}")
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+            self.logger.info(f"Evicted cached render {name} ({size / 1024**2:.1f} MiB)")
+
+    def clear(self):
+        for _, _, name in self._entries():
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def get_stats(self) -> dict:
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_served": self.bytes_served,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "size_bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
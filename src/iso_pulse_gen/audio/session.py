@@ -0,0 +1,245 @@
+import json
+import logging
+import os
+import tomllib
+from typing import Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Column order of SegmentPlan.values
+PLAN_COLUMNS = ("left_carrier", "left_pulse", "right_carrier", "right_pulse", "volume")
+PHASE_COLUMNS = PLAN_COLUMNS[:4]
+
+# Long holds are split so in-segment phase offsets stay small enough for float64
+MAX_PLAN_INTERVAL_SAMPLES = 1 << 20
+
+
+class SegmentPlan:
+    """Flat, precomputed render plan compiled from a session timeline.
+
+    The plan is a list of breakpoints at absolute sample positions. Between two
+    breakpoints every parameter moves linearly, so any sample's carrier/pulse phase
+    and volume follow in closed form from the breakpoint before it:
+
+        phase(n) = phases[k] + (values[k] * dt + slopes[k] * dt**2 / 2) / sample_rate
+
+    with ``dt = n - positions[k]``. Phases are stored in cycles (mod 1).
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        positions: np.ndarray,
+        values: np.ndarray,
+        name: str = "",
+    ):
+        if len(positions) < 2:
+            raise ValueError("A segment plan needs at least two breakpoints")
+        self.sample_rate = sample_rate
+        self.name = name
+        self.positions = np.ascontiguousarray(positions, dtype=np.int64)
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+
+        lengths = np.diff(self.positions).astype(np.float64)
+        if np.any(lengths <= 0):
+            raise ValueError("Breakpoint positions must be strictly increasing")
+
+        # Per-sample slope of every parameter in each interval (last row repeats as a hold)
+        slopes = np.zeros_like(self.values)
+        slopes[:-1] = np.diff(self.values, axis=0) / lengths[:, np.newaxis]
+        self.slopes = slopes
+
+        # Phase (in cycles) at every breakpoint: exact integral of the linear frequency ramps
+        freqs = self.values[:, :4]
+        advance = (freqs[:-1] + freqs[1:]) * 0.5 * lengths[:, np.newaxis] / sample_rate
+        phases = np.zeros_like(freqs)
+        for k in range(len(advance)):
+            phases[k + 1] = (phases[k] + advance[k]) % 1.0
+        self.phases = phases
+
+    @property
+    def total_samples(self) -> int:
+        return int(self.positions[-1])
+
+    @property
+    def duration(self) -> float:
+        return self.total_samples / self.sample_rate
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __repr__(self) -> str:
+        return f"SegmentPlan(name={self.name!r}, breakpoints={len(self)}, duration={self.duration:.1f}s)"
+
+
+def load_session(path: str) -> dict:
+    """Read a session timeline from a .json or .toml file"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            session = json.load(f)
+    elif extension == ".toml":
+        with open(path, "rb") as f:
+            session = tomllib.load(f)
+    else:
+        raise ValueError(f"Unsupported session file type: {extension} (expected .json or .toml)")
+
+    session.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    logger.info(f"Loaded session '{session['name']}' from {path}")
+    return session
+
+
+def _channel_values(segment: dict, side: str, previous: Optional[np.ndarray]) -> tuple:
+    channel = segment.get(side, {})
+    carrier = channel.get("carrier", segment.get("carrier"))
+    pulse = channel.get("pulse", segment.get("pulse"))
+    if previous is not None:
+        offset = 0 if side == "left" else 2
+        carrier = previous[offset] if carrier is None else carrier
+        pulse = previous[offset + 1] if pulse is None else pulse
+    if carrier is None or pulse is None:
+        raise ValueError(f"Segment is missing {side} carrier/pulse frequency")
+    carrier, pulse = float(carrier), float(pulse)
+    if carrier <= 0 or pulse <= 0:
+        raise ValueError(f"Invalid {side} frequencies: carrier={carrier}Hz, pulse={pulse}Hz")
+    return carrier, pulse
+
+
+def compile_session(session: dict, sample_rate: int = 44100) -> SegmentPlan:
+    """Compile a session timeline into a flat SegmentPlan.
+
+    Session layout (JSON shown; TOML uses the same keys)::
+
+        {
+          "name": "Wind down",
+          "volume": 1.0,          # default gain relative to the master volume
+          "fade_in": 5, "fade_out": 10,
+          "duration": 1800,       # optional; pads the last segment or truncates
+          "segments": [
+            {"duration": 300, "carrier": 200, "pulse": 10},
+            {"duration": 600, "ramp": 60, "left": {"carrier": 200, "pulse": 6},
+             "right": {"carrier": 210, "pulse": 6}, "volume": 0.8}
+          ]
+        }
+
+    ``ramp`` is the time (seconds) at the start of a segment over which all values
+    glide linearly from the previous segment. Values a segment omits carry over.
+    """
+    segments = session.get("segments")
+    if not segments:
+        raise ValueError("Session has no segments")
+
+    default_volume = float(session.get("volume", 1.0))
+    positions = []
+    values = []
+
+    def add_breakpoint(position: int, point: np.ndarray):
+        if positions and positions[-1] >= position:
+            values[-1] = point
+        else:
+            positions.append(position)
+            values.append(point)
+
+    previous = None
+    cursor = 0
+    for index, segment in enumerate(segments):
+        length = int(round(float(segment.get("duration", 0)) * sample_rate))
+        if length <= 0:
+            raise ValueError(f"Segment {index} must have a positive duration")
+        left = _channel_values(segment, "left", previous)
+        right = _channel_values(segment, "right", previous)
+        volume = segment.get("volume", default_volume if previous is None else previous[4])
+        current = np.array([*left, *right, max(0.0, min(1.0, float(volume)))])
+
+        # Ramps glide from the previous segment's last sample; otherwise the change is a step
+        ramp = int(round(float(segment.get("ramp", 0)) * sample_rate)) if previous is not None else 0
+        add_breakpoint(cursor + min(ramp, length - 1), current)
+        cursor += length
+        add_breakpoint(cursor - 1, current)
+        previous = current
+
+    positions = np.array(positions, dtype=np.int64)
+    values = np.array(values, dtype=np.float64)
+
+    total = cursor
+    if "duration" in session:
+        total = int(round(float(session["duration"]) * sample_rate))
+        if total <= 1:
+            raise ValueError("Session duration must be positive")
+
+    # Volume fades become extra breakpoints; long intervals are split for precision
+    fade_in = int(round(float(session.get("fade_in", 0)) * sample_rate))
+    fade_out = int(round(float(session.get("fade_out", 0)) * sample_rate))
+    grid = [positions[positions < total], [total]]
+    if 0 < fade_in < total:
+        grid.append([fade_in])
+    if 0 < fade_out < total:
+        grid.append([total - fade_out])
+    grid.append(np.arange(0, total, MAX_PLAN_INTERVAL_SAMPLES, dtype=np.int64))
+    grid = np.unique(np.concatenate(grid).astype(np.int64))
+
+    # np.interp holds the last value past the end, which pads a longer session duration
+    grid_values = np.column_stack([np.interp(grid, positions, values[:, c]) for c in range(values.shape[1])])
+    gain = np.ones(len(grid))
+    if fade_in > 0:
+        gain = np.minimum(gain, grid / fade_in)
+    if fade_out > 0:
+        gain = np.minimum(gain, (total - grid) / fade_out)
+    grid_values[:, 4] *= np.clip(gain, 0.0, 1.0)
+
+    plan = SegmentPlan(sample_rate, grid, grid_values, name=str(session.get("name", "")))
+    logger.info(f"Compiled session '{plan.name}' - {len(segments)} segments, {len(plan)} breakpoints, {plan.duration:.1f}s")
+    return plan
+
+
+def fixed_plan(
+    left_carrier_freq: float,
+    left_pulse_freq: float,
+    right_carrier_freq: float,
+    right_pulse_freq: float,
+    duration: float,
+    sample_rate: int = 44100,
+) -> SegmentPlan:
+    """One-segment plan holding fixed channel parameters for ``duration`` seconds.
+
+    Identical parameters give identical plans, so timed fixed-parameter playback
+    shares render cache entries with any equivalent session.
+    """
+    segment = {
+        "duration": duration,
+        "left": {"carrier": left_carrier_freq, "pulse": left_pulse_freq},
+        "right": {"carrier": right_carrier_freq, "pulse": right_pulse_freq},
+    }
+    return compile_session({"name": "Fixed parameters", "segments": [segment]}, sample_rate)
+
+
+def render_plan(
+    plan: SegmentPlan,
+    path: Optional[str] = None,
+    volume: float = 1.0,
+    block_size: int = 65536,
+) -> np.ndarray:
+    """Render a whole plan offline.
+
+    With ``path`` the float32 stereo output is written block by block into a ``.npy``
+    file (memory-mapped, so long sessions use constant memory) and the memmap is
+    returned; otherwise the render is returned as an in-memory array.
+    """
+    from .generator import AudioGenerator
+
+    generator = AudioGenerator(plan.sample_rate, volume)
+    total = plan.total_samples
+    if path is not None:
+        output = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(total, 2))
+    else:
+        output = np.empty((total, 2), dtype=np.float32)
+
+    for start in range(0, total, block_size):
+        frames = min(block_size, total - start)
+        output[start:start + frames] = generator.render_plan_frames(plan, start, frames)
+
+    if path is not None:
+        output.flush()
+        logger.info(f"Rendered session '{plan.name}' to {path} ({total} frames)")
+    return output
@@ -0,0 +1,119 @@
+from typing import Optional
+import numpy as np
+from .oversampling import PolyphaseDecimator
+
+
+class SignalTap:
+    """Bounded, decimated copy of the generator output for visualization.
+
+    Single writer (the audio callback), any number of readers. The writer never
+    locks: it band-limits and decimates each block with the same polyphase filter
+    as oversampled rendering (so tones above the reduced Nyquist frequency do not
+    fold into the spectrum), copies the result into a preallocated ring and then
+    publishes the new frame count. Decimated frames lag the output by the filter
+    delay of about 24 decimated frames. Readers copy the newest frames out and
+    retry if the writer lapped them meanwhile, so a slow reader can only ever see
+    stale data, never stall the audio thread.
+
+    ``buffer`` and ``counter`` may be supplied (e.g. views onto shared memory) so
+    the tap can be read from another process.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 8192,
+        decimation: int = 2,
+        channels: int = 2,
+        buffer: Optional[np.ndarray] = None,
+        counter: Optional[np.ndarray] = None,
+    ):
+        if capacity <= 0 or decimation <= 0:
+            raise ValueError("SignalTap capacity and decimation must be positive")
+        self.capacity = capacity
+        self.decimation = decimation
+        self.channels = channels
+        self.buffer = buffer if buffer is not None else np.zeros((capacity, channels), dtype=np.float32)
+        # Total decimated frames ever written; a 1-element array so it can live in shared memory
+        self.counter = counter if counter is not None else np.zeros(1, dtype=np.int64)
+        # Filter input carried between blocks (the kernel history plus any leftover frames), stored
+        # channel-major so each filter window is contiguous, and the decimated output
+        self._decimator = PolyphaseDecimator(decimation) if decimation > 1 else None
+        self._staging = np.zeros((channels, self._decimator.length if self._decimator else 0), dtype=np.float32)
+        self._decimated = np.zeros((0, channels), dtype=np.float32)
+        self._staged = 0
+        self._clear_history()
+
+    @property
+    def frames_written(self) -> int:
+        return int(self.counter[0])
+
+    def _clear_history(self):
+        if self._decimator is not None:
+            self._staged = self._decimator.length - self.decimation
+            self._staging[:, :self._staged] = 0.0
+
+    def _decimate(self, block: np.ndarray) -> np.ndarray:
+        decimator = self._decimator
+        total = self._staged + len(block)
+        if total > self._staging.shape[1]:
+            # Only when the block size grows; the history is carried into the new buffers
+            staging = np.zeros((self.channels, total), dtype=np.float32)
+            staging[:, :self._staged] = self._staging[:, :self._staged]
+            self._staging = staging
+            self._decimated = np.zeros((total // self.decimation + 1, self.channels), dtype=np.float32)
+        self._staging[:, self._staged:total] = block.T
+        if total < decimator.length:
+            self._staged = total
+            return self._decimated[:0]
+        n = (total - decimator.length) // self.decimation + 1
+        decimated = decimator.decimate(self._staging[:, :decimator.input_length(n)].T, out=self._decimated)
+        consumed = n * self.decimation
+        for row in self._staging:
+            # One channel at a time: a 1-D overlapping copy moves in place, a 2-D one through a temporary
+            row[:total - consumed] = row[consumed:total]
+        self._staged = total - consumed
+        return decimated
+
+    def write(self, block: np.ndarray):
+        """Append a block of output frames (audio thread)"""
+        decimated = block if self._decimator is None else self._decimate(block)
+        n = len(decimated)
+        if n == 0:
+            return
+        written = int(self.counter[0])
+        if n > self.capacity:
+            written += n - self.capacity
+            decimated = decimated[n - self.capacity:]
+            n = self.capacity
+
+        pos = written % self.capacity
+        first = min(n, self.capacity - pos)
+        self.buffer[pos:pos + first] = decimated[:first]
+        if first < n:
+            self.buffer[:n - first] = decimated[first:]
+        self.counter[0] = written + n
+
+    def read(self, out: np.ndarray) -> int:
+        """Copy the newest ``len(out)`` frames into ``out`` (oldest first).
+
+        Returns the number of valid frames at the end of ``out``; fewer than
+        ``len(out)`` only while the tap is still filling up.
+        """
+        wanted = min(len(out), self.capacity)
+        for _ in range(3):
+            end = int(self.counter[0])
+            n = min(wanted, end)
+            start = end - n
+            pos = start % self.capacity
+            first = min(n, self.capacity - pos)
+            dest = out[len(out) - n:]
+            dest[:first] = self.buffer[pos:pos + first]
+            dest[first:] = self.buffer[:n - first]
+            # The writer may have overwritten the oldest frames while we copied
+            if int(self.counter[0]) - start <= self.capacity:
+                return n
+        return n
+
+    def reset(self):
+        self.counter[0] = 0
+        self._clear_history()
@@ -0,0 +1,266 @@
+"""Long-run soak harness for the audio engine.
+
+Drives an AudioStreamManager through a virtual-time mock stream for a simulated
+duration (24 hours by default) and checks what only shows up over hours: phase
+drift against the analytic waveform, memory growth and the callback cost
+distribution. At every checkpoint the block just played is also compared sample
+by sample with the analytic isochronic waveform, so a wrong kernel or a phase
+that is read back correctly but rendered wrongly fails too. The run fails when
+any measurement exceeds its threshold.
+
+Run with ``python -m src.iso_pulse_gen.audio.soak [--hours 24] [--speed 0]``.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from fractions import Fraction
+from typing import Optional
+import numpy as np
+from . import stream_manager
+from .mock_backend import VirtualOutputStream
+from .stream_manager import AudioStreamManager
+
+DEFAULT_THRESHOLDS = {
+    "max_phase_error_rad": 1e-6,
+    # Largest difference between a checkpoint block and the analytic waveform (float32 output)
+    "max_sample_error": 1e-5,
+    "max_rss_growth_mib": 32.0,
+    "max_traced_growth_kib": 512.0,
+    # p99 callback cost as a share of the block period
+    "max_callback_p99_share": 0.5,
+}
+WARMUP_BLOCKS = 200
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process (peak RSS where the current value is unavailable)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def phase_error(phase: float, frequency: float, samples: int, sample_rate: int) -> float:
+    """Distance in radians between a stored phase and the exact phase after ``samples`` samples"""
+    cycles = Fraction(frequency) * samples / sample_rate
+    expected = 2 * np.pi * float(cycles - int(cycles))
+    return abs((phase - expected + np.pi) % (2 * np.pi) - np.pi)
+
+
+def _cycle_fractions(frequency: float, start: int, num_frames: int, sample_rate: int) -> np.ndarray:
+    """Exact fractional cycles of ``frequency`` at samples start..start+num_frames, rounded once to float64"""
+    ratio = Fraction(frequency) / sample_rate
+    num, den = ratio.numerator, ratio.denominator
+    return np.array([(num * n % den) / den for n in range(start, start + num_frames)])
+
+
+def reference_block(params: tuple, gain: float, start: int, num_frames: int, sample_rate: int) -> np.ndarray:
+    """Analytic isochronic output (frames, 2) for ``params`` = (left carrier, left pulse, right carrier, right pulse)"""
+    block = np.zeros((num_frames, 2))
+    for channel in range(2):
+        carrier, pulse = params[2 * channel:2 * channel + 2]
+        tone = np.sin(2 * np.pi * _cycle_fractions(carrier, start, num_frames, sample_rate))
+        block[:, channel] = gain * tone * (_cycle_fractions(pulse, start, num_frames, sample_rate) <= 0.5)
+    return block
+
+
+class SoakHarness:
+    """Simulate hours of playback with fixed channel parameters and measure drift, memory and timing"""
+
+    def __init__(
+        self,
+        hours: float = 24.0,
+        sample_rate: int = 44100,
+        block_size: int = 512,
+        params: tuple = (440.0, 10.0, 523.25, 7.83),
+        speed: float = 0.0,
+        checkpoint_minutes: float = 60.0,
+        trace_memory: bool = True,
+        thresholds: Optional[dict] = None,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.hours = hours
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.params = params
+        self.speed = speed  # 0 runs as fast as possible, otherwise a multiple of real time
+        self.trace_memory = trace_memory
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+
+        self.total_blocks = max(1, int(hours * 3600 * sample_rate / block_size))
+        self.checkpoint_blocks = max(1, int(checkpoint_minutes * 60 * sample_rate / block_size))
+        self.manager = AudioStreamManager(sample_rate, block_size, stream_factory=VirtualOutputStream)
+        self.manager.set_channels_linked(False)
+        self.manager.set_left_parameters(*params[:2])
+        self.manager.set_right_parameters(*params[2:])
+
+        self.max_phase_error = 0.0
+        self.max_sample_error = 0.0
+        # Written through once so its pages are resident before the RSS baseline (np.zeros maps them lazily)
+        self._durations = np.empty(self.total_blocks, dtype=np.float32)
+        self._durations.fill(0.0)
+
+    def _phase_errors(self, blocks: int) -> list:
+        generator = self.manager.generator
+        samples = blocks * self.block_size
+        state = (generator.phase_left, generator.pulse_phase_left, generator.phase_right, generator.pulse_phase_right)
+        return [phase_error(phase, freq, samples, self.sample_rate) for phase, freq in zip(state, self.params)]
+
+    def _sample_error(self, block: np.ndarray, blocks: int) -> float:
+        """Largest deviation of the block that ended after ``blocks`` blocks from the analytic waveform"""
+        start = (blocks - 1) * self.block_size
+        reference = reference_block(self.params, self.manager.generator.volume, start, len(block), self.sample_rate)
+        return float(np.abs(block - reference).max())
+
+    def run(self) -> dict:
+        # The per-block level log and silent-gate warnings would dominate a long run
+        engine_logger = logging.getLogger(stream_manager.__name__)
+        engine_level = engine_logger.level
+        engine_logger.setLevel(logging.ERROR)
+        try:
+            return self._run()
+        finally:
+            engine_logger.setLevel(engine_level)
+            self.manager.stop()
+            if self.trace_memory:
+                tracemalloc.stop()
+
+    def _run(self) -> dict:
+        if self.trace_memory:
+            tracemalloc.start()
+        self.manager.start()
+        stream = self.manager.stream
+
+        block_seconds = self.block_size / self.sample_rate
+        warmup = min(WARMUP_BLOCKS, self.total_blocks)
+        for i in range(warmup):
+            started = time.perf_counter()
+            block = stream.advance()
+            self._durations[i] = time.perf_counter() - started
+        # Run the checkpoint code once so its lazy imports (numpy.ma via percentile) are not counted as growth
+        self.max_phase_error = max(self._phase_errors(warmup))
+        self.max_sample_error = self._sample_error(block, warmup)
+        np.percentile(self._durations[:warmup], 99)
+        rss_start = current_rss_bytes()
+        traced_start = tracemalloc.get_traced_memory()[0] if self.trace_memory else None
+        rss_growth = traced_growth = 0.0
+
+        wall_start = time.perf_counter()
+        for i in range(warmup, self.total_blocks):
+            started = time.perf_counter()
+            block = stream.advance()
+            finished = time.perf_counter()
+            self._durations[i] = finished - started
+
+            if self.speed > 0:
+                ahead = (i + 1 - warmup) * block_seconds / self.speed - (finished - wall_start)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+            if (i + 1) % self.checkpoint_blocks == 0 or i + 1 == self.total_blocks:
+                self.max_phase_error = max(self.max_phase_error, *self._phase_errors(i + 1))
+                self.max_sample_error = max(self.max_sample_error, self._sample_error(block, i + 1))
+                if rss_start is not None:
+                    rss_growth = (current_rss_bytes() - rss_start) / 1024**2
+                if traced_start is not None:
+                    traced_growth = (tracemalloc.get_traced_memory()[0] - traced_start) / 1024
+                p99 = np.percentile(self._durations[:i + 1], 99) * 1000.0
+                self.logger.info(
+                    f"{(i + 1) * block_seconds / 3600:6.2f} h simulated - phase error {self.max_phase_error:.2e} rad, "
+                    f"sample error {self.max_sample_error:.2e}, "
+                    f"RSS {rss_growth:+.1f} MiB, traced {traced_growth:+.1f} KiB, callback p99 {p99:.3f} ms"
+                )
+        wall_seconds = time.perf_counter() - wall_start
+
+        durations_ms = self._durations.astype(np.float64) * 1000.0
+        report = {
+            "simulated_hours": self.total_blocks * block_seconds / 3600,
+            "blocks": self.total_blocks,
+            "wall_seconds": wall_seconds,
+            "speedup": (self.total_blocks - warmup) * block_seconds / wall_seconds if wall_seconds > 0 else None,
+            "callback_count": self.manager.get_stats()["callback_count"],
+            "max_phase_error_rad": self.max_phase_error,
+            "max_sample_error": self.max_sample_error,
+            "rss_growth_mib": rss_growth if rss_start is not None else None,
+            "traced_growth_kib": traced_growth if traced_start is not None else None,
+            "callback_p50_ms": float(np.percentile(durations_ms, 50)),
+            "callback_p99_ms": float(np.percentile(durations_ms, 99)),
+            "callback_p999_ms": float(np.percentile(durations_ms, 99.9)),
+            "callback_max_ms": float(durations_ms.max()),
+            "block_ms": block_seconds * 1000.0,
+        }
+        report["failures"] = self._check(report)
+        report["passed"] = not report["failures"]
+        return report
+
+    def _check(self, report: dict) -> list:
+        limits = self.thresholds
+        failures = []
+        if report["max_phase_error_rad"] > limits["max_phase_error_rad"]:
+            failures.append(f"phase error {report['max_phase_error_rad']:.2e} rad > {limits['max_phase_error_rad']:.2e} rad")
+        if report["max_sample_error"] > limits["max_sample_error"]:
+            failures.append(f"checkpoint samples off by {report['max_sample_error']:.2e} > {limits['max_sample_error']:.2e}")
+        if report["rss_growth_mib"] is not None and report["rss_growth_mib"] > limits["max_rss_growth_mib"]:
+            failures.append(f"RSS grew {report['rss_growth_mib']:.1f} MiB > {limits['max_rss_growth_mib']:.1f} MiB")
+        if report["traced_growth_kib"] is not None and report["traced_growth_kib"] > limits["max_traced_growth_kib"]:
+            failures.append(f"traced memory grew {report['traced_growth_kib']:.1f} KiB > {limits['max_traced_growth_kib']:.1f} KiB")
+        p99_share = report["callback_p99_ms"] / report["block_ms"]
+        if p99_share > limits["max_callback_p99_share"]:
+            failures.append(f"callback p99 is {p99_share:.0%} of the block period > {limits['max_callback_p99_share']:.0%}")
+        return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak the audio engine in virtual time")
+    parser.add_argument("--hours", type=float, default=24.0, help="simulated playback time")
+    parser.add_argument("--speed", type=float, default=0.0, help="multiple of real time (0 = as fast as possible)")
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument("--block-size", type=int, default=512)
+    parser.add_argument("--checkpoint-minutes", type=float, default=60.0)
+    parser.add_argument("--no-tracemalloc", action="store_true", help="skip tracemalloc (several times faster)")
+    parser.add_argument("--max-phase-error", type=float, default=DEFAULT_THRESHOLDS["max_phase_error_rad"])
+    parser.add_argument("--max-sample-error", type=float, default=DEFAULT_THRESHOLDS["max_sample_error"])
+    parser.add_argument("--max-rss-growth", type=float, default=DEFAULT_THRESHOLDS["max_rss_growth_mib"], help="MiB")
+    parser.add_argument("--max-traced-growth", type=float, default=DEFAULT_THRESHOLDS["max_traced_growth_kib"], help="KiB")
+    parser.add_argument("--max-callback-p99", type=float, default=DEFAULT_THRESHOLDS["max_callback_p99_share"],
+                        help="share of the block period")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s - %(levelname)s - %(message)s")
+    harness = SoakHarness(
+        hours=args.hours,
+        sample_rate=args.sample_rate,
+        block_size=args.block_size,
+        speed=args.speed,
+        checkpoint_minutes=args.checkpoint_minutes,
+        trace_memory=not args.no_tracemalloc,
+        thresholds={
+            "max_phase_error_rad": args.max_phase_error,
+            "max_sample_error": args.max_sample_error,
+            "max_rss_growth_mib": args.max_rss_growth,
+            "max_traced_growth_kib": args.max_traced_growth,
+            "max_callback_p99_share": args.max_callback_p99,
+        },
+    )
+    report = harness.run()
+    for key, value in report.items():
+        if key != "failures":
+            print(f"{key:<24} {value}")
+    for failure in report["failures"]:
+        print(f"FAIL: {failure}")
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,17 @@
+import functools
+import queue
 import threading
-from typing import Optional
+import time
+from typing import Callable, Optional
 import numpy as np
 import sys
 import logging
+from .fanout import FanoutStream, dac_latency
 from .generator import AudioGenerator
+from .modulation import get_modulator
+from .render_cache import RenderCache
+from .session import SegmentPlan, fixed_plan
+from .signal_tap import SignalTap
 
 # Try to import sounddevice, fall back to mock if not available
 try:
@@ -21,8 +29,33 @@ except (OSError, ImportError):
     )
 
 
+# Number of recent callbacks kept for timing statistics
+CALLBACK_TIMING_WINDOW = 4096
+
+# Degradation ladder for callbacks predicted to miss their deadline, cheapest last
+RENDER_FULL, RENDER_NO_METERING, RENDER_DRAFT, RENDER_REPLAY = range(4)
+RENDER_LEVEL_NAMES = ("full", "no_metering", "draft", "replay")
+# Indices into the per-path cost estimates
+COST_RENDER, COST_METERING, COST_DRAFT = range(3)
+# Share of the time left before a block's deadline the chosen path may be predicted to use
+DEADLINE_HEADROOM = 0.7
+# Weight of the newest measurement in the cost estimates
+COST_SMOOTHING = 0.1
+# Share of a callback's lateness folded into the expected schedule (streams without
+# time_info), so a device clock running slower than perf_counter() is not mistaken for lateness
+SCHEDULE_TRACKING = 0.05
+
+
 class AudioStreamManager:
-    def __init__(self, sample_rate: int = 44100, block_size: int = 512, volume: float = 0.4):
+    def __init__(
+        self,
+        sample_rate: int = 44100,
+        block_size: int = 512,
+        volume: float = 0.4,
+        crossfade_ms: float = 10.0,
+        render_cache: Optional[RenderCache] = None,
+        stream_factory: Optional[Callable] = None,
+    ):
         self.logger = logging.getLogger(__name__)
         
         self.sample_rate = sample_rate
@@ -36,11 +69,90 @@ class AudioStreamManager:
         self.left_pulse_freq = 10.0
         self.right_carrier_freq = 440.0
         self.right_pulse_freq = 10.0
+        self.left_modulation = "isochronic"
+        self.right_modulation = "isochronic"
 
         self.channels_linked = True
         self.backend = AUDIO_BACKEND
+        # Creates output streams; defaults to the backend's OutputStream (e.g. a virtual-time mock for soak runs)
+        self.stream_factory = stream_factory
         self.selected_device = None  # None means use default device
-        
+        self.fanout_devices: Optional[list] = None  # Several devices fed from one render (see set_output_devices)
+        self._callback_count = 0
+
+        # Callback timing: start time and duration of the most recent callbacks
+        self._callback_starts = np.zeros(CALLBACK_TIMING_WINDOW)
+        self._callback_durations = np.zeros(CALLBACK_TIMING_WINDOW)
+
+        # Deadline-aware degradation: predicted cost of each render path (seconds), the cheapest
+        # cost seen per path, and when the next callback is due on the device's schedule
+        self._path_costs = np.zeros(3)
+        self._path_cost_floors = np.full(3, np.inf)
+        self._next_callback_due: Optional[float] = None
+        self._block_deadline = 0.0
+        self._last_block = np.zeros((block_size, 2), dtype=np.float32)
+        self._last_block_frames = 0
+        self.render_level = RENDER_FULL
+        self.degradation_events = 0
+        self.degraded_blocks = [0] * len(RENDER_LEVEL_NAMES)
+        self.deadline_misses = 0
+
+        # Live parameter updates: setters bump a version, the callback snapshots the
+        # newest values once per block (see _apply_pending_parameters)
+        self._active_params = (
+            self.left_carrier_freq,
+            self.left_pulse_freq,
+            self.right_carrier_freq,
+            self.right_pulse_freq,
+        )
+        self._active_modulation = (self.left_modulation, self.right_modulation)
+        self._params_version = 0
+        self._applied_params_version = 0
+        self._params_requested_at: Optional[float] = None
+        self.param_updates_submitted = 0
+        self.param_updates_applied = 0
+        self.last_param_latency_ms: Optional[float] = None
+        self.max_param_latency_ms = 0.0
+        self._param_latency_total_ms = 0.0
+        self._param_latency_count = 0
+
+        # Optional decimated copy of the output for the scope/spectrum view
+        self.signal_tap: Optional[SignalTap] = None
+
+        # Sessions already rendered to disk play from a memmap instead of being regenerated
+        self.render_cache = render_cache
+        self.cache_on_miss = True
+        self._cached_render: Optional[np.ndarray] = None
+        self._cache_render_thread: Optional[threading.Thread] = None
+
+        # Hot device switching: every stream gets an id and the callback dispatches on it.
+        # The incoming stream takes over at its first block; the outgoing stream fades out
+        # from a clone of the generator so both devices play the same continuous waveform.
+        self._next_stream_id = 0
+        self._active_stream_id: Optional[int] = None
+        self._incoming_stream = None
+        self._incoming_stream_id: Optional[int] = None
+        self._outgoing_stream = None
+        self._outgoing_stream_id: Optional[int] = None
+        self._outgoing_generator: Optional[AudioGenerator] = None
+        # Cloned when a switch starts; the take-over only copies the current state into its buffers
+        self._standby_generator: Optional[AudioGenerator] = None
+        self._outgoing_done = threading.Event()
+        # Prepared off the audio thread, so a take-over neither allocates an Event nor starts a thread:
+        # the callback swaps in the next Event and hands the old stream to the retirement worker
+        self._incoming_done = threading.Event()
+        self._retire_queue = queue.SimpleQueue()
+        self._retire_worker: Optional[threading.Thread] = None
+        self._fade_out_pos = 0
+        crossfade_frames = max(1, int(sample_rate * crossfade_ms / 1000.0))
+        ramp = np.linspace(0.0, np.pi / 2, crossfade_frames, dtype=np.float32)
+        self._fade_in_ramp = np.sin(ramp)[:, np.newaxis]
+        self._fade_out_ramp = np.cos(ramp)[:, np.newaxis]
+        self._fade_in_pos = crossfade_frames
+        self._switch_requested_at: Optional[float] = None
+        self.device_switch_count = 0
+        self.last_switch_latency_ms: Optional[float] = None
+
         self.logger.info(f"AudioStreamManager initialized - SR: {sample_rate}Hz, Block: {block_size}, Backend: {AUDIO_BACKEND}")
         self.logger.info(f"Default parameters - Carrier: {self.left_carrier_freq}Hz, Pulse: {self.left_pulse_freq}Hz, Volume: {volume}")
 
@@ -91,13 +203,65 @@ class AudioStreamManager:
             return []
 
     def set_output_device(self, device_index: Optional[int]):
-        """Set the output device by index. None means use default device."""
+        """Set the output device by index. None means use default device.
+
+        While playing, the new stream is opened alongside the old one and takes over at
+        its first block with the generator phase preserved; the old stream crossfades out
+        and is closed in the background.
+        """
         with self._lock:
-            if self.is_playing:
-                self.logger.info("Stopping playback to change audio device")
-                self.stop()
+            previous = (self.selected_device, self.fanout_devices)
             self.selected_device = device_index
-            self.logger.info(f"Audio output device set to: {device_index if device_index is not None else 'Default'}")
+            self.fanout_devices = None
+            playing = self.is_playing
+        self.logger.info(f"Audio output device set to: {device_index if device_index is not None else 'Default'}")
+
+        if playing and previous != (device_index, None):
+            self._switch_stream(previous)
+
+    def set_output_devices(self, devices: Optional[list]):
+        """Play on several devices at once, rendering each block only once.
+
+        The devices share one ring buffer through a FanoutStream, which compensates
+        for drift between their clocks. Fewer than two devices is the same as
+        ``set_output_device``. Switching while playing crossfades like a device switch.
+        """
+        devices = list(devices) if devices else []
+        if len(devices) < 2:
+            self.set_output_device(devices[0] if devices else None)
+            return
+        with self._lock:
+            previous = (self.selected_device, self.fanout_devices)
+            self.fanout_devices = devices
+            playing = self.is_playing
+        self.logger.info(f"Audio output fan-out to devices: {devices}")
+
+        if playing and previous[1] != devices:
+            self._switch_stream(previous)
+
+    def _switch_stream(self, previous: tuple):
+        """Open a stream on the current device selection and hand over to it without stopping"""
+        self._abort_incoming_stream()
+        self._start_retire_worker()
+        stream_id = self._allocate_stream_id()
+        try:
+            self.logger.info("Switching audio device without stopping playback")
+            self._switch_requested_at = time.perf_counter()
+            stream = self._open_stream(self.selected_device, stream_id)
+            with self._lock:
+                self._incoming_stream = stream
+                self._incoming_stream_id = stream_id
+                self._incoming_done = threading.Event()
+                self._standby_generator = self.generator.clone()
+            stream.start()
+        except Exception as e:
+            with self._lock:
+                self._incoming_stream = None
+                self._incoming_stream_id = None
+                self.selected_device, self.fanout_devices = previous
+            error_msg = f"Could not switch audio device: {type(e).__name__}: {e}"
+            self.logger.error(error_msg)
+            raise RuntimeError(error_msg) from e
 
     def get_current_device_info(self):
         """Get information about the currently selected device"""
@@ -113,7 +277,7 @@ class AudioStreamManager:
         except Exception:
             return {"name": "Error Getting Device Info", "index": self.selected_device}
 
-    def set_left_parameters(self, carrier_freq: float, pulse_freq: float):
+    def set_left_parameters(self, carrier_freq: float, pulse_freq: float, requested_at: Optional[float] = None):
         with self._lock:
             self.left_carrier_freq = max(0.0, carrier_freq)
             self.left_pulse_freq = max(0.0, pulse_freq)
@@ -123,8 +287,9 @@ class AudioStreamManager:
                 self.right_carrier_freq = self.left_carrier_freq
                 self.right_pulse_freq = self.left_pulse_freq
                 self.logger.debug("Right channel synced to left channel parameters")
+            self._submit_parameters(requested_at)
 
-    def set_right_parameters(self, carrier_freq: float, pulse_freq: float):
+    def set_right_parameters(self, carrier_freq: float, pulse_freq: float, requested_at: Optional[float] = None):
         with self._lock:
             self.right_carrier_freq = max(0.0, carrier_freq)
             self.right_pulse_freq = max(0.0, pulse_freq)
@@ -134,6 +299,27 @@ class AudioStreamManager:
                 self.left_carrier_freq = self.right_carrier_freq
                 self.left_pulse_freq = self.right_pulse_freq
                 self.logger.debug("Left channel synced to right channel parameters")
+            self._submit_parameters(requested_at)
+
+    def set_left_modulation(self, mode: str):
+        """Select the left channel's modulation mode by name (see modulation.MODULATORS)"""
+        get_modulator(mode)
+        with self._lock:
+            self.left_modulation = mode
+            if self.channels_linked:
+                self.right_modulation = mode
+            self._submit_parameters(None)
+        self.logger.info(f"Left channel modulation set to {mode}")
+
+    def set_right_modulation(self, mode: str):
+        """Select the right channel's modulation mode by name (see modulation.MODULATORS)"""
+        get_modulator(mode)
+        with self._lock:
+            self.right_modulation = mode
+            if self.channels_linked:
+                self.left_modulation = mode
+            self._submit_parameters(None)
+        self.logger.info(f"Right channel modulation set to {mode}")
 
     def set_channels_linked(self, linked: bool):
         with self._lock:
@@ -141,48 +327,497 @@ class AudioStreamManager:
             if linked:
                 self.right_carrier_freq = self.left_carrier_freq
                 self.right_pulse_freq = self.left_pulse_freq
-    
+                self.right_modulation = self.left_modulation
+            self._submit_parameters(None)
+
+    def _submit_parameters(self, requested_at: Optional[float]):
+        """Mark the channel parameters as changed (caller holds the lock).
+
+        The callback only picks up the latest values at the start of a block, so a burst
+        of updates between two blocks coalesces into one. The oldest unapplied request
+        time is kept to measure request-to-audible latency.
+        """
+        requested_at = time.perf_counter() if requested_at is None else requested_at
+        if self._params_requested_at is None or requested_at < self._params_requested_at:
+            self._params_requested_at = requested_at
+        self._params_version += 1
+        self.param_updates_submitted += 1
+
+    def _apply_pending_parameters(self, time_info=None):
+        """Snapshot the latest parameters for the block about to be rendered (caller holds the lock)"""
+        if self._applied_params_version == self._params_version:
+            return
+        self._applied_params_version = self._params_version
+        self._active_params = (
+            self.left_carrier_freq,
+            self.left_pulse_freq,
+            self.right_carrier_freq,
+            self.right_pulse_freq,
+        )
+        self._active_modulation = (self.left_modulation, self.right_modulation)
+        self.param_updates_applied += 1
+        if self._params_requested_at is not None and self.is_playing:
+            latency_ms = (time.perf_counter() - self._params_requested_at + self._output_latency(time_info)) * 1000.0
+            self.last_param_latency_ms = latency_ms
+            self.max_param_latency_ms = max(self.max_param_latency_ms, latency_ms)
+            self._param_latency_total_ms += latency_ms
+            self._param_latency_count += 1
+        self._params_requested_at = None
+
     def set_volume(self, volume: float):
         """Set the master volume (0.0 to 1.0)"""
         with self._lock:
             self.generator.set_volume(volume)
 
-    def _audio_callback(self, outdata: np.ndarray, frames: int, time_info, status):
-        if status:
-            self.logger.warning(f"Audio stream status: {status}")
+    def set_oversampling(self, factor: int):
+        """Render live output at 1, 2 or 4 times the sample rate and decimate (band-limits high carriers).
 
-        # Only log callback details at debug level to avoid spam
-        self.logger.debug(f"Audio callback - frames: {frames}, timestamp: {time_info}")
+        For the cost against the base render, run ``benchmarks/run_benchmarks.py oversampling``.
+        """
+        with self._lock:
+            self.generator.set_oversampling(factor)
+        self.logger.info(f"Oversampling set to {factor}x")
+
+    def _allocate_stream_id(self) -> int:
+        with self._lock:
+            self._next_stream_id += 1
+            return self._next_stream_id
+
+    def _open_stream(self, device: Optional[int], stream_id: int):
+        stream_params = {
+            "samplerate": self.sample_rate,
+            "blocksize": self.block_size,
+            "channels": 2,
+            "callback": functools.partial(self._stream_callback, stream_id),
+            "dtype": "float32",
+        }
+        factory = self.stream_factory or sd.OutputStream
+        if self.fanout_devices:
+            return FanoutStream(**stream_params, devices=self.fanout_devices, stream_factory=factory)
+        if device is not None:
+            stream_params["device"] = device
+        return factory(**stream_params)
+
+    @staticmethod
+    def _output_latency(time_info) -> float:
+        """Seconds until the block being rendered reaches the DAC (0 if unknown)"""
+        return dac_latency(time_info)
+
+    def _stream_callback(self, stream_id: int, outdata: np.ndarray, frames: int, time_info, status):
+        if stream_id == self._active_stream_id:
+            self._audio_callback(outdata, frames, time_info, status)
+        elif stream_id == self._incoming_stream_id:
+            self._take_over(stream_id, time_info)
+            self._audio_callback(outdata, frames, time_info, status)
+        elif stream_id == self._outgoing_stream_id:
+            self._fade_out_callback(outdata, frames)
+        else:
+            outdata.fill(0)
+
+    def _take_over(self, stream_id: int, time_info):
+        """Make the incoming stream active at a block boundary, keeping phase state"""
+        with self._lock:
+            if stream_id != self._incoming_stream_id:
+                return
+            # A previous switch still fading out is cut short
+            self._outgoing_done.set()
+            self._outgoing_done = self._incoming_done
+            self._outgoing_stream = self.stream
+            self._outgoing_stream_id = self._active_stream_id
+            self._outgoing_generator = self._standby_generator
+            self._standby_generator = None
+            self._outgoing_generator.sync_from(self.generator)
+            self._fade_out_pos = 0
+            self._fade_in_pos = 0
+            self.stream = self._incoming_stream
+            self._active_stream_id = stream_id
+            self._incoming_stream = None
+            self._incoming_stream_id = None
+            # A stream without timing is judged against its own schedule, not the old device's
+            self._next_callback_due = None
+            self.device_switch_count += 1
+            outgoing_stream = self._outgoing_stream
+            outgoing_done = self._outgoing_done
+
+        if self._switch_requested_at is not None:
+            latency = time.perf_counter() - self._switch_requested_at + self._output_latency(time_info)
+            self.last_switch_latency_ms = latency * 1000.0
+            self._switch_requested_at = None
 
+        self._retire_queue.put((outgoing_stream, outgoing_done))
+
+    def _fade_out_callback(self, outdata: np.ndarray, frames: int):
         with self._lock:
-            audio_data = self.generator.generate_stereo_frames(
-                frames,
+            generator = self._outgoing_generator
+            remaining = len(self._fade_out_ramp) - self._fade_out_pos
+            if generator is None or remaining <= 0:
+                outdata.fill(0)
+                self._outgoing_done.set()
+                return
+            self._render_into(generator, outdata, frames, record=False)
+            n = min(frames, remaining)
+            outdata[:n] *= self._fade_out_ramp[self._fade_out_pos:self._fade_out_pos + n]
+            outdata[n:] = 0
+            self._fade_out_pos += n
+            if self._fade_out_pos >= len(self._fade_out_ramp):
+                self._outgoing_done.set()
+
+    def _start_retire_worker(self):
+        """Start the thread that closes faded-out streams (never from the audio callback)"""
+        if self._retire_worker is None or not self._retire_worker.is_alive():
+            self._retire_worker = threading.Thread(target=self._retire_loop, daemon=True)
+            self._retire_worker.start()
+
+    def _stop_retire_worker(self):
+        if self._retire_worker is not None:
+            self._retire_queue.put(None)
+            self._retire_worker = None
+
+    def _retire_loop(self):
+        while True:
+            item = self._retire_queue.get()
+            if item is None:
+                return
+            self._retire_stream(*item)
+
+    def _retire_stream(self, stream, done: threading.Event):
+        """Close a stream once its fade-out has played (runs off the audio thread)"""
+        done.wait(timeout=2.0)
+        try:
+            if stream is not None:
+                stream.stop()
+                stream.close()
+        except Exception as e:
+            self.logger.error(f"Error closing previous audio stream: {type(e).__name__}: {e}")
+        with self._lock:
+            if self._outgoing_stream is stream:
+                self._outgoing_stream = None
+                self._outgoing_stream_id = None
+                self._outgoing_generator = None
+        if self.last_switch_latency_ms is not None:
+            self.logger.info(f"Audio device switch complete - first block on new device after {self.last_switch_latency_ms:.1f} ms")
+
+    def _abort_incoming_stream(self):
+        """Drop a pending switch whose stream has not produced a block yet"""
+        with self._lock:
+            stream = self._incoming_stream
+            self._incoming_stream = None
+            self._incoming_stream_id = None
+            self._standby_generator = None
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception as e:
+                self.logger.error(f"Error closing pending audio stream: {type(e).__name__}: {e}")
+
+    def get_stats(self) -> dict:
+        """Snapshot of playback and device switching statistics"""
+        return {
+            "backend": self.backend,
+            "is_playing": self.is_playing,
+            "device": self.selected_device,
+            "output_devices": self.stream.get_device_stats() if isinstance(self.stream, FanoutStream) else None,
+            "callback_count": self._callback_count,
+            "device_switches": self.device_switch_count,
+            "last_switch_latency_ms": self.last_switch_latency_ms,
+            "session": self.generator.plan.name if self.generator.plan is not None else None,
+            "session_position": self.generator.plan_position,
+            "position_seconds": self.get_position(),
+            "session_cached": self._cached_render is not None,
+            "render_cache": self.render_cache.get_stats() if self.render_cache is not None else None,
+            "param_updates_submitted": self.param_updates_submitted,
+            "param_updates_applied": self.param_updates_applied,
+            "param_updates_coalesced": self.param_updates_submitted - self.param_updates_applied,
+            "modulation": self._active_modulation,
+            "oversampling": self.generator.oversampling,
+            "render_level": RENDER_LEVEL_NAMES[self.render_level],
+            "degradation_events": self.degradation_events,
+            "degraded_blocks": dict(zip(RENDER_LEVEL_NAMES[1:], self.degraded_blocks[1:])),
+            "deadline_misses": self.deadline_misses,
+            "last_param_latency_ms": self.last_param_latency_ms,
+            "max_param_latency_ms": self.max_param_latency_ms,
+            "mean_param_latency_ms": (
+                self._param_latency_total_ms / self._param_latency_count if self._param_latency_count else None
+            ),
+            **self.get_callback_timing(),
+        }
+
+    def get_callback_timing(self) -> dict:
+        """Duration and start-time jitter of the most recent callbacks, in milliseconds.
+
+        Jitter is the deviation of the interval between consecutive callbacks from the
+        nominal block period; a callback delayed by another thread holding the GIL
+        shows up here even when its own render cost is small.
+        """
+        count = min(self._callback_count, CALLBACK_TIMING_WINDOW)
+        if count == 0:
+            return {"callback_mean_ms": None, "callback_p99_ms": None, "callback_max_ms": None,
+                    "callback_jitter_p99_ms": None, "callback_jitter_max_ms": None}
+        # Oldest first, so consecutive entries are consecutive callbacks
+        order = (np.arange(count) + self._callback_count - count) % CALLBACK_TIMING_WINDOW
+        durations = self._callback_durations[order] * 1000.0
+        jitter = np.abs(np.diff(self._callback_starts[order]) - self.block_size / self.sample_rate) * 1000.0
+        if len(jitter) == 0:
+            jitter = np.zeros(1)
+        return {
+            "callback_mean_ms": float(durations.mean()),
+            "callback_p99_ms": float(np.percentile(durations, 99)),
+            "callback_max_ms": float(durations.max()),
+            "callback_jitter_p99_ms": float(np.percentile(jitter, 99)),
+            "callback_jitter_max_ms": float(jitter.max()),
+        }
+
+    def _render_block(self, generator: AudioGenerator, frames: int, draft: bool = False) -> np.ndarray:
+        """Render the next block from either the loaded session plan or the live parameters"""
+        if generator.plan is not None:
+            return generator.generate_plan_frames(frames)
+        generator.set_modulation(*self._active_modulation)
+        return generator.generate_stereo_frames(frames, *self._active_params, draft=draft)
+
+    def _render_into(self, generator: AudioGenerator, outdata: np.ndarray, frames: int, draft: bool = False, record: bool = True):
+        """Fill ``outdata`` with the next block, straight from the cached render when there is one.
+
+        ``record`` is False for the outgoing stream's fade-out, which repeats audio the
+        active stream already accounts for.
+        """
+        cached = self._cached_render
+        if cached is not None and generator.plan is not None:
+            start = generator.plan_position
+            n = max(0, min(frames, len(cached) - start))
+            np.multiply(cached[start:start + n], generator.volume, out=outdata[:n])
+            outdata[n:] = 0
+            generator.plan_position += frames
+            if record:
+                self.render_cache.record_served(n * outdata.itemsize * outdata.shape[1])
+        else:
+            outdata[:] = self._render_block(generator, frames, draft)
+
+    def _replay_into(self, outdata: np.ndarray, frames: int):
+        """Repeat the last rendered block and move the playback position on without rendering"""
+        n = min(frames, self._last_block_frames)
+        outdata[:n] = self._last_block[:n]
+        outdata[n:] = 0
+        self.generator.advance(frames)
+
+    def _choose_render_level(self, started: float, frames: int, time_info=None) -> int:
+        """Pick the best render path predicted to finish well before this block's deadline.
+
+        The deadline is when the block reaches the DAC, from the stream's ``time_info``
+        (``outputBufferDacTime - currentTime``): a callback that starts late (after a GC
+        pause, or while another thread holds the GIL) has less of it left, while bursty
+        hosts that run two blocks back to back simply report more. The budget is capped
+        at one block period, so a render never outlasts the audio it produces. Streams
+        without timing (mock and virtual streams) fall back to tracking the expected
+        callback schedule against perf_counter().
+        """
+        period = frames / self.sample_rate
+        latency = self._output_latency(time_info)
+        if latency > 0:
+            self._next_callback_due = None
+            self._block_deadline = started + latency
+            budget = min(latency, period)
+        else:
+            due = self._next_callback_due
+            lateness = 0.0 if due is None else started - due
+            if due is None or lateness < 0:
+                due, lateness = started, 0.0  # Early: follow the device clock
+            self._next_callback_due = due + period + SCHEDULE_TRACKING * lateness
+            self._block_deadline = due + period
+            budget = period - lateness
+
+        allowed = budget * DEADLINE_HEADROOM
+        render, metering, draft = self._path_costs
+        if render + metering <= allowed:
+            return RENDER_FULL
+        if render <= allowed:
+            return RENDER_NO_METERING
+        if draft <= allowed or self._last_block_frames == 0:
+            return RENDER_DRAFT
+        return RENDER_REPLAY
+
+    def _update_path_costs(self, measured: dict):
+        """Fold measured path costs into the estimates; unmeasured paths relax toward their best case.
+
+        Measurements are clipped to twice the estimate, so one pause does not lock the
+        callback into a degraded path, and the relaxation retries a skipped path once
+        the pressure is gone.
+        """
+        for index in range(len(self._path_costs)):
+            estimate = self._path_costs[index]
+            floor = self._path_cost_floors[index]
+            seconds = measured.get(index)
+            if seconds is not None:
+                if floor == np.inf:
+                    estimate = seconds
+                else:
+                    estimate += COST_SMOOTHING * (min(seconds, 2 * estimate) - estimate)
+                self._path_cost_floors[index] = min(floor, seconds)
+            elif floor != np.inf:
+                estimate += COST_SMOOTHING * (floor - estimate)
+            self._path_costs[index] = estimate
+
+    def _note_render_level(self, level: int):
+        previous = self.render_level
+        self.render_level = level
+        if level != RENDER_FULL:
+            self.degraded_blocks[level] += 1
+        if level != RENDER_FULL and previous == RENDER_FULL:
+            self.degradation_events += 1
+            self.logger.warning(f"Audio callback running late - degraded to {RENDER_LEVEL_NAMES[level]} rendering")
+        elif level == RENDER_FULL and previous != RENDER_FULL:
+            self.logger.info("Audio callback back to full rendering")
+        if previous == RENDER_REPLAY and level != RENDER_REPLAY:
+            self._fade_in_pos = 0  # Fade back into the live waveform after replayed blocks
+
+    def enable_signal_tap(self, capacity: int = 8192, decimation: int = 2) -> SignalTap:
+        """Start copying a decimated view of the output into a SignalTap for visualization"""
+        if self.signal_tap is None:
+            self.signal_tap = SignalTap(capacity, decimation)
+        return self.signal_tap
+
+    def disable_signal_tap(self):
+        self.signal_tap = None
+
+    def set_render_cache(self, cache: Optional[RenderCache]):
+        with self._lock:
+            self.render_cache = cache
+            self._cached_render = None
+        self._attach_cached_render()
+
+    def _attach_cached_render(self):
+        """Look up the loaded session in the render cache; render it in the background on a miss"""
+        plan = self.generator.plan
+        if plan is None or self.render_cache is None or self._cached_render is not None:
+            return
+        cached = self.render_cache.get(RenderCache.plan_key(plan))
+        if cached is None:
+            if self.cache_on_miss:
+                self._cache_render_thread = self.render_cache.store_plan_async(plan)
+            return
+        with self._lock:
+            if self.generator.plan is plan:
+                self._cached_render = cached
+        self.logger.info(f"Playing session '{plan.name}' from the render cache")
+
+    def load_session(self, plan):
+        """Play a compiled SegmentPlan instead of the fixed channel parameters"""
+        with self._lock:
+            self.generator.load_plan(plan)
+            self._cached_render = None
+        self.logger.info(f"Session loaded: {plan.name or 'unnamed'} ({plan.duration:.1f}s)")
+        self._attach_cached_render()
+
+    def play_fixed(self, duration: float) -> SegmentPlan:
+        """Play the current channel parameters for ``duration`` seconds as a one-segment session.
+
+        Unlike open-ended playback this render is finite, so it is served from (and
+        on a miss stored into) the render cache like any other session.
+        """
+        with self._lock:
+            plan = fixed_plan(
                 self.left_carrier_freq,
                 self.left_pulse_freq,
                 self.right_carrier_freq,
                 self.right_pulse_freq,
+                duration,
+                self.sample_rate,
             )
+        self.load_session(plan)
+        return plan
 
-        # Calculate RMS levels to detect if signal contains audio
-        rms_left = np.sqrt(np.mean(audio_data[:, 0] ** 2))
-        rms_right = np.sqrt(np.mean(audio_data[:, 1] ** 2))
-        rms_total = np.sqrt(np.mean(audio_data ** 2))
-        
-        # Log audio levels (but not too frequently)
-        if hasattr(self, '_callback_count'):
-            self._callback_count += 1
-        else:
-            self._callback_count = 0
-            
-        # Log audio levels every 100 callbacks (roughly every 2-3 seconds at typical rates)
-        if self._callback_count % 100 == 0:
-            self.logger.info(f"Audio levels - Left RMS: {rms_left:.6f}, Right RMS: {rms_right:.6f}, Total RMS: {rms_total:.6f}")
-        
-        # Check for silent output and warn immediately
-        if rms_total < 1e-10:
-            self.logger.warning("Audio output is essentially silent! Check audio generation parameters.")
+    def clear_session(self):
+        """Go back to the fixed channel parameters"""
+        with self._lock:
+            self.generator.load_plan(None)
+            self._cached_render = None
+        self.logger.info("Session cleared - using channel parameters")
+
+    def seek(self, seconds: float):
+        """Jump to a position in seconds (into the session, or along the live waveform)"""
+        with self._lock:
+            self.generator.seek(round(max(0.0, seconds) * self.sample_rate))
+            if self.is_playing:
+                self._fade_in_pos = 0  # Short fade so the jump does not click
+        self.logger.info(f"Seek to {seconds:.2f}s")
+
+    def get_position(self) -> float:
+        """Playback position in seconds"""
+        generator = self.generator
+        position = generator.plan_position if generator.plan is not None else generator.sample_position
+        return position / self.sample_rate
+
+    @property
+    def session_plan(self):
+        return self.generator.plan
+
+    @property
+    def session_finished(self) -> bool:
+        plan = self.generator.plan
+        return plan is not None and self.generator.plan_position >= plan.total_samples
+
+    def _audio_callback(self, outdata: np.ndarray, frames: int, time_info, status):
+        started = time.perf_counter()
+        if status:
+            self.logger.warning(f"Audio stream status: {status}")
 
-        outdata[:] = audio_data
+        # Only log callback details at debug level to avoid spam
+        self.logger.debug(f"Audio callback - frames: {frames}, timestamp: {time_info}")
+
+        level = self._choose_render_level(started, frames, time_info)
+        with self._lock:
+            self._apply_pending_parameters(time_info)
+            if level == RENDER_REPLAY:
+                self._replay_into(outdata, frames)
+            else:
+                self._render_into(self.generator, outdata, frames, draft=level == RENDER_DRAFT)
+        rendered = time.perf_counter()
+        self._callback_count += 1
+
+        measured = {}
+        if level != RENDER_REPLAY:
+            measured[COST_DRAFT if level == RENDER_DRAFT else COST_RENDER] = rendered - started
+            if frames > len(self._last_block):
+                self._last_block = np.zeros((frames, 2), dtype=np.float32)
+            self._last_block[:frames] = outdata
+            self._last_block_frames = frames
+
+        if level == RENDER_FULL:
+            audio_data = outdata
+
+            # Calculate RMS levels to detect if signal contains audio
+            rms_left = np.sqrt(np.mean(audio_data[:, 0] ** 2))
+            rms_right = np.sqrt(np.mean(audio_data[:, 1] ** 2))
+            rms_total = np.sqrt(np.mean(audio_data ** 2))
+
+            # Log audio levels every 100 callbacks (roughly every 2-3 seconds at typical rates)
+            if self._callback_count % 100 == 0:
+                self.logger.info(f"Audio levels - Left RMS: {rms_left:.6f}, Right RMS: {rms_right:.6f}, Total RMS: {rms_total:.6f}")
+
+            # Check for silent output and warn immediately
+            if rms_total < 1e-10 and not self.session_finished:
+                self.logger.warning("Audio output is essentially silent! Check audio generation parameters.")
+            measured[COST_METERING] = time.perf_counter() - rendered
+        self._update_path_costs(measured)
+        self._note_render_level(level)
+
+        # Fade in after a device switch
+        if self._fade_in_pos < len(self._fade_in_ramp):
+            n = min(frames, len(self._fade_in_ramp) - self._fade_in_pos)
+            outdata[:n] *= self._fade_in_ramp[self._fade_in_pos:self._fade_in_pos + n]
+            self._fade_in_pos += n
+
+        # Lock-free hand-off to visualization; readers never block this thread
+        tap = self.signal_tap
+        if tap is not None:
+            tap.write(outdata)
+
+        finished = time.perf_counter()
+        if finished > self._block_deadline:
+            self.deadline_misses += 1
+        slot = (self._callback_count - 1) % CALLBACK_TIMING_WINDOW
+        self._callback_starts[slot] = started
+        self._callback_durations[slot] = finished - started
 
     def start(self):
         if self.is_playing:
@@ -191,21 +826,23 @@ class AudioStreamManager:
 
         try:
             self.logger.info("Starting audio stream...")
-            self.generator.reset_phases()
+            # Resume where playback was paused (the generator seeks in O(1)); a finished session starts over
+            if self.session_finished:
+                self.generator.seek(0)
+            resuming = self.get_position() > 0
             self._callback_count = 0  # Reset callback counter
+            self._next_callback_due = None
+            # Fade in when resuming mid-waveform; a fresh start begins at zero phase anyway
+            self._fade_in_pos = 0 if resuming else len(self._fade_in_ramp)
+            self._attach_cached_render()
+            with self._lock:
+                self._apply_pending_parameters()
             
-            # Build stream parameters
-            stream_params = {
-                "samplerate": self.sample_rate,
-                "blocksize": self.block_size,
-                "channels": 2,
-                "callback": self._audio_callback,
-                "dtype": "float32",
-            }
-
-            # Add device parameter if a specific device is selected
-            if self.selected_device is not None:
-                stream_params["device"] = self.selected_device
+            stream_id = self._allocate_stream_id()
+
+            if self.fanout_devices:
+                self.logger.info(f"Using audio devices: {self.fanout_devices} (fan-out)")
+            elif self.selected_device is not None:
                 self.logger.info(f"Using audio device index: {self.selected_device}")
             else:
                 self.logger.info("Using default audio device")
@@ -213,7 +850,8 @@ class AudioStreamManager:
             self.logger.info(f"Stream parameters: SR={self.sample_rate}Hz, Block={self.block_size}, Channels=2, Device={self.selected_device}")
             self.logger.info(f"Audio parameters: L[{self.left_carrier_freq}Hz carrier, {self.left_pulse_freq}Hz pulse] R[{self.right_carrier_freq}Hz carrier, {self.right_pulse_freq}Hz pulse]")
             
-            self.stream = sd.OutputStream(**stream_params)
+            self.stream = self._open_stream(self.selected_device, stream_id)
+            self._active_stream_id = stream_id
             self.stream.start()
             self.is_playing = True
             self.logger.info("Audio stream started successfully")
@@ -257,15 +895,26 @@ class AudioStreamManager:
 
         self.logger.info("Stopping audio stream...")
         self.is_playing = False
-        if self.stream:
+        self._abort_incoming_stream()
+        with self._lock:
+            outgoing = self._outgoing_stream
+            self._outgoing_stream = None
+            self._outgoing_stream_id = None
+            self._outgoing_generator = None
+            self._outgoing_done.set()
+            self._active_stream_id = None
+        for stream in (outgoing, self.stream):
+            if stream is None:
+                continue
             try:
-                self.stream.stop()
-                self.stream.close()
-                self.stream = None
-                self.logger.info("Audio stream stopped successfully")
+                stream.stop()
+                stream.close()
+                if stream is self.stream:
+                    self.logger.info("Audio stream stopped successfully")
             except Exception as e:
                 self.logger.error(f"Error stopping audio stream: {type(e).__name__}: {e}")
-                self.stream = None  # Ensure stream is cleared even if stop/close fails
+        self.stream = None  # Ensure stream is cleared even if stop/close fails
+        self._stop_retire_worker()
 
     def toggle_playback(self) -> bool:
         if self.is_playing:
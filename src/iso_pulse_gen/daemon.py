@@ -0,0 +1,294 @@
+"""Headless engine daemon controlled over a local Unix domain socket.
+
+Protocol: one JSON object per line in each direction.
+
+    request       {"id": 7, "op": "set_left_parameters", "args": [440, 10], "t": 1234.5}
+    response      {"id": 7, "ok": true, "result": null}
+    error         {"id": 7, "ok": false, "error": "..."}
+    notification  {"op": "set_volume", "args": [0.3]}          (no id: no response)
+
+Requests on one connection are executed in order and may be pipelined: a client
+can write any number of them before reading the responses, which carry the
+request id. ``t`` is an optional ``time.perf_counter()`` stamp taken by the
+client when it sent the command (the clock is system-wide, and client and daemon
+share a host); it becomes the ``requested_at`` of parameter updates, so the
+manager's param latency statistics cover the whole command-to-audible path.
+
+Run with ``python -m src.iso_pulse_gen.daemon [--socket PATH]``.
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import signal
+import sys
+import tempfile
+import time
+from typing import Optional
+from .audio.modulation import MODULATORS
+from .audio.oversampling import OVERSAMPLING_FACTORS
+from .audio.stream_manager import AudioStreamManager
+
+# Operations that may block on the audio backend run in a worker thread
+BLOCKING_OPS = {"start", "stop", "toggle_playback", "set_output_device", "set_output_devices"}
+# Operations that accept the command timestamp as ``requested_at``
+TIMED_OPS = {"set_left_parameters", "set_right_parameters"}
+
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    name = "iso-pulse-gen.sock" if "XDG_RUNTIME_DIR" in os.environ else f"iso-pulse-gen-{user}.sock"
+    return os.path.join(runtime_dir, name)
+
+
+def _json_default(value):
+    """numpy scalars in stats"""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":"), default=_json_default).encode() + b"\n"
+
+
+class EngineDaemon:
+    """Serves an AudioStreamManager's operations on a Unix domain socket"""
+
+    def __init__(self, manager: AudioStreamManager, path: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.manager = manager
+        self.path = path or default_socket_path()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.ops = {
+            "ping": lambda: "pong",
+            "start": manager.start,
+            "stop": manager.stop,
+            "toggle_playback": manager.toggle_playback,
+            "set_left_parameters": manager.set_left_parameters,
+            "set_right_parameters": manager.set_right_parameters,
+            "set_channels_linked": manager.set_channels_linked,
+            "set_left_modulation": manager.set_left_modulation,
+            "set_right_modulation": manager.set_right_modulation,
+            "modulations": lambda: list(MODULATORS),
+            "set_volume": manager.set_volume,
+            "set_oversampling": manager.set_oversampling,
+            "set_output_device": manager.set_output_device,
+            "set_output_devices": manager.set_output_devices,
+            "seek": manager.seek,
+            "position": manager.get_position,
+            "devices": manager.get_available_devices,
+            "stats": self.get_stats,
+        }
+
+        self.connections = 0
+        self.commands = 0
+        self.notifications = 0
+        self.errors = 0
+        self._transit_total_ms = 0.0
+        self._transit_count = 0
+        self.max_transit_ms = 0.0
+
+    async def start(self):
+        if sys.platform == "win32":
+            raise RuntimeError("The engine daemon needs Unix domain sockets, which are not available on Windows")
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Stale socket from a previous run
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=self.path)
+        os.chmod(self.path, 0o600)
+        self.logger.info(f"Engine daemon listening on {self.path}")
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await asyncio.get_running_loop().run_in_executor(None, self.manager.stop)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        stats = self.get_stats()
+        if stats["mean_param_latency_ms"] is not None:
+            self.logger.info(
+                f"Daemon parameter updates: {stats['param_updates_applied']} applied, "
+                f"{stats['param_updates_coalesced']} coalesced, "
+                f"command-to-audible latency mean {stats['mean_param_latency_ms']:.1f} ms, "
+                f"max {stats['max_param_latency_ms']:.1f} ms"
+            )
+        self.logger.info("Engine daemon stopped")
+
+    def get_stats(self) -> dict:
+        """Manager statistics plus command counts and socket transit time"""
+        return {
+            **self.manager.get_stats(),
+            "daemon_connections": self.connections,
+            "daemon_commands": self.commands,
+            "daemon_notifications": self.notifications,
+            "daemon_errors": self.errors,
+            "mean_transit_ms": self._transit_total_ms / self._transit_count if self._transit_count else None,
+            "max_transit_ms": self.max_transit_ms,
+        }
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self.logger.info(f"Controller connected ({self.connections} total)")
+        try:
+            while line := await reader.readline():
+                response = await self._execute(line, time.perf_counter())
+                if response is not None:
+                    writer.write(_encode(response))
+                    await writer.drain()  # Returns at once unless the client stopped reading
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+            self.logger.info("Controller disconnected")
+
+    async def _execute(self, line: bytes, received_at: float) -> Optional[dict]:
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            op = request["op"]
+            args = list(request.get("args", ()))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self.errors += 1
+            return {"id": request_id, "ok": False, "error": f"Malformed request: {e}"}
+
+        if request_id is None:
+            self.notifications += 1
+        else:
+            self.commands += 1
+
+        requested_at = received_at
+        sent_at = request.get("t")
+        if isinstance(sent_at, (int, float)) and sent_at <= received_at:
+            requested_at = sent_at
+            transit_ms = (received_at - sent_at) * 1000.0
+            self._transit_total_ms += transit_ms
+            self._transit_count += 1
+            self.max_transit_ms = max(self.max_transit_ms, transit_ms)
+
+        try:
+            handler = self.ops[op]
+        except KeyError:
+            self.errors += 1
+            error = f"Unknown operation: {op}"
+            self.logger.warning(error)
+            return {"id": request_id, "ok": False, "error": error} if request_id is not None else None
+
+        try:
+            if op in TIMED_OPS:
+                args = args[:2] + [requested_at]
+            if op in BLOCKING_OPS:
+                result = await asyncio.get_running_loop().run_in_executor(None, functools.partial(handler, *args))
+            else:
+                result = handler(*args)
+        except Exception as e:
+            self.errors += 1
+            self.logger.error(f"Daemon command {op} failed: {type(e).__name__}: {e}")
+            return {"id": request_id, "ok": False, "error": str(e)} if request_id is not None else None
+        return {"id": request_id, "ok": True, "result": result} if request_id is not None else None
+
+
+class DaemonClient:
+    """asyncio client for EngineDaemon with pipelined requests"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_socket_path()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending = {}
+        self._next_id = 0
+        self._receive_task: Optional[asyncio.Task] = None
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._receive_task = asyncio.create_task(self._receive())
+        return self
+
+    async def _receive(self):
+        try:
+            while line := await self._reader.readline():
+                response = json.loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if response["ok"]:
+                    future.set_result(response.get("result"))
+                else:
+                    future.set_exception(RuntimeError(response["error"]))
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("Connection to engine daemon closed"))
+            self._pending.clear()
+
+    def send(self, op: str, *args) -> asyncio.Future:
+        """Queue a request without waiting; the returned future resolves with the result"""
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = future
+        self._writer.write(_encode({"id": self._next_id, "op": op, "args": args, "t": time.perf_counter()}))
+        return future
+
+    def notify(self, op: str, *args):
+        """Fire-and-forget command; failures only show up in the daemon's error count and log"""
+        self._writer.write(_encode({"op": op, "args": args, "t": time.perf_counter()}))
+
+    async def call(self, op: str, *args):
+        future = self.send(op, *args)
+        await self._writer.drain()
+        return await future
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+        if self._receive_task is not None:
+            await self._receive_task
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless isochronic pulse engine controlled over a Unix socket")
+    parser.add_argument("--socket", default=default_socket_path(), help="control socket path")
+    parser.add_argument("--device", type=int, action="append", default=None,
+                        help="output device index (repeat to play on several devices from one render)")
+    parser.add_argument("--block-size", type=int, default=512)
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument("--oversampling", type=int, choices=OVERSAMPLING_FACTORS, default=1,
+                        help="render at this multiple of the sample rate and decimate (cleaner high carriers)")
+    parser.add_argument("--autostart", action="store_true", help="start playback immediately")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s - %(levelname)s - %(message)s")
+    manager = AudioStreamManager(args.sample_rate, args.block_size)
+    manager.set_output_devices(args.device)
+    manager.set_oversampling(args.oversampling)
+
+    async def run():
+        daemon = EngineDaemon(manager, args.socket)
+        await daemon.start()
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stopped.set)
+        if args.autostart:
+            await loop.run_in_executor(None, manager.start)
+        serve = asyncio.create_task(daemon.serve_forever())
+        await stopped.wait()
+        serve.cancel()
+        await daemon.close()
+
+    asyncio.run(run())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
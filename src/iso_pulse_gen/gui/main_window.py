@@ -13,14 +13,29 @@ from PySide6.QtWidgets import (
     QComboBox,
     QTextEdit,
     QSplitter,
+    QFileDialog,
+    QTabWidget,
+    QSlider,
 )
 from PySide6.QtGui import QDoubleValidator, QFont
-from PySide6.QtCore import Qt, QObject, Signal
+from PySide6.QtCore import Qt, QObject, Signal, QTimer, QSignalBlocker
 from ..audio.stream_manager import AudioStreamManager
+from ..audio.engine_process import EngineProcess
+from ..audio.modulation import MODULATORS
+from ..audio.oversampling import OVERSAMPLING_FACTORS
+from ..audio.session import load_session, compile_session
+from ..audio.render_cache import RenderCache
+from .visualization import VisualizationPanel
 import logging
 import sys
+import time
 from datetime import datetime
 
+# Keystroke bursts in the frequency fields are pushed to the running stream at most this often
+PARAM_DEBOUNCE_MS = 30
+# How often the session position slider follows playback
+POSITION_REFRESH_MS = 250
+
 
 class LogHandler(logging.Handler, QObject):
     """Custom logging handler that emits signals for GUI updates"""
@@ -38,7 +53,7 @@ class LogHandler(logging.Handler, QObject):
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, isolated_engine: bool = False):
         super().__init__()
         self.setWindowTitle("Isochronic Pulse Generator")
         self.setMinimumSize(800, 600)
@@ -47,7 +62,8 @@ class MainWindow(QMainWindow):
         # Set up logging first
         self._setup_logging()
 
-        self.audio_manager = AudioStreamManager()
+        # The isolated engine runs the audio callback in its own process, away from the Qt event loop
+        self.audio_manager = EngineProcess() if isolated_engine else AudioStreamManager()
 
         # Show audio backend in title if using mock
         if self.audio_manager.backend == "mock":
@@ -55,8 +71,22 @@ class MainWindow(QMainWindow):
 
         self.logger = logging.getLogger(__name__)
         self.logger.info("Application started")
+
+        try:
+            self.audio_manager.set_render_cache(RenderCache())
+        except OSError as e:
+            self.logger.warning(f"Render cache disabled: {e}")
         self.logger.info(f"Audio backend: {self.audio_manager.backend}")
 
+        # Debounced live parameter updates while playing
+        self._param_update_timer = QTimer(self)
+        self._param_update_timer.setSingleShot(True)
+        self._param_update_timer.setInterval(PARAM_DEBOUNCE_MS)
+        self._param_edit_started_at = None
+
+        self._position_timer = QTimer(self)
+        self._position_timer.setInterval(POSITION_REFRESH_MS)
+
         self._init_ui()
         self._connect_signals()
         self._update_ui_state()
@@ -116,14 +146,43 @@ class MainWindow(QMainWindow):
         self.play_button = QPushButton("Play")
         self.play_button.setMinimumHeight(40)
         play_layout.addWidget(self.play_button)
+
+        self.load_session_button = QPushButton("Load Session...")
+        self.load_session_button.setMinimumHeight(40)
+        play_layout.addWidget(self.load_session_button)
+
+        self.clear_session_button = QPushButton("Clear Session")
+        self.clear_session_button.setMinimumHeight(40)
+        play_layout.addWidget(self.clear_session_button)
+
+        self.session_label = QLabel("No session loaded")
+        play_layout.addWidget(self.session_label)
         play_layout.addStretch()
 
         controls_layout.addLayout(play_layout)
+
+        # Session scrubbing: the generator seeks in O(1), so dragging anywhere is instant
+        position_layout = QHBoxLayout()
+        position_layout.addWidget(QLabel("Position:"))
+        self.position_slider = QSlider(Qt.Horizontal)
+        position_layout.addWidget(self.position_slider)
+        self.position_label = QLabel("0:00 / 0:00")
+        position_layout.addWidget(self.position_label)
+        controls_layout.addLayout(position_layout)
         controls_layout.addStretch()
 
         splitter.addWidget(controls_widget)
 
-        # Bottom section - Logging display
+        # Bottom section - tabs for the live signal monitor and the log
+        bottom_tabs = QTabWidget()
+
+        # Live waveform/spectrum from the decimated output tap
+        self.visualization_panel = VisualizationPanel(
+            self.audio_manager.enable_signal_tap(), self.audio_manager.sample_rate
+        )
+        bottom_tabs.addTab(self.visualization_panel, "Signal Monitor")
+
+        # Logging display
         log_group = QGroupBox("System Log")
         log_layout = QVBoxLayout(log_group)
         
@@ -151,9 +210,10 @@ class MainWindow(QMainWindow):
         log_controls.addStretch()
         log_layout.addLayout(log_controls)
         
-        splitter.addWidget(log_group)
+        bottom_tabs.addTab(log_group, "System Log")
+        splitter.addWidget(bottom_tabs)
         
-        # Set splitter proportions (2/3 controls, 1/3 log)
+        # Set splitter proportions (2/3 controls, 1/3 monitor/log)
         splitter.setStretchFactor(0, 2)
         splitter.setStretchFactor(1, 1)
 
@@ -171,14 +231,22 @@ class MainWindow(QMainWindow):
         pulse_input.setValidator(QDoubleValidator(0.1, 100.0, 2))
         layout.addWidget(pulse_input, 1, 1)
 
+        layout.addWidget(QLabel("Modulation:"), 2, 0)
+        mode_combo = QComboBox()
+        for name, modulator in MODULATORS.items():
+            mode_combo.addItem(modulator.label, name)
+        layout.addWidget(mode_combo, 2, 1)
+
         group.setLayout(layout)
 
         if is_left:
             self.left_carrier_input = carrier_input
             self.left_pulse_input = pulse_input
+            self.left_mode_combo = mode_combo
         else:
             self.right_carrier_input = carrier_input
             self.right_pulse_input = pulse_input
+            self.right_mode_combo = mode_combo
 
         return group
 
@@ -197,6 +265,13 @@ class MainWindow(QMainWindow):
         refresh_button.clicked.connect(self._refresh_devices)
         layout.addWidget(refresh_button)
 
+        # Oversampling band-limits high carriers at extra CPU cost
+        layout.addWidget(QLabel("Quality:"))
+        self.quality_combo = QComboBox()
+        for factor in OVERSAMPLING_FACTORS:
+            self.quality_combo.addItem("Standard" if factor == 1 else f"{factor}x oversampled", factor)
+        layout.addWidget(self.quality_combo)
+
         layout.addStretch()
         group.setLayout(layout)
 
@@ -208,12 +283,21 @@ class MainWindow(QMainWindow):
     def _connect_signals(self):
         self.play_button.clicked.connect(self._on_play_clicked)
         self.link_channels_checkbox.toggled.connect(self._on_link_channels_toggled)
+        self.load_session_button.clicked.connect(self._on_load_session_clicked)
+        self.clear_session_button.clicked.connect(self._on_clear_session_clicked)
         self.device_combo.currentIndexChanged.connect(self._on_device_changed)
+        self.quality_combo.currentIndexChanged.connect(self._on_quality_changed)
+        self._param_update_timer.timeout.connect(self._push_live_parameters)
+        self._position_timer.timeout.connect(self._refresh_position)
+        self.position_slider.valueChanged.connect(self._update_position_label)
+        self.position_slider.sliderReleased.connect(self._on_position_released)
 
         self.left_carrier_input.textChanged.connect(self._on_left_params_changed)
         self.left_pulse_input.textChanged.connect(self._on_left_params_changed)
         self.right_carrier_input.textChanged.connect(self._on_right_params_changed)
         self.right_pulse_input.textChanged.connect(self._on_right_params_changed)
+        self.left_mode_combo.currentIndexChanged.connect(self._on_left_mode_changed)
+        self.right_mode_combo.currentIndexChanged.connect(self._on_right_mode_changed)
         
         # Connect log handler to display
         self.log_handler.log_signal.connect(self._append_log)
@@ -245,7 +329,13 @@ class MainWindow(QMainWindow):
             is_playing = self.audio_manager.toggle_playback()
             action = "Started" if is_playing else "Stopped"
             self.logger.info(f"Audio playback {action}")
+            if not is_playing:
+                self._log_live_update_stats()
             self.play_button.setText("Pause" if is_playing else "Play")
+            if is_playing:
+                self._position_timer.start()
+            else:
+                self._position_timer.stop()
             
         except Exception as e:
             self.logger.error(f"Failed to toggle audio playback: {str(e)}")
@@ -265,34 +355,131 @@ class MainWindow(QMainWindow):
     def _on_left_params_changed(self):
         if self.link_channels_checkbox.isChecked():
             self._sync_right_to_left()
+        self._schedule_live_update()
 
     def _on_right_params_changed(self):
         if self.link_channels_checkbox.isChecked():
             self._sync_left_to_right()
+        self._schedule_live_update()
+
+    def _on_left_mode_changed(self):
+        mode = self.left_mode_combo.currentData()
+        self.audio_manager.set_left_modulation(mode)
+        if self.link_channels_checkbox.isChecked():
+            self._sync_right_to_left()
+
+    def _on_right_mode_changed(self):
+        self.audio_manager.set_right_modulation(self.right_mode_combo.currentData())
+
+    def _on_quality_changed(self):
+        self.audio_manager.set_oversampling(self.quality_combo.currentData())
 
     def _sync_right_to_left(self):
-        self.right_carrier_input.setText(self.left_carrier_input.text())
-        self.right_pulse_input.setText(self.left_pulse_input.text())
+        # Block the mirrored fields' signals so the linked handlers don't ping-pong
+        with QSignalBlocker(self.right_carrier_input), QSignalBlocker(self.right_pulse_input), \
+                QSignalBlocker(self.right_mode_combo):
+            self.right_carrier_input.setText(self.left_carrier_input.text())
+            self.right_pulse_input.setText(self.left_pulse_input.text())
+            self.right_mode_combo.setCurrentIndex(self.left_mode_combo.currentIndex())
 
     def _sync_left_to_right(self):
-        self.left_carrier_input.setText(self.right_carrier_input.text())
-        self.left_pulse_input.setText(self.right_pulse_input.text())
+        with QSignalBlocker(self.left_carrier_input), QSignalBlocker(self.left_pulse_input):
+            self.left_carrier_input.setText(self.right_carrier_input.text())
+            self.left_pulse_input.setText(self.right_pulse_input.text())
+
+    def _schedule_live_update(self):
+        """Restart the debounce timer; the first keystroke of a burst starts the latency clock"""
+        if not self.audio_manager.is_playing:
+            return
+        if self._param_edit_started_at is None:
+            self._param_edit_started_at = time.perf_counter()
+        self._param_update_timer.start()
+
+    def _push_live_parameters(self):
+        inputs = [self.left_carrier_input, self.left_pulse_input]
+        if not self.link_channels_checkbox.isChecked():
+            inputs += [self.right_carrier_input, self.right_pulse_input]
+        # Skip half-typed values; the next keystroke schedules another update
+        if all(field.hasAcceptableInput() for field in inputs):
+            self._update_audio_parameters(requested_at=self._param_edit_started_at)
+        self._param_edit_started_at = None
+
+    def _on_load_session_clicked(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Load Session", "", "Session files (*.json *.toml)"
+        )
+        if not path:
+            return
+        try:
+            session = load_session(path)
+            plan = compile_session(session, self.audio_manager.sample_rate)
+            self.audio_manager.load_session(plan)
+            minutes, seconds = divmod(int(plan.duration), 60)
+            self.session_label.setText(f"Session: {plan.name} ({minutes}:{seconds:02d})")
+            self.position_slider.setRange(0, int(plan.duration))
+            self._refresh_position()
+        except Exception as e:
+            self.logger.error(f"Could not load session: {str(e)}")
+            QMessageBox.critical(self, "Session Error", f"Could not load session: {str(e)}")
+        self._update_ui_state()
+
+    def _on_clear_session_clicked(self):
+        self.audio_manager.clear_session()
+        self.session_label.setText("No session loaded")
+        self.position_slider.setRange(0, 0)
+        self._update_ui_state()
+
+    def _on_position_released(self):
+        self.audio_manager.seek(float(self.position_slider.value()))
+
+    def _refresh_position(self):
+        """Follow playback with the slider unless the user is dragging it"""
+        if self.position_slider.isSliderDown() or self.audio_manager.session_plan is None:
+            return
+        with QSignalBlocker(self.position_slider):
+            self.position_slider.setValue(int(self.audio_manager.get_position()))
+        self._update_position_label()
+
+    def _update_position_label(self):
+        position = divmod(self.position_slider.value(), 60)
+        duration = divmod(self.position_slider.maximum(), 60)
+        self.position_label.setText(f"{position[0]}:{position[1]:02d} / {duration[0]}:{duration[1]:02d}")
 
     def _update_ui_state(self):
         linked = self.link_channels_checkbox.isChecked()
-        self.right_carrier_input.setEnabled(not linked)
-        self.right_pulse_input.setEnabled(not linked)
-
-    def _update_audio_parameters(self):
+        session_loaded = self.audio_manager.session_plan is not None
+        self.left_carrier_input.setEnabled(not session_loaded)
+        self.left_pulse_input.setEnabled(not session_loaded)
+        self.link_channels_checkbox.setEnabled(not session_loaded)
+        self.right_carrier_input.setEnabled(not linked and not session_loaded)
+        self.right_pulse_input.setEnabled(not linked and not session_loaded)
+        # Sessions are always isochronic
+        self.left_mode_combo.setEnabled(not session_loaded)
+        self.right_mode_combo.setEnabled(not linked and not session_loaded)
+        self.clear_session_button.setEnabled(session_loaded)
+        self.position_slider.setEnabled(session_loaded)
+
+    def _log_live_update_stats(self):
+        stats = self.audio_manager.get_stats()
+        if stats["mean_param_latency_ms"] is None:
+            return
+        self.logger.info(
+            f"Live parameter updates: {stats['param_updates_applied']} applied, "
+            f"{stats['param_updates_coalesced']} coalesced, "
+            f"input-to-audible latency mean {stats['mean_param_latency_ms']:.1f} ms, "
+            f"max {stats['max_param_latency_ms']:.1f} ms"
+        )
+
+    def _update_audio_parameters(self, requested_at=None):
         try:
             left_carrier = float(self.left_carrier_input.text() or "440")
             left_pulse = float(self.left_pulse_input.text() or "10")
-            self.audio_manager.set_left_parameters(left_carrier, left_pulse)
+            self.audio_manager.set_left_parameters(left_carrier, left_pulse, requested_at)
 
             if not self.link_channels_checkbox.isChecked():
                 right_carrier = float(self.right_carrier_input.text() or "440")
                 right_pulse = float(self.right_pulse_input.text() or "10")
-                self.audio_manager.set_right_parameters(right_carrier, right_pulse)
+                self.audio_manager.set_right_parameters(right_carrier, right_pulse, requested_at)
         except ValueError:
             pass
 
@@ -341,5 +528,10 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         self.logger.info("Application closing")
+        stats = self.visualization_panel.get_stats()
+        if stats["frames_drawn"]:
+            self.logger.info(f"Signal monitor: {stats['frames_drawn']} frames, {stats['mean_frame_ms']:.2f} ms mean, {stats['max_frame_ms']:.2f} ms max")
         self.audio_manager.stop()
+        if isinstance(self.audio_manager, EngineProcess):
+            self.audio_manager.close()
         event.accept()
@@ -0,0 +1,154 @@
+import time
+import numpy as np
+from PySide6.QtWidgets import QWidget, QGroupBox, QVBoxLayout, QHBoxLayout, QLabel, QCheckBox
+from PySide6.QtGui import QPainter, QPen, QColor, QPolygonF
+from PySide6.QtCore import QPointF, QTimer
+from ..audio.signal_tap import SignalTap
+
+CHANNEL_COLORS = (QColor(80, 170, 255), QColor(255, 140, 60))
+
+
+def _polyline(values: np.ndarray, width: int, height: int, low: float, high: float) -> QPolygonF:
+    """Map a 1-D series onto widget coordinates (at most one point per pixel column)"""
+    if len(values) > width > 0:
+        values = values[np.linspace(0, len(values) - 1, width).astype(np.intp)]
+    xs = np.linspace(0, width - 1, len(values)) if len(values) > 1 else np.zeros(1)
+    ys = (high - np.clip(values, low, high)) / (high - low) * (height - 1)
+    return QPolygonF([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())])
+
+
+class _PlotView(QWidget):
+    """Minimal line plot for one trace per channel"""
+
+    def __init__(self, low: float, high: float, parent=None):
+        super().__init__(parent)
+        self.low = low
+        self.high = high
+        self.traces: list = []
+        self.setMinimumHeight(80)
+
+    def set_traces(self, traces: list):
+        self.traces = traces
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(20, 20, 24))
+        painter.setPen(QPen(QColor(60, 60, 70), 1))
+        mid = self.height() // 2
+        painter.drawLine(0, mid, self.width(), mid)
+        for trace, color in zip(self.traces, CHANNEL_COLORS):
+            painter.setPen(QPen(color, 1))
+            painter.drawPolyline(_polyline(trace, self.width(), self.height(), self.low, self.high))
+        painter.end()
+
+
+class VisualizationPanel(QGroupBox):
+    """Live waveform, spectrum and level meters read from a SignalTap.
+
+    The panel only ever reads the tap (lock-free, never touching the stream
+    manager's lock) on a timer capped at ``max_fps``, so drawing cost is bounded
+    and decoupled from the audio callback. Frame and paint cost are tracked in
+    get_stats().
+    """
+
+    def __init__(self, tap: SignalTap, sample_rate: int, max_fps: int = 30, fft_size: int = 2048, parent=None):
+        super().__init__("Signal Monitor", parent)
+        self.tap = tap
+        self.sample_rate = sample_rate
+        self.max_fps = max_fps
+        self.fft_size = min(fft_size, tap.capacity)
+        self.scope_frames = min(1024, tap.capacity)
+
+        # Preallocated work buffers for the GUI thread
+        self._snapshot = np.zeros((self.fft_size, tap.channels), dtype=np.float32)
+        self._window = np.hanning(self.fft_size).astype(np.float32)
+        self._window_gain = float(self._window.sum()) / 2
+
+        self.frames_drawn = 0
+        self._frame_time_total = 0.0
+        self._frame_time_max = 0.0
+        self._last_written = -1
+
+        self.setMaximumHeight(220)
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        self.enabled_checkbox = QCheckBox("Enabled")
+        self.enabled_checkbox.setChecked(True)
+        controls.addWidget(self.enabled_checkbox)
+        self.level_labels = [QLabel("L: -inf dBFS"), QLabel("R: -inf dBFS")]
+        for label in self.level_labels:
+            controls.addWidget(label)
+        controls.addStretch()
+        self.fps_label = QLabel("")
+        controls.addWidget(self.fps_label)
+        layout.addLayout(controls)
+
+        views = QHBoxLayout()
+        self.scope_view = _PlotView(-1.0, 1.0)
+        self.spectrum_view = _PlotView(-120.0, 0.0)
+        views.addWidget(self.scope_view)
+        views.addWidget(self.spectrum_view)
+        layout.addLayout(views)
+
+        nyquist = sample_rate / tap.decimation / 2
+        self.setToolTip(f"Waveform (left) and spectrum 0-{nyquist:.0f} Hz (right), decimated x{tap.decimation}")
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, int(1000 / max_fps)))
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+
+    def refresh(self):
+        if not self.enabled_checkbox.isChecked() or not self.isVisible():
+            return
+        written = self.tap.frames_written
+        if written == self._last_written:
+            return  # Stream idle: nothing new to draw
+        self._last_written = written
+
+        started = time.perf_counter()
+        valid = self.tap.read(self._snapshot)
+        if valid == 0:
+            return
+        data = self._snapshot[-valid:]
+        scope = data[-self.scope_frames:]
+
+        # While the tap is still filling, window only the valid frames (zero-padded to fft_size)
+        window, window_gain = self._window, self._window_gain
+        if valid < self.fft_size:
+            window = np.hanning(valid).astype(np.float32)
+            window_gain = max(float(window.sum()) / 2, 1e-6)
+        spectra = []
+        for channel in range(data.shape[1]):
+            magnitude = np.abs(np.fft.rfft(data[:, channel] * window, self.fft_size)) / window_gain
+            spectra.append(20 * np.log10(np.maximum(magnitude, 1e-6)))
+
+        rms = np.sqrt(np.mean(np.square(scope, dtype=np.float64), axis=0))
+        for label, name, level in zip(self.level_labels, "LR", rms):
+            db = 20 * np.log10(level) if level > 0 else float("-inf")
+            label.setText(f"{name}: {db:6.1f} dBFS")
+
+        self.scope_view.set_traces([scope[:, c] for c in range(scope.shape[1])])
+        self.spectrum_view.set_traces(spectra)
+        self.scope_view.repaint()
+        self.spectrum_view.repaint()
+
+        elapsed = time.perf_counter() - started
+        self.frames_drawn += 1
+        self._frame_time_total += elapsed
+        self._frame_time_max = max(self._frame_time_max, elapsed)
+        if self.frames_drawn % self.max_fps == 0:
+            self.fps_label.setText(f"{self.mean_frame_ms():.1f} ms/frame")
+
+    def mean_frame_ms(self) -> float:
+        return self._frame_time_total / self.frames_drawn * 1000.0 if self.frames_drawn else 0.0
+
+    def get_stats(self) -> dict:
+        """GUI-thread cost of the visualization (analysis plus painting)"""
+        return {
+            "frames_drawn": self.frames_drawn,
+            "mean_frame_ms": self.mean_frame_ms(),
+            "max_frame_ms": self._frame_time_max * 1000.0,
+            "max_fps": self.max_fps,
+            "cpu_share": self.mean_frame_ms() * self.max_fps / 1000.0,
+        }
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from src.iso_pulse_gen.audio import stream_manager
+
+
+class ManualStream:
+    """OutputStream stand-in whose callbacks are driven by the test"""
+
+    instances = []
+
+    def __init__(self, samplerate, blocksize, channels, callback, dtype, device=None, **kwargs):
+        self.blocksize = blocksize
+        self.channels = channels
+        self.callback = callback
+        self.device = device
+        self.active = False
+        self.closed = False
+        ManualStream.instances.append(self)
+
+    def start(self):
+        self.active = True
+
+    def stop(self):
+        self.active = False
+
+    def close(self):
+        self.closed = True
+
+    def pull(self, frames=None):
+        frames = frames or self.blocksize
+        outdata = np.zeros((frames, self.channels), dtype=np.float32)
+        self.callback(outdata, frames, None, None)
+        return outdata
+
+
+@pytest.fixture
+def manual_streams(monkeypatch):
+    ManualStream.instances = []
+    monkeypatch.setattr(stream_manager.sd, "OutputStream", ManualStream)
+    return ManualStream.instances
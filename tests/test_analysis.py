@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+from src.iso_pulse_gen.audio.analysis import SignalAnalyzer, analyze_array, analyze_file, analyze_plan
+from src.iso_pulse_gen.audio.generator import AudioGenerator
+from src.iso_pulse_gen.audio.session import compile_session, render_plan
+
+
+def make_plan(left=(440.0, 10.0), right=(523.25, 10.0), duration=5.0, sample_rate=44100):
+    return compile_session(
+        {"segments": [{
+            "duration": duration,
+            "left": {"carrier": left[0], "pulse": left[1]},
+            "right": {"carrier": right[0], "pulse": right[1]},
+        }]},
+        sample_rate,
+    )
+
+
+class TestSignalAnalyzer:
+    def test_measures_pulse_duty_and_carrier(self):
+        analyzer = analyze_plan(make_plan(), chunk_frames=8192)
+        left, right = analyzer.report()["channels"]
+
+        assert left["pulse_freq"] == pytest.approx(10.0, rel=1e-3)
+        assert left["duty_cycle"] == pytest.approx(0.5, abs=1e-3)
+        assert left["carrier_freq"] == pytest.approx(440.0, rel=1e-4)
+        assert right["carrier_freq"] == pytest.approx(523.25, rel=1e-4)
+        assert analyzer.problems((440.0, 523.25), (10.0, 10.0)) == []
+
+    @pytest.mark.parametrize("carrier, pulse", [(200.0, 10.0), (1000.0, 40.0), (200.0, 40.0), (15000.0, 10.0)])
+    def test_crossings_on_exact_zeros_are_counted(self, carrier, pulse):
+        # These carriers put a positive-going crossing exactly on a 0.0 sample (every cycle for 200 Hz and 1 kHz)
+        generator = AudioGenerator(48000, volume=1.0)
+        data = np.concatenate([generator.generate_stereo_frames(480, carrier, pulse, carrier, pulse) for _ in range(100)])
+        assert np.count_nonzero(data[:, 0] == 0) > 2 * int(pulse)
+        # 241-frame chunks end on an exact zero crossing of the 200 Hz carrier
+        whole, pieces = analyze_array(data, 48000, chunk_frames=len(data)), analyze_array(data, 48000, chunk_frames=241)
+
+        assert whole.report() == pieces.report()
+        assert whole.report()["channels"][0]["carrier_freq"] == pytest.approx(carrier, rel=1e-3)
+        assert whole.problems((carrier, carrier), (pulse, pulse)) == []
+
+    def test_results_independent_of_chunking(self):
+        data = render_plan(make_plan(duration=2.0))
+        whole = analyze_array(data, 44100, chunk_frames=len(data), keep_block_hashes=True)
+        pieces = analyze_array(data, 44100, chunk_frames=1000, keep_block_hashes=True)
+
+        assert whole.report() == pieces.report()
+        assert whole.block_hashes == pieces.block_hashes
+
+    def test_detects_nan_inf_and_clipping(self):
+        data = render_plan(make_plan(duration=0.5))
+        data[100, 0] = np.nan
+        data[200, 1] = np.inf
+        data[300:310, 0] = 1.5
+        analyzer = analyze_array(data, 44100, chunk_frames=4096)
+        left, right = analyzer.report()["channels"]
+
+        assert (left["nan_count"], right["inf_count"], left["clip_count"]) == (1, 1, 10)
+        assert len(analyzer.problems()) == 3
+
+    def test_onset_skew_in_samples(self):
+        data = render_plan(make_plan(left=(440.0, 10.0), right=(440.0, 10.0), duration=1.0))
+        data[:, 1] = np.roll(data[:, 1], 3)
+        analyzer = analyze_array(data, 44100, chunk_frames=3000)
+        report = analyzer.report()
+
+        assert report["onset_skew_mean"] == pytest.approx(-3.0)
+        assert report["onset_skew_max"] == 3
+        assert any("skewed" in problem for problem in analyzer.problems())
+
+    def test_onsets_pair_with_nearest_partner(self):
+        data = render_plan(make_plan(left=(440.0, 10.0), right=(440.0, 10.0), duration=1.0))
+        data[:, 1] = np.roll(data[:, 1], 3)
+        data[22050:26460, 1] = 0.0  # one right pulse missing
+        analyzer = analyze_array(data, 44100, chunk_frames=3000)
+        report = analyzer.report()
+
+        assert report["onset_skew_max"] == 3
+        assert report["unmatched_onsets"] == 1
+        assert any("without a partner" in problem for problem in analyzer.problems(expected_pulse=(10.0, 10.0), max_skew=3))
+
+    def test_skew_is_not_checked_for_different_pulse_rates(self):
+        analyzer = analyze_plan(make_plan(left=(440.0, 10.0), right=(440.0, 7.0), duration=30.0), chunk_frames=8192)
+        report = analyzer.report()
+
+        # Only coinciding onsets are paired, and the pending queues stay bounded by the window
+        assert report["onset_skew_max"] <= analyzer.skew_window
+        assert max(len(pending) for pending in analyzer._pending_onsets) <= 1
+        assert analyzer.problems(expected_pulse=(10.0, 7.0)) == []
+        assert analyzer.problems() == []
+
+    def test_block_hashes_are_opt_in(self):
+        analyzer = analyze_plan(make_plan(duration=1.0))
+        assert analyzer.block_hashes == [] and analyzer.report()["block_hashes"] == 0
+
+    def test_wrong_frequency_is_reported(self):
+        analyzer = analyze_plan(make_plan(duration=1.0))
+
+        problems = analyzer.problems(expected_carrier=(450.0, 523.25), expected_pulse=(10.0, 12.0))
+        assert len(problems) == 2
+
+    def test_fingerprint_detects_changes(self):
+        data = render_plan(make_plan(duration=1.0))
+        reference = analyze_array(data, 44100, keep_block_hashes=True)
+        data[20000, 0] += 0.01
+        changed = analyze_array(data, 44100, keep_block_hashes=True)
+
+        assert reference.fingerprint() != changed.fingerprint()
+        differing = [i for i, (a, b) in enumerate(zip(reference.block_hashes, changed.block_hashes)) if a != b]
+        assert differing == [20000 // reference.hash_block_size]
+
+    def test_analyze_file_via_memmap(self, tmp_path):
+        plan = make_plan(duration=1.0)
+        path = tmp_path / "render.npy"
+        render_plan(plan, path=str(path))
+
+        analyzer = analyze_file(str(path), 44100, chunk_frames=10000)
+        assert analyzer.fingerprint() == analyze_plan(plan).fingerprint()
+
+    def test_rejects_wrong_shape(self):
+        with pytest.raises(ValueError):
+            SignalAnalyzer().feed(np.zeros(10))
@@ -1,5 +1,7 @@
 import numpy as np
+import pytest
 from src.iso_pulse_gen.audio.generator import AudioGenerator
+from src.iso_pulse_gen.audio.modulation import get_modulator
 
 
 class TestAudioGenerator:
@@ -61,6 +63,55 @@ class TestAudioGenerator:
         assert generator.phase_right != 0.0
         assert not np.array_equal(frames1[0], frames2[0])
 
+    def test_output_independent_of_block_size(self):
+        params = (440.0, 10.0, 523.25, 7.5)
+        whole = AudioGenerator(sample_rate=44100).generate_stereo_frames(1000, *params)
+        generator = AudioGenerator(sample_rate=44100)
+        blocked = np.concatenate([generator.generate_stereo_frames(n, *params) for n in (512, 300, 188)])
+
+        np.testing.assert_allclose(blocked, whole, atol=1e-6)
+
+    def test_render_range_is_bit_stable_across_splits(self):
+        generator = AudioGenerator(sample_rate=44100)
+        generator.set_frequencies(440.0, 10.0, 523.25, 7.83)
+        whole = generator.render_range(0, 5000)
+        pieces = np.concatenate([generator.render_range(start, n) for start, n in ((0, 1), (1, 2047), (2048, 2952))])
+
+        np.testing.assert_array_equal(pieces, whole)
+
+    def test_seek_matches_contiguous_render(self):
+        params = (440.0, 10.0, 523.25, 7.83)
+        contiguous = AudioGenerator(sample_rate=44100)
+        contiguous.generate_stereo_frames(44100 * 3, *params)
+        expected = contiguous.generate_stereo_frames(512, *params)
+
+        generator = AudioGenerator(sample_rate=44100)
+        generator.set_frequencies(*params)
+        generator.seek(44100 * 3)
+        np.testing.assert_array_equal(generator.generate_stereo_frames(512, *params), expected)
+        assert generator.phase_left == pytest.approx(contiguous.phase_left, abs=1e-12)
+
+    def test_phase_is_exact_after_many_hours(self):
+        generator = AudioGenerator(sample_rate=44100, volume=1.0)
+        generator.set_frequencies(440.0, 0.5, 523.25, 0.5)
+        start = 30 * 3600 * 44100
+        frames = generator.render_range(start, 256)
+
+        n = np.arange(start, start + 256)
+        expected = np.sin(2 * np.pi * ((n * 440) % 44100) / 44100)
+        np.testing.assert_allclose(frames[:, 0], expected, atol=1e-6)
+
+    def test_frequency_change_is_continuous(self):
+        generator = AudioGenerator(sample_rate=44100, volume=1.0)
+        first = generator.generate_stereo_frames(1000, 440.0, 0.5, 440.0, 0.5)
+        second = generator.generate_stereo_frames(1000, 445.0, 0.5, 440.0, 0.5)
+
+        step_limit = 2 * np.pi * 445.0 / 44100
+        assert abs(second[0, 0] - first[-1, 0]) < step_limit
+        # The unchanged channel keeps its anchor and stays bit-identical to an uninterrupted render
+        reference = AudioGenerator(sample_rate=44100, volume=1.0).generate_stereo_frames(2000, 440.0, 0.5, 440.0, 0.5)
+        np.testing.assert_array_equal(np.concatenate([first, second])[:, 1], reference[:, 1])
+
     def test_square_wave_modulation(self):
         generator = AudioGenerator(sample_rate=1000)
 
@@ -79,6 +130,23 @@ class TestAudioGenerator:
             zero_crossings = np.where(np.diff(np.sign(left_channel)))[0]
             assert len(zero_crossings) > 0
 
+    @pytest.mark.parametrize("oversampling", [1, 2])
+    def test_sync_from_continues_in_place(self, oversampling):
+        generator = AudioGenerator(sample_rate=44100)
+        generator.set_oversampling(oversampling)
+        standby = generator.clone()
+        buffers = (standby._anchor_cycles, standby._step_table, standby._scratch, standby.modulators)
+        generator.set_modulation("binaural", "isochronic")
+        generator.generate_stereo_frames(700, 523.25, 7.0, 330.0, 12.0)
+
+        standby.sync_from(generator)
+        synced = (standby._anchor_cycles, standby._step_table, standby._scratch, standby.modulators)
+        assert all(after is before for after, before in zip(synced, buffers))
+        np.testing.assert_array_equal(
+            standby.generate_stereo_frames(512, 523.25, 7.0, 330.0, 12.0),
+            generator.generate_stereo_frames(512, 523.25, 7.0, 330.0, 12.0),
+        )
+
     def test_reset_phases(self):
         generator = AudioGenerator(sample_rate=44100)
 
@@ -115,3 +183,102 @@ class TestAudioGenerator:
         right_channel = frames[:, 1]
 
         assert not np.array_equal(left_channel, right_channel)
+
+
+def gated_reference(generator, start, num_frames):
+    """Dense isochronic render straight from the exact phase of every sample"""
+    cycles = generator._cycles(np.arange(start, start + num_frames))
+    channels = [np.sin(cycles[2 * ch] * 2 * np.pi) * (cycles[2 * ch + 1] <= 0.5) * generator.volume for ch in range(2)]
+    return np.stack(channels, axis=1).astype(np.float32)
+
+
+def count_phases(monkeypatch, generator):
+    """Record how many oscillator phases (rows x samples) each _cycles_range() call computes"""
+    computed = []
+    original = generator._cycles_range
+
+    def counting(start, num_frames, rows=None):
+        cycles = original(start, num_frames, rows)
+        computed.append(cycles.size)
+        return cycles
+
+    monkeypatch.setattr(generator, "_cycles_range", counting)
+    return computed
+
+
+class TestSparseRendering:
+    @pytest.mark.parametrize("pulse", [0.5, 10.0, 40.0, 100.0])
+    def test_gated_render_matches_dense(self, pulse):
+        generator = AudioGenerator(sample_rate=44100)
+        generator.set_frequencies(440.0, pulse, 523.25, pulse * 0.77)
+        for start, n in ((0, 512), (2100, 512), (2205, 17), (9999, 4096), (123457, 1)):
+            np.testing.assert_array_equal(generator.render_range(start, n), gated_reference(generator, start, n))
+
+    def test_open_span_covers_every_open_sample(self):
+        gate = get_modulator("isochronic")
+        rng = np.random.default_rng(3)
+        edge_phases = [0.0, 0.5, 0.5 + 1e-12, 1.0 - 1e-12]
+        for i in range(2000):
+            phase = edge_phases[i % 4] if i < 100 else rng.random()
+            increment = rng.choice([0.0, 1e-7, 10 / 44100, 100 / 44100, 0.01, 0.3]) * rng.random()
+            n = int(rng.integers(1, 5000))
+            lo, hi = gate.open_span(phase, increment, n)
+            open_samples = np.flatnonzero((phase + np.arange(n) * increment) % 1.0 <= 0.5)
+            if len(open_samples):
+                assert lo <= open_samples[0] and open_samples[-1] < hi
+
+    def test_closed_gate_skips_the_oscillators(self, monkeypatch):
+        generator = AudioGenerator(sample_rate=44100)
+        generator.set_frequencies(440.0, 10.0, 440.0, 10.0)
+        computed = count_phases(monkeypatch, generator)
+        # A 10 Hz gate is closed for samples 2206-4409 of every 4410
+        assert not generator.render_range(2300, 1024).any()
+        assert computed == []
+
+    def test_linked_channels_cost_a_quarter_of_dense(self, monkeypatch):
+        generator = AudioGenerator(sample_rate=44100)
+        generator.set_frequencies(440.0, 10.0, 440.0, 10.0)
+        computed = count_phases(monkeypatch, generator)
+        frames = np.concatenate([generator.render_range(start, 512) for start in range(0, 44100, 512)])
+
+        np.testing.assert_array_equal(frames[:, 0], frames[:, 1])
+        # Dense rendering computes all four oscillators for every sample
+        assert sum(computed) < 0.3 * 4 * len(frames)
+
+    def test_channels_are_shared_only_when_identical(self):
+        generator = AudioGenerator(sample_rate=44100)
+        generator.generate_stereo_frames(1000, 440.0, 10.0, 440.0, 10.0)
+        assert generator._shared_channels
+        generator.set_modulation("binaural", "binaural")
+        assert not generator._shared_channels
+
+        # Back in one mode with identical settings, the right oscillators rejoin the left ones
+        generator.generate_stereo_frames(1000, 440.0, 10.0, 440.0, 10.0)
+        generator.set_modulation("isochronic", "isochronic")
+        assert generator._shared_channels
+        frames = generator.generate_stereo_frames(2205, 440.0, 10.0, 440.0, 10.0)
+        assert frames.any()
+        np.testing.assert_array_equal(frames[:, 0], frames[:, 1])
+
+        # Different settings in one mode keep their own phases
+        generator.set_modulation("binaural", "binaural")
+        generator.generate_stereo_frames(1000, 440.0, 10.0, 440.0, 10.0)
+        generator.set_frequencies(440.0, 10.0, 440.0, 12.0)
+        generator.set_modulation("isochronic", "isochronic")
+        assert not generator._shared_channels
+
+        generator.set_frequencies(440.0, 10.0, 440.0, 10.0)
+        generator.reset_phases()
+        assert generator._shared_channels
+        frames = generator.generate_stereo_frames(512, 440.0, 10.0, 0.0, 10.0)
+        assert frames[:, 0].any() and not frames[:, 1].any()
+
+    def test_silence_skips_rendering(self, monkeypatch):
+        generator = AudioGenerator(sample_rate=44100, volume=0.0)
+        generator.set_frequencies(440.0, 10.0, 440.0, 10.0)
+        computed = count_phases(monkeypatch, generator)
+        assert not generator.render_range(0, 512).any()
+        generator.set_volume(0.5)
+        generator.set_frequencies(0.0, 10.0, 440.0, -1.0)
+        assert not generator.render_range(0, 512).any()
+        assert computed == []
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import os
+import tempfile
+import pytest
+from src.iso_pulse_gen.audio.stream_manager import AudioStreamManager
+from src.iso_pulse_gen.daemon import DaemonClient, EngineDaemon
+
+
+@pytest.fixture
+def socket_path():
+    # pytest's tmp_path can exceed the ~100 byte AF_UNIX path limit
+    directory = tempfile.mkdtemp(prefix="ipg-")
+    yield os.path.join(directory, "engine.sock")
+    os.rmdir(directory)
+
+
+def run_with_daemon(socket_path, scenario):
+    """Run ``scenario(daemon, client)`` against a daemon serving a fresh manager"""
+
+    async def main():
+        daemon = EngineDaemon(AudioStreamManager(sample_rate=1000, block_size=100), socket_path)
+        await daemon.start()
+        client = await DaemonClient(socket_path).connect()
+        try:
+            return await scenario(daemon, client)
+        finally:
+            await client.close()
+            await daemon.close()
+
+    return asyncio.run(main())
+
+
+class TestEngineDaemon:
+    def test_ping_and_socket_cleanup(self, manual_streams, socket_path):
+        async def scenario(daemon, client):
+            assert oct(os.stat(socket_path).st_mode & 0o777) == oct(0o600)
+            return await client.call("ping")
+
+        assert run_with_daemon(socket_path, scenario) == "pong"
+        assert not os.path.exists(socket_path)
+
+    def test_pipelined_requests_resolve_in_order(self, manual_streams, socket_path):
+        async def scenario(daemon, client):
+            futures = [client.send("set_left_parameters", 200.0 + i, 5.0) for i in range(200)]
+            futures.append(client.send("stats"))
+            return await asyncio.gather(*futures)
+
+        results = run_with_daemon(socket_path, scenario)
+        stats = results[-1]
+        assert results[:-1] == [None] * 200
+        assert stats["param_updates_submitted"] == 200
+        assert stats["daemon_commands"] == 201
+
+    def test_notifications_and_command_to_audible_latency(self, manual_streams, socket_path):
+        async def scenario(daemon, client):
+            await client.call("start")
+            for carrier in range(300, 400):
+                client.notify("set_left_parameters", float(carrier), 8.0)
+            client.notify("set_volume", 0.2)
+            # Requests are executed in order, so this reply means all updates were submitted
+            await client.call("ping")
+            manual_streams[0].pull()
+            stats = await client.call("stats")
+            await client.call("stop")
+            return daemon.manager, stats
+
+        manager, stats = run_with_daemon(socket_path, scenario)
+        assert stats["daemon_notifications"] == 101
+        assert stats["param_updates_applied"] >= 1
+        assert stats["param_updates_coalesced"] >= 99
+        assert stats["last_param_latency_ms"] >= stats["max_transit_ms"] > 0
+        assert manager._active_params[:2] == (399.0, 8.0)
+        assert manager.generator.volume == pytest.approx(0.2)
+        assert not manager.is_playing
+
+    def test_errors_are_reported_per_request(self, manual_streams, socket_path):
+        async def scenario(daemon, client):
+            with pytest.raises(RuntimeError, match="Unknown operation"):
+                await client.call("self_destruct")
+            with pytest.raises(RuntimeError):
+                await client.call("set_volume")
+            client._writer.write(b"not json\n")
+            client.notify("no_such_op")
+            assert await client.call("ping") == "pong"
+            return await client.call("stats")
+
+        stats = run_with_daemon(socket_path, scenario)
+        assert stats["daemon_errors"] == 4
+
+    def test_malformed_line_gets_error_response(self, manual_streams, socket_path):
+        async def scenario(daemon, client):
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            writer.write(b'{"id": 3}\n')
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            writer.close()
+            await writer.wait_closed()
+            return response
+
+        response = run_with_daemon(socket_path, scenario)
+        assert response["id"] == 3
+        assert response["ok"] is False
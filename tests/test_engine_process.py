@@ -0,0 +1,91 @@
+import sys
+import time
+from multiprocessing import spawn
+import numpy as np
+import pytest
+from src.iso_pulse_gen.audio.engine_process import EngineProcess, _minimal_main
+from src.iso_pulse_gen.audio.session import compile_session
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = EngineProcess(block_size=256)
+    yield engine
+    engine.close()
+
+
+class TestEngineProcess:
+    def test_reports_backend(self, engine):
+        assert engine.backend in ("mock", "sounddevice")
+        assert engine.get_stats()["is_playing"] is False
+
+    def test_output_reaches_shared_memory_tap(self, engine):
+        tap = engine.enable_signal_tap()
+        engine.set_left_parameters(220.0, 5.0)
+        engine.start()
+        try:
+            assert engine.is_playing
+            assert wait_for(lambda: tap.frames_written >= 2048)
+            snapshot = np.zeros((2048, 2), dtype=np.float32)
+            assert tap.read(snapshot) == 2048
+            assert np.abs(snapshot).max() > 0.1
+        finally:
+            engine.stop()
+        assert not engine.is_playing
+
+    def test_parameter_casts_are_applied_in_order(self, engine):
+        for carrier in (300.0, 310.0, 320.0):
+            engine.set_left_parameters(carrier, 8.0)
+        engine.set_channels_linked(False)
+        engine.set_right_parameters(500.0, 12.0)
+
+        stats = engine.get_stats()
+        assert stats["param_updates_submitted"] >= 5
+
+    def test_callback_timing_is_reported(self, engine):
+        engine.start()
+        try:
+            assert wait_for(lambda: engine.get_stats()["callback_count"] > 10)
+        finally:
+            engine.stop()
+        stats = engine.get_stats()
+        assert stats["callback_mean_ms"] > 0
+        assert stats["callback_jitter_max_ms"] is not None
+
+    def test_session_round_trip(self, engine):
+        plan = compile_session({"name": "short", "segments": [{"duration": 1.0, "carrier": 200, "pulse": 4}]})
+        engine.load_session(plan)
+        assert engine.session_plan is plan
+        assert engine.get_stats()["session"] == "short"
+        engine.clear_session()
+        assert engine.get_stats()["session"] is None
+
+    def test_engine_errors_raise_runtime_error(self, engine):
+        with pytest.raises(RuntimeError):
+            engine.load_session(None)
+
+    def test_close_releases_engine(self):
+        engine = EngineProcess()
+        engine.close()
+        assert not engine._process.is_alive()
+        with pytest.raises(RuntimeError):
+            engine.get_stats()
+        engine.close()  # idempotent
+
+
+def test_child_does_not_import_the_gui_entry_script():
+    main_module = sys.modules["__main__"]
+    with _minimal_main():
+        preparation = spawn.get_preparation_data("iso-pulse-gen-engine")
+    assert preparation["init_main_from_name"] == "src.iso_pulse_gen.audio.engine_main"
+    assert "init_main_from_path" not in preparation
+    assert sys.modules["__main__"] is main_module
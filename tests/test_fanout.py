@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from src.iso_pulse_gen.audio import stream_manager
+from src.iso_pulse_gen.audio.fanout import FanoutStream
+from src.iso_pulse_gen.audio.stream_manager import AudioStreamManager
+
+
+def fanout_manager(devices=(1, 2)):
+    manager = AudioStreamManager(block_size=512)
+    manager.set_output_devices(list(devices))
+    manager.start()
+    return manager
+
+
+class TestFanout:
+    def test_each_block_is_rendered_once(self, manual_streams):
+        manager = fanout_manager()
+        first, second = manual_streams
+        assert (first.device, second.device) == (1, 2)
+
+        for _ in range(10):
+            a = first.pull()
+            b = second.pull()
+            np.testing.assert_array_equal(a, b)
+
+        assert manager.get_stats()["callback_count"] == 10
+        assert manager.stream.blocks_rendered == 10
+
+    def test_slow_device_is_pulled_back_into_step(self, manual_streams):
+        manager = fanout_manager()
+        fast, slow = manual_streams
+        # The fast device clock runs 1000 ppm ahead: one extra block every 1000 callbacks
+        for i in range(5000):
+            fast.pull()
+            if i % 1000 == 999:
+                fast.pull()
+            slow.pull()
+
+        stream = manager.stream
+        fast_stats, slow_stats = manager.get_stats()["output_devices"]
+        lag = stream._head - stream.outputs[1].read_pos
+        assert lag <= stream.drift_tolerance + manager.block_size
+        # Every frame the slow device is not behind by was dropped to catch up
+        assert slow_stats["dropped_frames"] + lag == 5 * 512
+        assert 500 < slow_stats["drift_ppm"] <= 1000
+        assert fast_stats["dropped_frames"] == 0
+        assert slow_stats["overruns"] == 0
+        assert slow_stats["latency_ms"] > fast_stats["latency_ms"]
+
+    def test_stalled_device_resyncs_to_head(self, manual_streams):
+        manager = fanout_manager()
+        running, stalled = manual_streams
+        for _ in range(20):
+            running.pull()
+        stalled.pull()
+
+        stats = manager.get_stats()["output_devices"]
+        assert stats[1]["overruns"] == 1
+        assert manager.stream.outputs[1].read_pos == manager.stream.outputs[0].read_pos
+
+    def test_switch_to_fanout_while_playing(self, manual_streams):
+        manager = AudioStreamManager(block_size=256)
+        manager.start()
+        manual_streams[0].pull()
+        manager.set_output_devices([3, 4])
+
+        assert isinstance(manager._incoming_stream, FanoutStream)
+        manual_streams[1].pull()
+        assert manager.device_switch_count == 1
+        assert isinstance(manager.stream, FanoutStream)
+
+        manager.set_output_devices([5])
+        assert manager.fanout_devices is None
+        assert manager.selected_device == 5
+        manager.stop()
+        assert all(stream.closed for stream in manual_streams[1:3])
+
+    def test_failed_device_start_closes_the_others(self, manual_streams, monkeypatch):
+        def start(stream):
+            if stream.device == 2:
+                raise RuntimeError("Device unavailable")
+            stream.active = True
+
+        monkeypatch.setattr(stream_manager.sd.OutputStream, "start", start)
+        manager = AudioStreamManager(block_size=512)
+        manager.set_output_devices([1, 2, 3])
+
+        with pytest.raises(RuntimeError, match="Device unavailable"):
+            manager.start()
+        assert not any(stream.active for stream in manual_streams)
+        assert all(stream.closed for stream in manual_streams)
+
+    def test_single_device_list_uses_plain_stream(self, manual_streams):
+        manager = fanout_manager(devices=[2])
+        assert manager.fanout_devices is None
+        assert not isinstance(manager.stream, FanoutStream)
+        assert manager.get_stats()["output_devices"] is None
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from src.iso_pulse_gen.audio.generator import AudioGenerator
+from src.iso_pulse_gen.audio.modulation import MODULATORS, Modulator, get_modulator, register_modulator
+from src.iso_pulse_gen.audio.stream_manager import AudioStreamManager
+
+SAMPLE_RATE = 44100
+
+
+def exact_sine(freq: int, n: np.ndarray) -> np.ndarray:
+    return np.sin(2 * np.pi * ((n * freq) % SAMPLE_RATE) / SAMPLE_RATE)
+
+
+def render(left_mode, right_mode, num_frames=4096, params=(440.0, 10.0, 440.0, 10.0)):
+    generator = AudioGenerator(SAMPLE_RATE, volume=1.0)
+    generator.set_modulation(left_mode, right_mode)
+    return generator.generate_stereo_frames(num_frames, *params)
+
+
+class TestModulators:
+    def test_registry_lists_builtin_modes(self):
+        assert {"isochronic", "sine_am", "binaural", "monaural"} <= set(MODULATORS)
+        with pytest.raises(ValueError, match="Unknown modulation mode"):
+            get_modulator("ring")
+
+    def test_binaural_splits_the_beat_across_ears(self):
+        frames = render("binaural", "binaural")
+        n = np.arange(len(frames))
+        np.testing.assert_allclose(frames[:, 0], exact_sine(435, n), atol=1e-6)
+        np.testing.assert_allclose(frames[:, 1], exact_sine(445, n), atol=1e-6)
+
+    def test_monaural_mixes_both_tones_per_channel(self):
+        frames = render("monaural", "monaural")
+        n = np.arange(len(frames))
+        expected = 0.5 * (exact_sine(435, n) + exact_sine(445, n))
+        np.testing.assert_allclose(frames[:, 0], expected, atol=1e-6)
+        np.testing.assert_array_equal(frames[:, 0], frames[:, 1])
+
+    def test_sine_am_envelope(self):
+        frames = render("sine_am", "isochronic", num_frames=SAMPLE_RATE // 10)
+        n = np.arange(len(frames))
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * n * 10 / SAMPLE_RATE)
+        np.testing.assert_allclose(frames[:, 0], exact_sine(440, n) * envelope, atol=1e-6)
+        # Unlike the square gate, sine AM is never fully off for half a cycle
+        assert np.count_nonzero(frames[:, 0]) > np.count_nonzero(frames[:, 1])
+
+    def test_mode_change_keeps_carrier_phase(self):
+        generator = AudioGenerator(SAMPLE_RATE, volume=1.0)
+        params = (440.0, 10.0, 440.0, 10.0)
+        generator.generate_stereo_frames(1000, *params)
+        generator.set_modulation("sine_am", "isochronic")
+        after = generator.generate_stereo_frames(1000, *params)
+
+        n = np.arange(1000, 2000)
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * n * 10 / SAMPLE_RATE)
+        np.testing.assert_allclose(after[:, 0], exact_sine(440, n) * envelope, atol=1e-6)
+
+    def test_registered_mode_is_selectable(self):
+        @register_modulator
+        class SquareCarrier(Modulator):
+            name = "test_square"
+
+            def render(self, phase_a, phase_b, gain, out, scratch):
+                np.less(phase_a, 0.5, out=scratch[0])
+                np.multiply(scratch[0], 2 * gain, out=out)
+                np.subtract(out, gain, out=out)
+
+        try:
+            frames = render("test_square", "isochronic", num_frames=512)
+            assert set(np.unique(frames[:, 0])) == {-1.0, 1.0}
+        finally:
+            del MODULATORS["test_square"]
+
+
+class TestManagerModulation:
+    def test_linked_mode_applies_at_next_block(self, manual_streams):
+        manager = AudioStreamManager(block_size=256)
+        manager.start()
+        manual_streams[0].pull()
+        manager.set_left_modulation("binaural")
+        assert manager.generator.modulation == ("isochronic", "isochronic")
+
+        manual_streams[0].pull()
+        assert manager.generator.modulation == ("binaural", "binaural")
+        assert manager.get_stats()["modulation"] == ("binaural", "binaural")
+
+    def test_unlinked_modes_are_independent(self, manual_streams):
+        manager = AudioStreamManager(block_size=256)
+        manager.set_channels_linked(False)
+        manager.set_right_modulation("monaural")
+        manager.start()
+        manual_streams[0].pull()
+        assert manager.generator.modulation == ("isochronic", "monaural")
+
+    def test_unknown_mode_is_rejected(self):
+        manager = AudioStreamManager()
+        with pytest.raises(ValueError):
+            manager.set_left_modulation("ring")
+        assert manager.left_modulation == "isochronic"
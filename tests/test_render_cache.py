@@ -0,0 +1,126 @@
+import os
+import numpy as np
+from src.iso_pulse_gen.audio.render_cache import RenderCache
+from src.iso_pulse_gen.audio.session import compile_session, render_plan
+from src.iso_pulse_gen.audio.stream_manager import AudioStreamManager
+
+
+def make_plan(carrier=300.0, duration=0.1):
+    return compile_session({"segments": [{"duration": duration, "carrier": carrier, "pulse": 20.0}]})
+
+
+class TestRenderCache:
+    def test_key_depends_on_every_parameter(self):
+        base = dict(
+            sample_rate=44100,
+            left_carrier_freq=440.0,
+            left_pulse_freq=10.0,
+            right_carrier_freq=440.0,
+            right_pulse_freq=10.0,
+            volume=0.5,
+            envelope=[0.0, 1.0],
+            duration=60.0,
+        )
+        key = RenderCache.make_key(**base)
+
+        assert key == RenderCache.make_key(**base)
+        for name, value in [("sample_rate", 48000), ("right_pulse_freq", 11.0), ("volume", 0.6), ("envelope", [0.0, 0.9]), ("duration", 61.0)]:
+            assert RenderCache.make_key(**{**base, name: value}) != key
+        assert RenderCache.plan_key(make_plan(300.0)) != RenderCache.plan_key(make_plan(301.0))
+        faded = compile_session({"fade_in": 0.05, "segments": [{"duration": 0.1, "carrier": 300.0, "pulse": 20.0}]})
+        assert RenderCache.plan_key(faded) != RenderCache.plan_key(make_plan(300.0))
+
+    def test_miss_then_hit_serves_identical_render(self, tmp_path):
+        cache = RenderCache(str(tmp_path))
+        plan = make_plan()
+        key = RenderCache.plan_key(plan)
+
+        assert cache.get(key) is None
+        cache.store_plan(plan)
+        cached = cache.get(key)
+
+        assert isinstance(cached, np.memmap)
+        np.testing.assert_array_equal(cached, render_plan(plan))
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    def test_lru_eviction_respects_size_cap(self, tmp_path):
+        plans = [make_plan(carrier) for carrier in (200.0, 300.0, 400.0)]
+        entry_bytes = plans[0].total_samples * 8 + 128
+        cache = RenderCache(str(tmp_path), max_bytes=2 * entry_bytes + 64)
+
+        keys = []
+        for age, plan in enumerate(plans[:2]):
+            keys.append(cache.store_plan(plan))
+            os.utime(os.path.join(str(tmp_path), f"{keys[-1]}.npy"), (age, age))
+        # Touch the oldest entry so the second one becomes least recently used
+        assert cache.get(keys[0]) is not None
+        keys.append(cache.store_plan(plans[2]))
+
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_oversized_render_is_not_cached(self, tmp_path):
+        cache = RenderCache(str(tmp_path), max_bytes=1024)
+
+        assert cache.store_plan(make_plan()) is None
+        assert cache.get_stats()["entries"] == 0
+
+
+class TestCachedPlayback:
+    def test_playback_reads_cached_render(self, tmp_path, manual_streams):
+        cache = RenderCache(str(tmp_path))
+        plan = make_plan(duration=0.05)
+        cache.store_plan(plan)
+
+        manager = AudioStreamManager(block_size=512, volume=0.4, render_cache=cache)
+        manager.load_session(plan)
+        manager.start()
+        blocks = [manual_streams[0].pull() for _ in range(5)]
+
+        live = np.concatenate(blocks)[:plan.total_samples]
+        np.testing.assert_allclose(live, render_plan(plan, volume=0.4), atol=1e-6)
+        stats = manager.get_stats()
+        assert stats["session_cached"]
+        assert stats["render_cache"]["bytes_served"] == plan.total_samples * 8
+
+    def test_fade_out_blocks_are_not_counted_as_served(self, tmp_path, manual_streams):
+        cache = RenderCache(str(tmp_path))
+        plan = make_plan(duration=0.05)
+        cache.store_plan(plan)
+        manager = AudioStreamManager(block_size=512, render_cache=cache)
+        manager.load_session(plan)
+        manager.start()
+        manual_streams[0].pull()
+        manager.set_output_device(1)
+        old_stream, new_stream = manual_streams
+        new_stream.pull()
+        old_stream.pull()  # Fades out a copy of the block the new stream just played
+
+        assert manager.get_stats()["render_cache"]["bytes_served"] == 2 * 512 * 8
+
+    def test_miss_renders_in_background(self, tmp_path, manual_streams):
+        cache = RenderCache(str(tmp_path))
+        manager = AudioStreamManager(render_cache=cache)
+        plan = make_plan()
+        manager.load_session(plan)
+
+        assert not manager.get_stats()["session_cached"]
+        manager._cache_render_thread.join(timeout=5.0)
+        assert cache.get(RenderCache.plan_key(plan)) is not None
+
+    def test_fixed_parameter_playback_is_cached(self, tmp_path, manual_streams):
+        cache = RenderCache(str(tmp_path))
+        manager = AudioStreamManager(block_size=512, render_cache=cache)
+        manager.set_left_parameters(200.0, 6.0)
+        plan = manager.play_fixed(0.05)
+        manager._cache_render_thread.join(timeout=5.0)
+
+        # The same parameters played again, here or by another manager, come from the cache
+        other = AudioStreamManager(block_size=512, render_cache=cache)
+        other.set_left_parameters(200.0, 6.0)
+        assert RenderCache.plan_key(other.play_fixed(0.05)) == RenderCache.plan_key(plan)
+        assert other.get_stats()["session_cached"]
+        assert cache.get_stats()["hits"] == 1
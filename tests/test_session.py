@@ -0,0 +1,113 @@
+import json
+import numpy as np
+import pytest
+from src.iso_pulse_gen.audio.generator import AudioGenerator
+from src.iso_pulse_gen.audio.session import compile_session, load_session, render_plan
+
+
+def simple_session(**overrides):
+    session = {
+        "name": "test",
+        "segments": [
+            {"duration": 1.0, "carrier": 100.0, "pulse": 5.0},
+            {"duration": 1.0, "ramp": 0.5, "left": {"carrier": 200.0, "pulse": 10.0}},
+        ],
+    }
+    session.update(overrides)
+    return session
+
+
+class TestSessionCompiler:
+    def test_load_json_and_toml(self, tmp_path):
+        json_path = tmp_path / "session.json"
+        json_path.write_text(json.dumps(simple_session()))
+        toml_path = tmp_path / "evening.toml"
+        toml_path.write_text(
+            "fade_in = 0.5\n"
+            "[[segments]]\nduration = 2\ncarrier = 300\npulse = 8\n"
+        )
+
+        assert load_session(str(json_path))["name"] == "test"
+        toml_session = load_session(str(toml_path))
+        assert toml_session["name"] == "evening"
+        assert compile_session(toml_session, 1000).total_samples == 2000
+
+    def test_unsupported_extension(self, tmp_path):
+        path = tmp_path / "session.yaml"
+        path.write_text("")
+        with pytest.raises(ValueError):
+            load_session(str(path))
+
+    def test_invalid_segments_raise(self):
+        with pytest.raises(ValueError):
+            compile_session({"segments": []})
+        with pytest.raises(ValueError):
+            compile_session({"segments": [{"duration": 1, "carrier": 0, "pulse": 10}]})
+        with pytest.raises(ValueError):
+            compile_session({"segments": [{"duration": 0, "carrier": 440, "pulse": 10}]})
+
+    def test_values_carry_over_and_ramp(self):
+        plan = compile_session(simple_session(), sample_rate=1000)
+
+        assert plan.total_samples == 2000
+        # Right channel was omitted in segment 2 and keeps its values
+        np.testing.assert_allclose(plan.values[:, 2], 100.0)
+        final = plan.values[np.searchsorted(plan.positions, 1500)]
+        np.testing.assert_allclose(final[:2], [200.0, 10.0])
+
+    def test_duration_override_pads_and_truncates(self):
+        assert compile_session(simple_session(duration=3.0), 1000).total_samples == 3000
+        assert compile_session(simple_session(duration=0.5), 1000).total_samples == 500
+
+    def test_fades_shape_volume(self):
+        plan = compile_session(simple_session(fade_in=0.5, fade_out=0.5), 1000)
+        volume = np.interp([0, 250, 500, 1000, 1750, 2000], plan.positions, plan.values[:, 4])
+
+        np.testing.assert_allclose(volume, [0.0, 0.5, 1.0, 1.0, 0.5, 0.0])
+
+
+class TestPlanRendering:
+    def test_constant_segment_matches_analytic_waveform(self):
+        plan = compile_session({"segments": [{"duration": 1.0, "carrier": 100.0, "pulse": 5.0}]}, 1000)
+        generator = AudioGenerator(sample_rate=1000, volume=1.0)
+        frames = generator.render_plan_frames(plan, 0, 1000)
+
+        t = np.arange(1000) / 1000
+        expected = np.sin(2 * np.pi * 100.0 * t) * ((5.0 * t) % 1.0 <= 0.5)
+        np.testing.assert_allclose(frames[:, 0], expected, atol=1e-5)
+        np.testing.assert_allclose(frames[:, 1], expected, atol=1e-5)
+
+    def test_output_independent_of_block_size(self):
+        plan = compile_session(simple_session(fade_in=0.3), 1000)
+        whole = render_plan(plan, block_size=4096)
+        blocked = render_plan(plan, block_size=37)
+
+        assert whole.shape == (2000, 2)
+        np.testing.assert_array_equal(whole, blocked)
+
+    def test_ramp_has_no_phase_jump(self):
+        plan = compile_session(
+            {"segments": [
+                {"duration": 1.0, "carrier": 100.0, "pulse": 0.25},
+                {"duration": 1.0, "ramp": 1.0, "carrier": 150.0, "pulse": 0.25},
+            ]},
+            sample_rate=8000,
+        )
+        frames = render_plan(plan)
+        # Gate is open for the first two seconds; the carrier must stay smooth across the boundary
+        diffs = np.abs(np.diff(frames[7000:9000, 0]))
+        assert diffs.max() < 2 * np.pi * 150.0 / 8000 * 1.1
+
+    def test_past_end_is_silent(self):
+        plan = compile_session(simple_session(), 1000)
+        frames = AudioGenerator(sample_rate=1000).render_plan_frames(plan, 1900, 200)
+
+        assert np.all(frames[100:] == 0)
+
+    def test_render_to_file_is_memmappable(self, tmp_path):
+        plan = compile_session(simple_session(), 1000)
+        path = tmp_path / "render.npy"
+        render_plan(plan, path=str(path), block_size=300)
+
+        on_disk = np.load(path, mmap_mode="r")
+        np.testing.assert_array_equal(on_disk, render_plan(plan))
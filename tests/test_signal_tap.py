@@ -0,0 +1,100 @@
+import tracemalloc
+import numpy as np
+import pytest
+from src.iso_pulse_gen.audio.signal_tap import SignalTap
+from src.iso_pulse_gen.audio.stream_manager import AudioStreamManager
+
+
+def ramp_blocks(total, block_size):
+    data = np.arange(total * 2, dtype=np.float32).reshape(total, 2)
+    return data, [data[i:i + block_size] for i in range(0, total, block_size)]
+
+
+class TestSignalTap:
+    def test_decimation_is_continuous_across_blocks(self):
+        data = np.random.default_rng(3).standard_normal((700, 2)).astype(np.float32)
+        whole = SignalTap(capacity=1000, decimation=3)
+        whole.write(data)
+        tap = SignalTap(capacity=1000, decimation=3)
+        for i in range(0, 700, 37):
+            tap.write(data[i:i + 37])
+
+        expected = np.zeros((1000, 2), dtype=np.float32)
+        out = np.zeros((1000, 2), dtype=np.float32)
+        valid = tap.read(out)
+        assert valid == whole.read(expected) == 700 // 3
+        np.testing.assert_allclose(out, expected, atol=1e-6)
+
+    def test_decimation_does_not_alias(self):
+        # A 15 kHz carrier decimated by 2 would otherwise fold down to 7.05 kHz at full level
+        tap = SignalTap(capacity=4096, decimation=2)
+        t = np.arange(8192) / 44100
+        tone = np.sin(2 * np.pi * 15000 * t).astype(np.float32)
+        for i in range(0, 8192, 512):
+            tap.write(np.column_stack([tone[i:i + 512]] * 2))
+
+        out = np.zeros((2048, 2), dtype=np.float32)
+        tap.read(out)
+        assert np.abs(out[:, 0]).max() < 1e-3
+
+    def test_ring_keeps_newest_frames_in_order(self):
+        tap = SignalTap(capacity=64, decimation=1)
+        data, blocks = ramp_blocks(1000, 48)
+        for block in blocks:
+            tap.write(block)
+
+        out = np.zeros((50, 2), dtype=np.float32)
+        assert tap.read(out) == 50
+        np.testing.assert_array_equal(out, data[-50:])
+        assert tap.frames_written == 1000
+
+    def test_block_larger_than_capacity(self):
+        tap = SignalTap(capacity=16, decimation=1)
+        data, _ = ramp_blocks(100, 100)
+        tap.write(data)
+
+        out = np.zeros((16, 2), dtype=np.float32)
+        assert tap.read(out) == 16
+        np.testing.assert_array_equal(out, data[-16:])
+
+    def test_write_reuses_preallocated_buffer(self):
+        tap = SignalTap(capacity=128, decimation=2)
+        buffer = tap.buffer
+        for block in ramp_blocks(1000, 100)[1]:
+            tap.write(block)
+
+        assert tap.buffer is buffer
+
+    @pytest.mark.parametrize("decimation", [1, 2, 4])
+    def test_steady_state_write_does_not_allocate(self, decimation):
+        tap = SignalTap(capacity=16384, decimation=decimation)
+        blocks = np.random.default_rng(4).standard_normal((8, 16384, 2)).astype(np.float32)
+        tap.write(blocks[0])
+        tracemalloc.start()
+        try:
+            for block in blocks[1:]:
+                tap.write(block)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # A block is 128 KB; only small view objects may be created, whatever the block size
+        assert peak < blocks[0].nbytes // 8
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            SignalTap(capacity=0)
+
+
+class TestManagerTap:
+    def test_callback_feeds_tap(self, manual_streams):
+        manager = AudioStreamManager(block_size=256)
+        tap = manager.enable_signal_tap(capacity=1024, decimation=2)
+        manager.start()
+        block = manual_streams[0].pull()
+
+        reference = SignalTap(capacity=1024, decimation=2)
+        reference.write(block)
+        out = np.zeros((128, 2), dtype=np.float32)
+        expected = np.zeros((128, 2), dtype=np.float32)
+        assert tap.read(out) == reference.read(expected) == 128
+        np.testing.assert_array_equal(out, expected)
@@ -0,0 +1,65 @@
+import numpy as np
+from src.iso_pulse_gen.audio.generator import AudioGenerator
+from src.iso_pulse_gen.audio.mock_backend import VirtualOutputStream
+from src.iso_pulse_gen.audio.soak import SoakHarness, phase_error, reference_block
+from src.iso_pulse_gen.audio.stream_manager import AudioStreamManager
+
+
+class TestSoakHarness:
+    def test_phase_error_wraps(self):
+        assert phase_error(0.0, 1.0, 44100, 44100) < 1e-12
+        assert phase_error(2 * np.pi - 1e-9, 1.0, 44100, 44100) < 1e-8
+        assert abs(phase_error(np.pi / 2, 1.0, 0, 44100) - np.pi / 2) < 1e-12
+
+    def test_short_soak_passes(self):
+        report = SoakHarness(hours=0.02, checkpoint_minutes=0.5, trace_memory=False).run()
+
+        assert report["passed"], report["failures"]
+        assert report["callback_count"] == report["blocks"]
+        assert report["max_phase_error_rad"] < 1e-9
+        assert report["max_sample_error"] < 1e-6
+
+    def test_reference_matches_generator(self):
+        generator = AudioGenerator(44100, volume=0.4)
+        generator.set_frequencies(440.0, 10.0, 523.25, 7.83)
+        start = 44100 * 3600 * 5 + 123
+        reference = reference_block((440.0, 10.0, 523.25, 7.83), 0.4, start, 512, 44100)
+        np.testing.assert_allclose(generator.render_range(start, 512), reference, atol=1e-6)
+
+    def test_wrong_samples_fail_the_run_with_exact_phases(self, monkeypatch):
+        original = AudioStreamManager._render_into
+
+        def inverted(self, generator, outdata, frames, draft=False):
+            original(self, generator, outdata, frames, draft)
+            outdata *= -1.0  # phase state untouched, waveform wrong
+
+        monkeypatch.setattr(AudioStreamManager, "_render_into", inverted)
+        report = SoakHarness(hours=0.01, trace_memory=False).run()
+
+        assert report["max_phase_error_rad"] < 1e-9
+        assert not report["passed"]
+        assert "checkpoint samples" in report["failures"][0]
+
+    def test_phase_drift_fails_the_run(self, monkeypatch):
+        original = AudioGenerator.generate_stereo_frames
+
+        def drifting(self, *args, **kwargs):
+            frames = original(self, *args, **kwargs)
+            self._anchor_cycles[0] += 1e-8  # a tiny per-block phase slip
+            return frames
+
+        monkeypatch.setattr(AudioGenerator, "generate_stereo_frames", drifting)
+        report = SoakHarness(hours=0.01, trace_memory=False).run()
+
+        assert not report["passed"]
+        assert "phase error" in report["failures"][0]
+
+    def test_virtual_stream_reuses_its_buffer(self):
+        calls = []
+        stream = VirtualOutputStream(1000, 100, 2, lambda out, frames, t, s: calls.append(frames), "float32")
+        first = stream.advance()
+        second = stream.advance()
+
+        assert first is second
+        assert calls == [100, 100]
+        assert stream.time == 0.2
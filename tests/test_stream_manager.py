@@ -0,0 +1,335 @@
+import threading
+import time
+from types import SimpleNamespace
+import numpy as np
+from src.iso_pulse_gen.audio.session import compile_session, render_plan
+from src.iso_pulse_gen.audio import stream_manager
+from src.iso_pulse_gen.audio.stream_manager import AudioStreamManager
+
+
+class TestDeviceSwitching:
+    def test_switch_while_stopped_only_records_device(self, manual_streams):
+        manager = AudioStreamManager()
+        manager.set_output_device(1)
+
+        assert manager.selected_device == 1
+        assert manual_streams == []
+
+    def test_switch_keeps_playing_and_preserves_phase(self, manual_streams):
+        manager = AudioStreamManager(block_size=256)
+        manager.start()
+        old_stream = manual_streams[0]
+        old_stream.pull()
+        old_stream.pull()
+        phase_before = manager.generator.phase_left
+
+        manager.set_output_device(1)
+        new_stream = manual_streams[1]
+
+        assert manager.is_playing
+        assert new_stream.device == 1
+        assert new_stream.active
+
+        new_stream.pull()
+
+        assert manager.stream is new_stream
+        assert manager.generator.phase_left != 0.0
+        assert manager.generator.phase_left != phase_before
+        assert manager.get_stats()["device_switches"] == 1
+        assert manager.get_stats()["last_switch_latency_ms"] is not None
+
+    def test_crossfade_matches_uninterrupted_waveform(self, manual_streams):
+        manager = AudioStreamManager(sample_rate=44100, block_size=512, crossfade_ms=5.0)
+        manager.start()
+        manual_streams[0].pull()
+        reference = manager.generator.clone()
+
+        manager.set_output_device(2)
+        old_stream, new_stream = manual_streams
+        incoming = new_stream.pull()
+        outgoing = old_stream.pull()
+
+        expected = reference.generate_stereo_frames(512, 440.0, 10.0, 440.0, 10.0)
+        fade_frames = len(manager._fade_in_ramp)
+
+        # Equal-power crossfade: both halves come from the same continuous waveform
+        np.testing.assert_allclose(incoming[fade_frames:], expected[fade_frames:], atol=1e-6)
+        np.testing.assert_allclose(outgoing[fade_frames:], 0.0)
+        np.testing.assert_allclose(
+            incoming[:fade_frames] * manager._fade_in_ramp + outgoing[:fade_frames] * manager._fade_out_ramp,
+            expected[:fade_frames],
+            atol=1e-5,
+        )
+        assert manager._outgoing_done.wait(timeout=1.0)
+
+    def test_take_over_reuses_the_generator_cloned_at_switch_time(self, manual_streams):
+        manager = AudioStreamManager(sample_rate=44100, block_size=512, crossfade_ms=5.0)
+        manager.start()
+        manager.set_output_device(2)
+        old_stream, new_stream = manual_streams
+        standby = manager._standby_generator
+        buffers = (standby._anchor_samples, standby._step_table)
+        old_stream.pull()  # The old device keeps playing after the clone was made
+        reference = manager.generator.clone()
+
+        incoming = new_stream.pull()
+        outgoing = old_stream.pull()
+
+        assert manager._outgoing_generator is standby
+        assert standby._anchor_samples is buffers[0] and standby._step_table is buffers[1]
+        fade_frames = len(manager._fade_in_ramp)
+        np.testing.assert_allclose(
+            incoming[:fade_frames] * manager._fade_in_ramp + outgoing[:fade_frames] * manager._fade_out_ramp,
+            reference.generate_stereo_frames(512, 440.0, 10.0, 440.0, 10.0)[:fade_frames],
+            atol=1e-5,
+        )
+
+    def test_take_over_starts_no_thread_in_the_callback(self, manual_streams):
+        manager = AudioStreamManager(block_size=1024)
+        manager.start()
+        manager.set_output_device(1)
+        old_stream, new_stream = manual_streams
+        threads = threading.active_count()
+        new_stream.pull()
+        assert threading.active_count() == threads
+
+        old_stream.pull()
+        deadline = time.monotonic() + 2.0
+        while not old_stream.closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert old_stream.closed
+        manager.stop()
+
+    def test_old_stream_is_closed_after_fade(self, manual_streams):
+        manager = AudioStreamManager(block_size=1024)
+        manager.start()
+        manager.set_output_device(1)
+        old_stream, new_stream = manual_streams
+        new_stream.pull()
+        old_stream.pull()
+
+        deadline = time.monotonic() + 2.0
+        while not old_stream.closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert old_stream.closed
+        assert new_stream.active
+
+    def test_stop_during_pending_switch_closes_all_streams(self, manual_streams):
+        manager = AudioStreamManager()
+        manager.start()
+        manager.set_output_device(1)
+        manager.stop()
+
+        assert all(stream.closed for stream in manual_streams)
+        assert not manager.is_playing
+
+
+class TestSessionPlayback:
+    def test_live_playback_matches_offline_render(self, manual_streams):
+        plan = compile_session(
+            {"segments": [
+                {"duration": 0.05, "carrier": 300.0, "pulse": 20.0},
+                {"duration": 0.05, "ramp": 0.02, "carrier": 500.0, "pulse": 40.0},
+            ]},
+            sample_rate=44100,
+        )
+        manager = AudioStreamManager(block_size=512, volume=0.4)
+        manager.load_session(plan)
+        manager.start()
+        blocks = [manual_streams[0].pull() for _ in range(10)]
+
+        live = np.concatenate(blocks)[:plan.total_samples]
+        np.testing.assert_array_equal(live, render_plan(plan, volume=0.4))
+        assert manager.session_finished
+
+    def test_clear_session_returns_to_parameters(self, manual_streams):
+        plan = compile_session({"segments": [{"duration": 0.01, "carrier": 300.0, "pulse": 20.0}]})
+        manager = AudioStreamManager()
+        manager.load_session(plan)
+        manager.clear_session()
+
+        assert manager.session_plan is None
+        assert not manager.session_finished
+
+
+class TestSeeking:
+    def test_stop_and_start_resumes_position(self, manual_streams):
+        manager = AudioStreamManager(block_size=256)
+        manager.start()
+        for _ in range(4):
+            manual_streams[0].pull()
+        manager.stop()
+        manager.start()
+
+        assert manager.get_position() == 1024 / manager.sample_rate
+        manual_streams[1].pull()
+        assert manager.generator.sample_position == 1280
+
+    def test_seek_while_playing_jumps_and_fades_in(self, manual_streams):
+        manager = AudioStreamManager(block_size=256)
+        manager.start()
+        manual_streams[0].pull()
+        manager.seek(10.0)
+
+        assert manager.get_position() == 10.0
+        block = manual_streams[0].pull()
+        assert manager.get_stats()["position_seconds"] == 10.0 + 256 / manager.sample_rate
+        assert abs(block[0]).max() < 1e-3  # Fade restarts from silence
+
+    def test_session_seek_and_restart_after_finish(self, manual_streams):
+        plan = compile_session({"segments": [{"duration": 0.05, "carrier": 300.0, "pulse": 20.0}]}, sample_rate=44100)
+        manager = AudioStreamManager(block_size=2048, volume=0.4)
+        manager.load_session(plan)
+        manager.seek(0.02)
+        manager.start()
+        block = manual_streams[0].pull()
+
+        offset = round(0.02 * 44100)
+        expected = render_plan(plan, volume=0.4)[offset:]
+        ramp = len(manager._fade_in_ramp)
+        np.testing.assert_array_equal(block[ramp:len(expected)], expected[ramp:])
+        assert manager.session_finished
+        manager.stop()
+        manager.start()
+        assert manager.get_position() == 0.0
+
+
+class TestLiveParameterUpdates:
+    def test_burst_coalesces_into_one_update_at_next_block(self, manual_streams):
+        manager = AudioStreamManager(block_size=256)
+        manager.start()
+        stream = manual_streams[0]
+        stream.pull()
+        applied_before = manager.param_updates_applied
+
+        for carrier in (500.0, 510.0, 520.0, 523.0):
+            manager.set_left_parameters(carrier, 12.0)
+        stream.pull()
+
+        stats = manager.get_stats()
+        assert manager.param_updates_applied == applied_before + 1
+        assert manager._active_params == (523.0, 12.0, 523.0, 12.0)
+        assert stats["param_updates_coalesced"] >= 3
+        assert stats["last_param_latency_ms"] is not None
+
+    def test_update_keeps_phase_running(self, manual_streams):
+        manager = AudioStreamManager(block_size=256)
+        manager.start()
+        manual_streams[0].pull()
+        manager.set_left_parameters(880.0, 10.0)
+        manual_streams[0].pull()
+
+        assert manager.is_playing
+        assert manager.generator.phase_left != 0.0
+
+    def test_latency_measured_from_request_time(self, manual_streams):
+        manager = AudioStreamManager()
+        manager.start()
+        manager.set_left_parameters(300.0, 5.0, requested_at=time.perf_counter() - 0.05)
+        manual_streams[0].pull()
+
+        assert manager.last_param_latency_ms >= 50.0
+
+
+class TestDeadlineDegradation:
+    def test_on_time_callbacks_render_fully(self, manual_streams):
+        manager = AudioStreamManager(block_size=256)
+        manager.start()
+        for _ in range(20):
+            manual_streams[0].pull()
+
+        stats = manager.get_stats()
+        assert stats["render_level"] == "full"
+        assert stats["degradation_events"] == 0
+        assert stats["deadline_misses"] == 0
+
+    def test_expensive_render_falls_back_to_draft_and_recovers(self, manual_streams):
+        manager = AudioStreamManager(block_size=256)
+        manager.start()
+        for _ in range(5):
+            manual_streams[0].pull()
+        # As if a parameter storm had made the last renders take a second each
+        manager._path_costs[stream_manager.COST_RENDER] = 1.0
+        block = manual_streams[0].pull()
+
+        assert manager.render_level == stream_manager.RENDER_DRAFT
+        expected = AudioStreamManager(block_size=256).generator
+        expected.set_frequencies(*manager._active_params)
+        np.testing.assert_allclose(block, expected.render_range(5 * 256, 256), atol=1e-6)
+
+        for _ in range(200):
+            manual_streams[0].pull()
+        stats = manager.get_stats()
+        assert stats["render_level"] == "full"
+        assert stats["degradation_events"] == 1
+        assert stats["degraded_blocks"]["draft"] >= 1
+
+    def test_late_callback_replays_last_block_and_keeps_position(self, manual_streams):
+        manager = AudioStreamManager(block_size=64)
+        manager.start()
+        stream = manual_streams[0]
+        for _ in range(3):
+            last = stream.pull()
+        time.sleep(0.01)  # Several block periods late
+        replayed = stream.pull()
+
+        assert manager.render_level == stream_manager.RENDER_REPLAY
+        np.testing.assert_array_equal(replayed, last)
+        assert manager.generator.sample_position == 4 * 64
+
+        pulls = 4
+        while manager.render_level == stream_manager.RENDER_REPLAY:
+            resumed = stream.pull()
+            pulls += 1
+        assert not resumed[0].any()  # Faded back in from silence after the replayed blocks
+        while manager.render_level != stream_manager.RENDER_FULL:
+            stream.pull()
+            pulls += 1
+        assert manager.generator.sample_position == pulls * 64
+        assert manager.get_stats()["degraded_blocks"]["replay"] >= 1
+
+    def test_budget_comes_from_stream_timing(self):
+        manager = AudioStreamManager(block_size=512)
+        period = 512 / 44100
+        manager._path_costs[:] = (0.4 * period, 0.1 * period, 0.2 * period)
+        manager._last_block_frames = 512
+
+        # A bursty host: two blocks back to back, then a two-block gap, with 1.5 blocks of output latency
+        levels = []
+        for burst in range(200):
+            now = 10.0 + 2 * burst * period
+            for position in range(2):
+                timing = SimpleNamespace(currentTime=now, outputBufferDacTime=now + (1.5 + position) * period)
+                levels.append(manager._choose_render_level(now + position * 1e-4, 512, timing))
+        assert set(levels) == {stream_manager.RENDER_FULL}
+
+        # A callback that starts with a fraction of a block left before the DAC needs it
+        late = SimpleNamespace(currentTime=20.0, outputBufferDacTime=20.0 + 0.25 * period)
+        assert manager._choose_render_level(20.0, 512, late) == stream_manager.RENDER_REPLAY
+
+    def test_streams_without_timing_track_the_schedule(self):
+        manager = AudioStreamManager(block_size=512)
+        period = 512 / 44100
+        manager._path_costs[:] = (0.4 * period, 0.1 * period, 0.2 * period)
+        manager._last_block_frames = 512
+
+        assert manager._choose_render_level(10.0, 512) == stream_manager.RENDER_FULL
+        assert manager._choose_render_level(10.0 + period, 512) == stream_manager.RENDER_FULL
+        # Three quarters of a block behind the expected schedule
+        assert manager._choose_render_level(10.0 + 2.75 * period, 512) == stream_manager.RENDER_REPLAY
+
+
+    def test_switch_starts_a_new_schedule(self, manual_streams):
+        manager = AudioStreamManager(block_size=512)
+        period = 512 / 44100
+        manager.start()
+        manual_streams[0].pull()
+        manager.set_output_device(1)
+        manager._path_costs[:] = (0.4 * period, 0.1 * period, 0.2 * period)
+        # The old device's next callback was due three quarters of a block ago
+        manager._next_callback_due = time.perf_counter() - 0.75 * period
+
+        manual_streams[1].pull()
+        assert manager.render_level == stream_manager.RENDER_FULL
+        assert manager.degradation_events == 0
\ No newline at end of file